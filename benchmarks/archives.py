@@ -0,0 +1,77 @@
+from os import urandom
+from pathlib import Path
+from random import Random
+from sys import argv
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+from pandas import DataFrame
+
+from penn_canvas.archive.codec import Codec, has_zstandard, parse_codec
+from penn_canvas.archive.sink import ArchiveSink
+
+CODECS = ["gzip:9", "gzip:6", "gzip:1", "zstd:3", "zstd:9", "none"]
+SUBMISSIONS = 400
+WORDS = ["canvas", "course", "module", "reading", "essay", "week", "quiz", "notes"]
+
+
+def make_course(submissions: int) -> list[tuple[str, bytes]]:
+    random = Random(0)
+    files = list()
+    for index in range(submissions):
+        text = " ".join(random.choice(WORDS) for _ in range(20_000))
+        files.append(
+            (f"Assignment {index % 20}/Submissions/{index}.txt", text.encode())
+        )
+        files.append(
+            (f"Assignment {index % 20}/Submissions/{index}.jpg", urandom(50_000))
+        )
+    return files
+
+
+def make_grades(submissions: int) -> DataFrame:
+    return DataFrame(
+        {
+            "Assignment ID": [index % 20 for index in range(submissions)],
+            "User Name": [f"Student {index}" for index in range(submissions)],
+            "Score": [index % 100 for index in range(submissions)],
+        }
+    )
+
+
+def measure(codec: Codec, path: Path, files: list[tuple[str, bytes]], grades):
+    archive_path = path / codec.get_archive_name("course")
+    start = perf_counter()
+    with ArchiveSink(archive_path, codec) as sink:
+        sink.add_csv("grades.csv.gz", grades)
+        with sink.open_archive(codec.get_archive_name("submissions")) as files_sink:
+            for name, content in files:
+                files_sink.add_bytes(name, content)
+    elapsed = perf_counter() - start
+    size = archive_path.stat().st_size
+    archive_path.unlink()
+    return elapsed, size
+
+
+def main(submissions: int):
+    files = make_course(submissions)
+    grades = make_grades(submissions)
+    total = sum(len(content) for _, content in files)
+    print(f"{len(files):,} files, {total / 1024 / 1024:,.1f} MB")
+    with TemporaryDirectory() as directory:
+        for codec_name in CODECS:
+            if codec_name.startswith("zstd") and not has_zstandard():
+                print(f"{codec_name:<10}unavailable (install zstandard)")
+                continue
+            elapsed, size = measure(
+                parse_codec(codec_name), Path(directory), files, grades
+            )
+            throughput = total / 1024 / 1024 / elapsed
+            print(
+                f"{codec_name:<10}{elapsed * 1000:>10,.1f} ms"
+                f"{throughput:>10,.1f} MB/s{total / size:>8,.2f}x"
+            )
+
+
+if __name__ == "__main__":
+    main(int(argv[1]) if len(argv) > 1 else SUBMISSIONS)
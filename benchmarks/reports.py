@@ -0,0 +1,78 @@
+from pathlib import Path
+from statistics import median
+from sys import argv
+from tempfile import TemporaryDirectory
+from time import perf_counter
+from typing import Callable
+from zipfile import ZIP_DEFLATED
+from zipfile import Path as ZipPath
+from zipfile import ZipFile
+
+from pandas import DataFrame, read_csv
+
+from penn_canvas.report import has_pyarrow, read_report, write_report_sidecar
+
+COLUMNS = ["canvas_course_id", "course_id", "canvas_account_id", "term_id"]
+DTYPES = {column: "string" for column in COLUMNS}
+ROWS = 200_000
+RUNS = 5
+
+
+def make_provisioning_report(path: Path, rows: int) -> ZipPath:
+    courses = DataFrame(
+        {
+            "canvas_course_id": range(1, rows + 1),
+            "course_id": [f"BAN_SUBJ-{row:06d}-2022A" for row in range(rows)],
+            "short_name": [f"SUBJ {row % 1000:03d}-{row:03d}" for row in range(rows)],
+            "long_name": [f"Course Title Number {row}" for row in range(rows)],
+            "canvas_account_id": [str(99_000 + row % 250) for row in range(rows)],
+            "account_id": [f"ACCOUNT-{row % 250}" for row in range(rows)],
+            "canvas_term_id": 5_000,
+            "term_id": "2022A",
+            "status": "active",
+            "created_by_sis": True,
+        }
+    )
+    zip_path = path / "provisioning_2022A.zip"
+    with ZipFile(zip_path, "w", compression=ZIP_DEFLATED) as zip_file:
+        zip_file.writestr("courses.csv", courses.to_csv(index=False))
+    return ZipPath(zip_path, "courses.csv")
+
+
+def measure(load: Callable[[], DataFrame], runs=RUNS) -> str:
+    times = list()
+    for _ in range(runs):
+        start = perf_counter()
+        load()
+        times.append(perf_counter() - start)
+    return f"{median(times) * 1000:,.1f} ms"
+
+
+def main(rows: int):
+    with TemporaryDirectory() as directory:
+        path = make_provisioning_report(Path(directory), rows)
+
+        def read_full_csv():
+            with path.open("rb") as report:
+                return read_csv(report).astype("string")
+
+        print(f"{rows:,} rows")
+        print(f"{'csv (all columns)':<28}{measure(read_full_csv)}")
+        print(
+            f"{'csv (pruned)':<28}"
+            f"{measure(lambda: read_report(path, usecols=COLUMNS, dtype=DTYPES))}"
+        )
+        if not has_pyarrow():
+            print(f"{'sidecar (pruned)':<28}unavailable (install pyarrow)")
+            return
+        start = perf_counter()
+        write_report_sidecar(path)
+        print(f"{'sidecar (write once)':<28}{(perf_counter() - start) * 1000:,.1f} ms")
+        print(
+            f"{'sidecar (pruned)':<28}"
+            f"{measure(lambda: read_report(path, usecols=COLUMNS, dtype=DTYPES))}"
+        )
+
+
+if __name__ == "__main__":
+    main(int(argv[1]) if len(argv) > 1 else ROWS)
@@ -0,0 +1,85 @@
+from re import compile
+from statistics import median
+from subprocess import run
+from sys import argv, executable
+
+from penn_canvas.main import app
+
+IMPORT_TIME = compile(r"^import time:\s+\d+ \|\s+(\d+) \| (\S.*)$")
+RUNS = 3
+HELP_CODE = (
+    "import sys\n"
+    "from penn_canvas.main import app\n"
+    "try:\n"
+    "    app(['--help'])\n"
+    "except SystemExit:\n"
+    "    pass\n"
+    "print('{marker}' + ','.join(m for m in {modules!r} if m in sys.modules))"
+)
+HEAVY_MODULES = ["canvasapi", "requests", "pandas", "aiohttp"]
+LOADED_MARKER = "loaded modules: "
+
+
+def get_lazy_commands() -> list[str]:
+    return [
+        command.callback.__name__
+        for command in app.registered_commands
+        if command.callback and "load_command" in command.callback.__code__.co_names
+    ]
+
+
+def get_import_time(code: str) -> float | None:
+    process = run(
+        [executable, "-X", "importtime", "-c", code], capture_output=True, text=True
+    )
+    if process.returncode:
+        return None
+    return (
+        sum(
+            int(match.group(1))
+            for match in map(IMPORT_TIME.match, process.stderr.splitlines())
+            if match
+        )
+        / 1000
+    )
+
+
+def measure(code: str, runs=RUNS) -> str:
+    times = [
+        import_time
+        for import_time in (get_import_time(code) for _ in range(runs))
+        if import_time is not None
+    ]
+    if len(times) < runs:
+        return "unavailable"
+    return f"{median(times):,.1f} ms"
+
+
+def check_help_imports():
+    process = run(
+        [
+            executable,
+            "-c",
+            HELP_CODE.format(marker=LOADED_MARKER, modules=HEAVY_MODULES),
+        ],
+        capture_output=True,
+        text=True,
+    )
+    loaded = next(
+        line.removeprefix(LOADED_MARKER)
+        for line in process.stdout.splitlines()
+        if line.startswith(LOADED_MARKER)
+    )
+    assert not loaded, f"--help imports {loaded}"
+
+
+def main(commands: list[str]):
+    check_help_imports()
+    print(f"{'--help':<28}{measure('import penn_canvas.main')}")
+    for command in commands or get_lazy_commands():
+        code = f"from penn_canvas.main import load_command; load_command({command!r})"
+        print(f"{command:<28}{measure(code)}")
+
+
+if __name__ == "__main__":
+    main(argv[1:])
@@ -0,0 +1,168 @@
+from dataclasses import dataclass, field
+from json import dumps, loads
+from pathlib import Path
+from threading import Lock
+from typing import Iterable, Optional
+
+from canvasapi.account import Account
+from loguru import logger
+from typer import echo
+
+from .api import (
+    Instance,
+    format_instance_name,
+    get_account,
+    get_main_account_id,
+    validate_instance_name,
+)
+from .helpers import get_current_reports_directory
+from .pagination import iterate_pages
+from .style import color, pluralize
+
+ACCOUNT_TREES: dict[Instance, "AccountTree"] = dict()
+ACCOUNT_TREES_LOCK = Lock()
+
+
+@dataclass
+class AccountTree:
+    root: str
+    parents: dict[str, Optional[str]]
+    names: dict[str, str] = field(default_factory=dict)
+    descendants: dict[str, frozenset[str]] = field(init=False, repr=False)
+
+    def __post_init__(self):
+        children: dict[str, list[str]] = {account: list() for account in self.parents}
+        for account, parent in self.parents.items():
+            if parent in children:
+                children[parent].append(account)
+        self.descendants = dict()
+        for account in self.get_bottom_up_order(children):
+            self.descendants[account] = frozenset(
+                [account]
+                + [
+                    descendant
+                    for child in children[account]
+                    for descendant in self.descendants[child]
+                ]
+            )
+
+    def get_bottom_up_order(self, children: dict[str, list[str]]) -> list[str]:
+        order = list()
+        stack = [account for account, parent in self.parents.items() if not parent]
+        stack += [
+            account
+            for account, parent in self.parents.items()
+            if parent and parent not in self.parents
+        ]
+        while stack:
+            account = stack.pop()
+            order.append(account)
+            stack.extend(children[account])
+        return order[::-1]
+
+    def __contains__(self, account_id) -> bool:
+        return str(account_id) in self.parents
+
+    def __len__(self) -> int:
+        return len(self.parents)
+
+    def get_descendants(self, account_id=None) -> frozenset[str]:
+        account_id = str(account_id) if account_id else self.root
+        return self.descendants.get(account_id, frozenset([account_id]))
+
+    def is_descendant(self, account_id, ancestor_id) -> bool:
+        return str(account_id) in self.get_descendants(ancestor_id)
+
+    def get_ancestors(self, account_id) -> list[str]:
+        ancestors = list()
+        parent = self.parents.get(str(account_id))
+        while parent and parent not in ancestors:
+            ancestors.append(parent)
+            parent = self.parents.get(parent)
+        return ancestors
+
+    def to_dict(self) -> dict:
+        return {"root": self.root, "parents": self.parents, "names": self.names}
+
+    @classmethod
+    def from_accounts(cls, root: Account, accounts: Iterable[Account]):
+        accounts = [root, *accounts]
+        parents = {
+            str(account.id): (
+                str(account.parent_account_id)
+                if account.parent_account_id and account is not root
+                else None
+            )
+            for account in accounts
+        }
+        names = {str(account.id): account.name for account in accounts}
+        return cls(str(root.id), parents, names)
+
+
+def get_account_tree_path(instance: Instance) -> Path:
+    instance_name = format_instance_name(instance)
+    return get_current_reports_directory() / f"accounts{instance_name}.json"
+
+
+def load_account_tree(path: Path) -> Optional[AccountTree]:
+    if not path.is_file():
+        return None
+    try:
+        return AccountTree(**loads(path.read_text()))
+    except (TypeError, ValueError) as error:
+        logger.warning(f"Ignoring unreadable account tree {path}: {error}")
+        return None
+
+
+def save_account_tree(account_tree: AccountTree, path: Path):
+    partial_path = path.with_name(f"{path.name}.part")
+    partial_path.write_text(dumps(account_tree.to_dict()))
+    partial_path.replace(path)
+
+
+def fetch_account_tree(instance: Instance, verbose=False) -> AccountTree:
+    root = get_account(get_main_account_id(instance), instance=instance)
+    sub_accounts = iterate_pages(root.get_subaccounts(recursive=True))
+    account_tree = AccountTree.from_accounts(root, sub_accounts)
+    if verbose:
+        total = len(account_tree)
+        echo(f"Fetched {total:,} {pluralize('account', total)} from {root.name}")
+    return account_tree
+
+
+def get_account_tree(
+    instance=Instance.PRODUCTION, refresh=False, verbose=False
+) -> AccountTree:
+    with ACCOUNT_TREES_LOCK:
+        if not refresh and instance in ACCOUNT_TREES:
+            return ACCOUNT_TREES[instance]
+        path = get_account_tree_path(instance)
+        account_tree = None if refresh else load_account_tree(path)
+        if not account_tree:
+            account_tree = fetch_account_tree(instance, verbose)
+            save_account_tree(account_tree, path)
+        ACCOUNT_TREES[instance] = account_tree
+        return account_tree
+
+
+def get_account_descendants(
+    account_id: Optional[int | str] = None, instance=Instance.PRODUCTION
+) -> frozenset[str]:
+    return get_account_tree(instance).get_descendants(account_id)
+
+
+def get_sub_account_ids(
+    account_id: Optional[int | str] = None, instance=Instance.PRODUCTION
+) -> list[str]:
+    account_tree = get_account_tree(instance)
+    account_id = str(account_id) if account_id else account_tree.root
+    descendants = account_tree.get_descendants(account_id) - {account_id}
+    return [account_id, *sorted(descendants, key=int)]
+
+
+def accounts_main(instance_name: str | Instance, refresh: bool, verbose: bool):
+    instance = validate_instance_name(instance_name, verbose=True)
+    account_tree = get_account_tree(instance, refresh, verbose)
+    total = len(account_tree)
+    path = color(get_account_tree_path(instance), "blue")
+    echo(f"{total:,} {pluralize('account', total)} cached in {path}")
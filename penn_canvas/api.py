@@ -1,44 +1,34 @@
-from enum import Enum
+from atexit import register
+from dataclasses import dataclass
 from functools import lru_cache
-from pathlib import Path
+from threading import Lock
 from typing import Optional
 
 from canvasapi import Canvas
 from canvasapi.account import Account
 from canvasapi.requester import Requester
-from cx_Oracle import connect, init_oracle_client
 from loguru import logger
+from requests.adapters import HTTPAdapter
 from requests.models import Response
-from typer import Exit, Option, echo, style
+from typer import Exit, echo, style
 
-from .config import get_config_option, get_penn_canvas_config
-from .constants import OPEN_CANVAS_MAIN_ACCOUNT_ID, PENN_CANVAS_MAIN_ACCOUNT_ID
-from .style import pprint
-
-lib_dir = Path.home() / "Downloads/instantclient_19_8"
-config_dir = lib_dir / "network/admin"
-init_oracle_client(
-    lib_dir=str(lib_dir),
-    config_dir=str(config_dir),
+from .cache import (
+    CACHE_SETTINGS,
+    CachedSession,
+    get_response_cache,
+    log_response_cache_stats,
 )
+from .config import get_config_option
+from .constants import (
+    OPEN_CANVAS_MAIN_ACCOUNT_ID,
+    PENN_CANVAS_MAIN_ACCOUNT_ID,
+    Instance,
+)
+from .rate_limit import GovernedSession
+from .style import pprint
 
-
-class Instance(Enum):
-    PRODUCTION = "prod"
-    TEST = "test"
-    BETA = "beta"
-    OPEN = "open"
-    OPEN_TEST = "open_test"
-    OPEN_BETA = "open_beta"
-
-
-def get_instance_option(default=Instance.PRODUCTION):
-    return Option(default.value, "--instance", help="Canvas instance name")
-
-
-def get_data_warehouse_cursor():
-    user, password, dsn = get_penn_canvas_config("data_warehouse")
-    return connect(user, password, dsn).cursor()
+CONNECTION_POOL_SIZE = 32
+EXTERNAL_TOOL_WORKERS = 8
 
 
 def print_instance(instance: Instance):
@@ -97,22 +87,103 @@ def get_canvas_url_and_key(instance=Instance.PRODUCTION) -> tuple[str, str]:
     return url, key
 
 
-def get_canvas(instance=Instance.PRODUCTION, verbose=True, override_key=None) -> Canvas:
-    instance = validate_instance_name(instance)
-    url, key = get_canvas_url_and_key(instance)
-    if override_key:
-        key = override_key
+@dataclass
+class CanvasClientStats:
+    clients_created: int = 0
+    validations: int = 0
+    validations_skipped: int = 0
+
+    @property
+    def requests_saved(self) -> int:
+        return self.validations_skipped
+
+
+CANVAS_CLIENTS: dict[tuple[Instance, str], Canvas] = dict()
+CANVAS_CLIENTS_LOCK = Lock()
+CANVAS_CLIENT_STATS = CanvasClientStats()
+
+
+def get_canvas_requester(canvas: Canvas) -> Requester:
+    return canvas._Canvas__requester  # type: ignore
+
+
+def create_session(pool_size=CONNECTION_POOL_SIZE) -> GovernedSession:
+    if CACHE_SETTINGS.enabled:
+        session: GovernedSession = CachedSession(
+            get_response_cache(), CACHE_SETTINGS.refresh
+        )
+    else:
+        session = GovernedSession()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def create_canvas(instance: Instance, url: str, key: str) -> Canvas:
     canvas = Canvas(url, key)
+    requester = get_canvas_requester(canvas)
+    requester._session.close()
+    requester._session = create_session()
     try:
-        canvas.get_accounts()
-        if verbose:
-            print_instance(instance)
-        return canvas
+        canvas.get_current_user()
     except Exception as error:
         logger.error(error)
         logger.error(f"URL: {url}")
         logger.error(f"KEY: {key}")
         raise SystemExit(f'Failed to connect to Canvas: "{error}"')
+    CANVAS_CLIENT_STATS.clients_created += 1
+    CANVAS_CLIENT_STATS.validations += 1
+    logger.info(f"Connected to {instance.name} Canvas ({url})")
+    return canvas
+
+
+def get_canvas(instance=Instance.PRODUCTION, verbose=True, override_key=None) -> Canvas:
+    instance = validate_instance_name(instance)
+    url, key = get_canvas_url_and_key(instance)
+    if override_key:
+        key = override_key
+    with CANVAS_CLIENTS_LOCK:
+        canvas = CANVAS_CLIENTS.get((instance, key))
+        if canvas:
+            CANVAS_CLIENT_STATS.validations_skipped += 1
+        else:
+            canvas = create_canvas(instance, url, key)
+            CANVAS_CLIENTS[(instance, key)] = canvas
+    if verbose:
+        print_instance(instance)
+    return canvas
+
+
+def get_requester(instance=Instance.PRODUCTION) -> Requester:
+    return get_canvas_requester(get_canvas(instance, verbose=False))
+
+
+def clear_canvas_clients():
+    with CANVAS_CLIENTS_LOCK:
+        for canvas in CANVAS_CLIENTS.values():
+            get_canvas_requester(canvas)._session.close()
+        CANVAS_CLIENTS.clear()
+
+
+@register
+def log_canvas_client_stats():
+    if not CANVAS_CLIENT_STATS.clients_created:
+        return
+    logger.info(
+        f"Canvas clients created: {CANVAS_CLIENT_STATS.clients_created}, validations:"
+        f" {CANVAS_CLIENT_STATS.validations}, validations skipped:"
+        f" {CANVAS_CLIENT_STATS.validations_skipped}, requests saved:"
+        f" {CANVAS_CLIENT_STATS.requests_saved}"
+    )
+    for (instance, _), canvas in CANVAS_CLIENTS.items():
+        session = get_canvas_requester(canvas)._session
+        if isinstance(session, GovernedSession) and session.governor.throttled:
+            logger.info(
+                f"{instance.name} Canvas requests throttled:"
+                f" {session.governor.throttled}"
+            )
+    log_response_cache_stats()
 
 
 def get_account(
@@ -197,69 +268,43 @@ def get_main_account_id(instance: Instance = Instance.PRODUCTION) -> int:
     }.get(instance, PENN_CANVAS_MAIN_ACCOUNT_ID)
 
 
-def get_sub_account_ids(
-    account_id: Optional[int] = None,
-    instance=Instance.PRODUCTION,
-    verbose=False,
-) -> list[str]:
-    if not account_id:
-        account_id = get_main_account_id(instance)
-    account = get_canvas(instance, verbose).get_account(account_id)
-    account_ids = [account_id] + [
-        account.id for account in account.get_subaccounts(recursive=True)
-    ]
-    return [str(account_id) for account_id in account_ids]
-
-
-def get_enrollment_term_id(
-    term_name: str,
-    account: int | Account = PENN_CANVAS_MAIN_ACCOUNT_ID,
-    instance: Instance = Instance.PRODUCTION,
-) -> int:
-    account = get_account(account, instance=instance)
-    term_id = next(
-        (term.id for term in account.get_enrollment_terms() if term_name in term.name),
-        None,
-    )
-    if not term_id:
-        enrollment_terms = [term.name for term in account.get_enrollment_terms()]
-        echo(f"- ERROR: Enrollment term not found: {term_name}")
-        echo("- Available enrollment terms are:")
-        for enrollment_term in enrollment_terms:
-            echo(f"\t{enrollment_term}")
-        raise Exit()
-    else:
-        return term_id
-
-
 def request_external_url(
     url: str, instance=Instance.PRODUCTION, method="GET"
 ) -> Response:
-    canvas_url, key = get_canvas_url_and_key(instance)
-    return Requester(canvas_url, key).request(method, _url=url)
+    return get_requester(instance).request(method, _url=url)
 
 
 def request_canvas_api_endpoint(
     endpoint: str, instance=Instance.PRODUCTION, method="GET"
 ) -> Response:
-    base_url, key = get_canvas_url_and_key(instance)
     prefix = "api/v1"
     if endpoint.startswith(prefix):
         endpoint = endpoint.replace(prefix, "")
     elif endpoint.startswith("api/v1", 1):
         endpoint = endpoint.replace(f"/{prefix}", "")
-    return Requester(base_url, key).request(method, endpoint)
-
-
-def get_external_tool_names(verbose=False):
-    account = get_account()
-    sub_accounts = list(account.get_subaccounts(recursive=True))
-    external_tool_names = list()
-    for sub_account in sub_accounts:
-        external_tool_names = external_tool_names + [
-            tool.name.lower() for tool in list(sub_account.get_external_tools())
-        ]
-    external_tool_names = sorted(set(external_tool_names))
+    return get_requester(instance).request(method, endpoint)
+
+
+def get_account_external_tool_names(
+    account_id: str, instance=Instance.PRODUCTION
+) -> list[str]:
+    account = Account(get_requester(instance), {"id": account_id})
+    return [tool.name.lower() for tool in account.get_external_tools()]
+
+
+def get_external_tool_names(
+    verbose=False, instance=Instance.PRODUCTION, workers=EXTERNAL_TOOL_WORKERS
+):
+    from .accounts import get_account_tree
+    from .helpers import map_rows
+
+    account_tree = get_account_tree(instance)
+    tool_names = map_rows(
+        account_tree.get_descendants() - {account_tree.root},
+        lambda account_id: get_account_external_tool_names(account_id, instance),
+        workers,
+    )
+    external_tool_names = sorted({name for names in tool_names for name in names})
     if verbose:
         print(*external_tool_names, sep="\n")
     return external_tool_names
@@ -2,38 +2,32 @@ from pathlib import Path
 from time import sleep
 from typing import Optional
 
-from canvasapi.assignment import Assignment
-from canvasapi.course import Course
-from requests.api import post
 from typer import Option, Typer, echo
 
-from penn_canvas.api import get_course, get_instance_option, validate_instance_name
 from penn_canvas.helpers import (
     BASE_PATH,
     COURSE_IDS,
-    CURRENT_YEAR_AND_TERM,
     FORCE,
     FORCE_REPORT,
     VERBOSE,
+    create_directories,
     create_directory,
     get_course_ids_from_input,
+    get_instance_option,
     switch_logger_file,
 )
-from penn_canvas.report import get_course_ids_from_reports
-from penn_canvas.style import color, print_item
+from penn_canvas.style import color, pluralize
 
-from .announcements import fetch_announcements, unpack_announcements
-from .assignments.assignments import fetch_assignments, unpack_assignments
-from .content import CONTENT_TAR_STEM, fetch_content, unpack_content
-from .discussions import fetch_discussions, unpack_discussions
-from .grades import fetch_grades, unpack_grades
-from .groups import fetch_groups, unpack_groups
-from .helpers import format_name
-from .modules import fetch_modules, unpack_modules
-from .pages import fetch_pages, unpack_pages
-from .quizzes.quizzes import fetch_quizzes, unpack_quizzes
-from .rubrics import fetch_rubrics, unpack_rubrics
-from .syllabus import fetch_syllabus, unpack_syllabus
+from .codec import DEFAULT_CODEC, parse_codec, set_archive_codec
+from .scheduler import (
+    COMPONENTS,
+    EXPORT_LOOKAHEAD,
+    archive_courses,
+    format_course_name,
+    get_component,
+    get_component_module,
+    print_course,
+)
 
 archive_app = Typer(
     no_args_is_help=True,
@@ -63,28 +57,29 @@ discussions = Option(
 grades = Option(None, "--grades/--no-grades", help="Include/exclude course grades")
 rubrics = Option(None, "--rubrics/--no-rubrics", help="Include/exclude course rubrics")
 quizzes = Option(None, "--quizzes/--no-quizzes", help="Include/exclude course quizzes")
-COMMAND_PATH = create_directory(BASE_PATH / "Archive")
-COMPRESSED_COURSES = create_directory(COMMAND_PATH / "Compressed Courses")
-UNPACKED_COURSES = create_directory(COMMAND_PATH / "Courses")
-LOGS = create_directory(COMMAND_PATH / "Logs")
-
-
-def format_course_name(course: Course) -> str:
-    return f"{format_name(course.name)} ({course.id})"
-
-
-def print_course(index: int, total: int, course_name: str):
-    print_item(index, total, color(course_name, "blue"))
+COMMAND_PATH = BASE_PATH / "Archive"
+COMPRESSED_COURSES = COMMAND_PATH / "Compressed Courses"
+UNPACKED_COURSES = COMMAND_PATH / "Courses"
+LOGS = COMMAND_PATH / "Logs"
 
 
 def should_run_option(option: Optional[bool], use_all: bool) -> bool:
     return option if isinstance(option, bool) else use_all
 
 
+def validate_codec(codec: str) -> str:
+    return str(parse_codec(codec))
+
+
 @archive_app.command()
 def fetch(
     course_ids: Optional[list[int]] = COURSE_IDS,
-    terms: list[str] = Option([CURRENT_YEAR_AND_TERM], "--term", help="Term name"),
+    terms: list[str] = Option(
+        [],
+        "--term",
+        help="Term name (defaults to the current term)",
+        show_default=False,
+    ),
     instance_name: str = get_instance_option(),
     content: Optional[bool] = content,
     announcements: Optional[bool] = announcements,
@@ -101,6 +96,27 @@ def fetch(
     force: bool = FORCE,
     force_report: bool = FORCE_REPORT,
     verbose: bool = VERBOSE,
+    course_workers: int = Option(
+        1, "--course-workers", min=1, help="The number of courses to archive at once"
+    ),
+    component_workers: int = Option(
+        1,
+        "--component-workers",
+        min=1,
+        help="The number of components to archive at once for each course",
+    ),
+    export_lookahead: int = Option(
+        EXPORT_LOOKAHEAD,
+        "--export-lookahead",
+        min=0,
+        help="The number of upcoming courses to start content exports for",
+    ),
+    codec: str = Option(
+        str(DEFAULT_CODEC),
+        "--codec",
+        callback=validate_codec,
+        help="Compression for archive files: gzip[:LEVEL], zstd[:LEVEL] or none",
+    ),
 ):
     """
     Archive Canvas courses
@@ -108,65 +124,65 @@ def fetch(
     Options with both "include" and "exclude" flags will all be included if none
     of the flags are specified.
     """
-    archive_all = not any(
-        [
-            content,
-            announcements,
-            modules,
-            pages,
-            syllabus,
-            assignments,
-            groups,
-            discussions,
-            grades,
-            rubrics,
-            quizzes,
-        ]
-    )
+    from penn_canvas.api import validate_instance_name
+    from penn_canvas.report import get_course_ids_from_reports
+
+    options = {
+        "content": content,
+        "announcements": announcements,
+        "modules": modules,
+        "pages": pages,
+        "syllabus": syllabus,
+        "assignments": assignments,
+        "groups": groups,
+        "discussions": discussions,
+        "grades": grades,
+        "rubrics": rubrics,
+        "quizzes": quizzes,
+    }
+    archive_all = not any(options.values())
+    components = [
+        component
+        for component in COMPONENTS
+        if should_run_option(options[component], archive_all)
+    ]
     instance = validate_instance_name(instance_name, verbose=True)
     switch_logger_file(LOGS, "archive", instance.name)
+    create_directories(COMPRESSED_COURSES, UNPACKED_COURSES)
+    set_archive_codec(parse_codec(codec))
     if not course_ids:
         courses = get_course_ids_from_reports(terms, instance, force_report, verbose)
     else:
         courses = get_course_ids_from_input(course_ids)
-    total = len(courses)
-    for index, course_id in enumerate(courses):
-        course = get_course(course_id, include=["syllabus_body"], instance=instance)
-        course_name = format_course_name(course)
-        print_course(index, total, course_name)
-        compress_path = create_directory(COMPRESSED_COURSES / course_name)
-        unpack_path = UNPACKED_COURSES / course_name
-        assignment_objects: Optional[list[Assignment]] = list()
-        args = (course, compress_path, unpack_path, unpack, force)
-        if should_run_option(content, archive_all):
-            fetch_content(*args, instance, verbose)
-        if should_run_option(announcements, archive_all):
-            fetch_announcements(*args, verbose)
-        if should_run_option(modules, archive_all):
-            fetch_modules(*args, instance, verbose)
-        if should_run_option(pages, archive_all):
-            fetch_pages(*args, verbose)
-        if should_run_option(syllabus, archive_all):
-            fetch_syllabus(*args, verbose)
-        if should_run_option(assignments, archive_all):
-            assignment_objects = fetch_assignments(*args, instance, verbose)
-        if should_run_option(groups, archive_all):
-            fetch_groups(*args, verbose)
-        if should_run_option(discussions, archive_all):
-            fetch_discussions(*args, instance, verbose)
-        if should_run_option(grades, archive_all):
-            fetch_grades(*args, assignment_objects, instance, verbose)
-        if should_run_option(rubrics, archive_all):
-            fetch_rubrics(*args, verbose)
-        if should_run_option(quizzes, archive_all):
-            fetch_quizzes(*args, instance, verbose)
-        echo("COMPELTE")
+    incomplete = archive_courses(
+        courses,
+        components,
+        COMPRESSED_COURSES,
+        UNPACKED_COURSES,
+        instance,
+        unpack,
+        force,
+        verbose,
+        course_workers,
+        component_workers,
+        export_lookahead,
+    )
+    if incomplete:
+        echo(
+            color(f"{incomplete:,} {pluralize('course', incomplete)} incomplete", "red")
+        )
+    echo("COMPLETE")
 
 
 @archive_app.command()
 def unpack(
     course_ids: Optional[list[int]] = COURSE_IDS,
-    terms: list[str] = Option([CURRENT_YEAR_AND_TERM], "--term", help="Term name"),
+    terms: list[str] = Option(
+        [],
+        "--term",
+        help="Term name (defaults to the current term)",
+        show_default=False,
+    ),
     instance_name: str = get_instance_option(),
     content: Optional[bool] = content,
     announcements: Optional[bool] = announcements,
@@ -189,6 +205,9 @@ def unpack(
     Options with both "include" and "exclude" flags will all be included if none
     of the flags are specified.
     """
+    from penn_canvas.api import get_course, validate_instance_name
+    from penn_canvas.report import get_course_ids_from_reports
+
     unpack_all = not any(
         [
             content,
@@ -206,6 +225,7 @@ def unpack(
     )
     instance = validate_instance_name(instance_name, verbose=True)
     switch_logger_file(LOGS, "archive", instance.name)
+    create_directories(COMPRESSED_COURSES, UNPACKED_COURSES)
     if not course_ids:
         courses = get_course_ids_from_reports(terms, instance, force_report, verbose)
     else:
@@ -220,40 +240,51 @@ def unpack(
         unpack_path = create_directory(UNPACKED_COURSES / course_name)
         args = (compress_path, unpack_path, force, verbose)
         if should_run_option(content, unpack_all):
-            unpack_content(*args)
+            get_component("content", "unpack")(*args)
         if should_run_option(announcements, unpack_all):
-            unpack_announcements(*args)
+            get_component("announcements", "unpack")(*args)
         if should_run_option(modules, unpack_all):
-            unpack_modules(*args)
+            get_component("modules", "unpack")(*args)
         if should_run_option(pages, unpack_all):
-            unpack_pages(*args)
+            get_component("pages", "unpack")(*args)
         if should_run_option(syllabus, unpack_all):
-            unpack_syllabus(*args)
+            get_component("syllabus", "unpack")(*args)
         if should_run_option(assignments, unpack_all):
-            unpack_assignments(*args)
+            get_component("assignments", "unpack")(*args)
         if should_run_option(groups, unpack_all):
-            unpack_groups(*args)
+            get_component("groups", "unpack")(*args)
         if should_run_option(discussions, unpack_all):
-            unpack_discussions(*args)
+            get_component("discussions", "unpack")(*args)
         if should_run_option(grades, unpack_all):
-            unpack_grades(*args)
+            get_component("grades", "unpack")(*args)
         if should_run_option(rubrics, unpack_all):
-            unpack_rubrics(*args)
+            get_component("rubrics", "unpack")(*args)
         if should_run_option(quizzes, unpack_all):
-            unpack_quizzes(*args)
+            get_component("quizzes", "unpack")(*args)
         echo("COMPELTE")
 
 
 @archive_app.command()
 def restore(
     course_ids: Optional[list[int]] = COURSE_IDS,
-    terms: list[str] = Option([CURRENT_YEAR_AND_TERM], "--term", help="Term name"),
+    terms: list[str] = Option(
+        [],
+        "--term",
+        help="Term name (defaults to the current term)",
+        show_default=False,
+    ),
     instance_name: str = get_instance_option(),
     force_report: bool = FORCE_REPORT,
     verbose: bool = VERBOSE,
 ):
+    from requests.api import post
+
+    from penn_canvas.api import get_course, validate_instance_name
+    from penn_canvas.report import get_course_ids_from_reports
+
     instance = validate_instance_name(instance_name, verbose=True)
     switch_logger_file(LOGS, "archive", instance.name)
+    create_directories(COMPRESSED_COURSES, UNPACKED_COURSES)
     if not course_ids:
         courses = get_course_ids_from_reports(terms, instance, force_report, verbose)
     else:
@@ -261,7 +292,7 @@ def restore(
     total = len(courses)
     for index, course_id in enumerate(courses):
         content_file = next(
-            path / CONTENT_TAR_STEM
+            path / get_component_module("content").CONTENT_TAR_STEM
             for path in Path(COMPRESSED_COURSES).iterdir()
             if path.is_dir() and str(course_id) in path.name
         )
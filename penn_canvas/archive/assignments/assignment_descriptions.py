@@ -6,13 +6,14 @@ from canvasapi.assignment import Assignment
 from pandas import DataFrame, read_csv
 from typer import echo
 
+from penn_canvas.archive.codec import extract_file
 from penn_canvas.archive.helpers import (
     CSV_COMPRESSION_TYPE,
-    extract_file,
     format_name,
     format_text,
     print_description,
 )
+from penn_canvas.archive.sink import ArchiveSink
 from penn_canvas.helpers import (
     create_directory,
     print_task_complete_message,
@@ -76,7 +77,7 @@ def unpack_descriptions(
 
 
 def fetch_descriptions(
-    assignments: list[Assignment], compress_path: Path, verbose: bool, total: int
+    assignments: list[Assignment], sink: ArchiveSink, verbose: bool, total: int
 ):
     echo(") Fetching assignment descriptions...")
     description_rows = [
@@ -85,5 +86,4 @@ def fetch_descriptions(
     ]
     columns = [ASSIGNMENT_ID, QUIZ_ASSIGNMENT, QUIZ_ID, ASSIGNMENT_NAME, DESCRIPTION]
     descriptions = DataFrame(description_rows, columns=columns)
-    descriptions_path = compress_path / DESCRIPTIONS_COMPRESSED_FILE
-    descriptions.to_csv(descriptions_path, index=False)
+    sink.add_csv(DESCRIPTIONS_COMPRESSED_FILE, descriptions)
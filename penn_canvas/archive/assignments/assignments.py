@@ -1,5 +1,4 @@
 from pathlib import Path
-from shutil import make_archive, rmtree
 from typing import Optional
 
 from canvasapi.assignment import Assignment
@@ -7,19 +6,17 @@ from canvasapi.course import Course
 from typer import echo
 
 from penn_canvas.api import Instance
-from penn_canvas.archive.helpers import (
-    TAR_COMPRESSION_TYPE,
-    TAR_EXTENSION,
-    print_unpacked_file,
-)
+from penn_canvas.archive.codec import find_archive, get_archive_name
+from penn_canvas.archive.helpers import print_unpacked_file
+from penn_canvas.archive.sink import ArchiveSink
 from penn_canvas.helpers import create_directory
+from penn_canvas.users import get_user_resolver
 
 from .assignment_descriptions import fetch_descriptions, unpack_descriptions
 from .comments import fetch_submission_comments, unpack_submission_comments
 from .submissions import fetch_submissions, unpack_submissions
 
 ASSIGNMENTS = "assignments"
-ASSIGNMENTS_TAR_NAME = f"{ASSIGNMENTS}.{TAR_EXTENSION}"
 
 
 def unpack_assignments(
@@ -31,8 +28,8 @@ def unpack_assignments(
     if already_complete:
         echo("Assignments already unpacked.")
         return None
-    archive_tar_path = compress_path / ASSIGNMENTS_TAR_NAME
-    if not archive_tar_path.is_file():
+    archive_tar_path = find_archive(compress_path, ASSIGNMENTS)
+    if not archive_tar_path:
         return None
     unpack_path = create_directory(unpack_path)
     unpack_descriptions(compress_path, archive_tar_path, unpack_path, verbose)
@@ -51,23 +48,19 @@ def fetch_assignments(
     verbose: bool,
 ) -> Optional[list[Assignment]]:
     echo(") Fetching assignments...")
-    assignments_tar = compress_path / ASSIGNMENTS_TAR_NAME
-    already_complete = not force and assignments_tar.exists()
+    assignments_tar = compress_path / get_archive_name(ASSIGNMENTS)
+    already_complete = not force and bool(find_archive(compress_path, ASSIGNMENTS))
     if already_complete:
         echo("Assignments already fetched.")
         assignments = None
     else:
         assignments = list(course.get_assignments())
         total = len(assignments)
-        assignments_path = create_directory(compress_path / ASSIGNMENTS)
-        fetch_descriptions(assignments, assignments_path, verbose, total)
-        fetch_submissions(assignments, assignments_path, instance, verbose, total)
-        fetch_submission_comments(assignments, assignments_path, verbose, total)
-        make_archive_path = str(assignments_path)
-        make_archive(
-            make_archive_path, TAR_COMPRESSION_TYPE, root_dir=make_archive_path
-        )
-        rmtree(assignments_path, ignore_errors=True)
+        get_user_resolver(instance).load_course(course)
+        with ArchiveSink(assignments_tar) as sink:
+            fetch_descriptions(assignments, sink, verbose, total)
+            fetch_submissions(assignments, sink, instance, verbose, total)
+            fetch_submission_comments(assignments, sink, verbose, total)
     if unpack:
         unpacked_path = unpack_assignments(
             compress_path, unpack_path, force, verbose=False
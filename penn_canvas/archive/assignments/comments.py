@@ -11,14 +11,15 @@ from penn_canvas.archive.assignments.assignment_descriptions import (
     ASSIGNMENT_ID,
     ASSIGNMENT_NAME,
 )
+from penn_canvas.archive.codec import extract_file
 from penn_canvas.archive.helpers import (
     CSV_COMPRESSION_TYPE,
-    extract_file,
     format_display_text,
     format_name,
     get_assignment_submissions,
     get_submission_display,
 )
+from penn_canvas.archive.sink import ArchiveSink
 from penn_canvas.helpers import (
     create_directory,
     format_timestamp,
@@ -160,7 +161,7 @@ def unpack_submission_comments(
 
 
 def fetch_submission_comments(
-    assignments: list[Assignment], assignments_path: Path, verbose: bool, total: int
+    assignments: list[Assignment], sink: ArchiveSink, verbose: bool, total: int
 ):
     echo(") Fetching assignment submission comments...")
     comments_rows = [
@@ -179,5 +180,4 @@ def fetch_submission_comments(
         "Media Comment",
     ]
     comments = DataFrame(comments_rows, columns=columns)
-    comments_path = assignments_path / SUBMISSION_COMMENTS_COMPRESSED_FILE
-    comments.to_csv(comments_path, index=False)
+    sink.add_csv(SUBMISSION_COMMENTS_COMPRESSED_FILE, comments)
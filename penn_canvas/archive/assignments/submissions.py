@@ -1,41 +1,41 @@
+from dataclasses import dataclass, field
 from mimetypes import guess_extension
 from os import remove
 from pathlib import Path
-from shutil import make_archive, rmtree, unpack_archive
-from tarfile import open as open_tarfile
 from typing import Optional
 
 from canvasapi.assignment import Assignment
 from canvasapi.submission import Submission
 from canvasapi.user import User
 from click.utils import echo
-from magic.magic import from_file
+from magic.magic import from_buffer
 from pandas import DataFrame
 from pandas.io.parsers.readers import read_csv
 
-from penn_canvas.api import Instance, get_user
+from penn_canvas.api import Instance
 from penn_canvas.archive.assignments.assignment_descriptions import (
     ASSIGNMENT_ID,
     ASSIGNMENT_NAME,
 )
+from penn_canvas.archive.codec import extract_archive, extract_file, unpack_tar
 from penn_canvas.archive.helpers import (
     CSV_COMPRESSION_TYPE,
-    TAR_COMPRESSION_TYPE,
-    TAR_EXTENSION,
     format_display_text,
     format_name,
     get_assignment_submissions,
     get_submission_display,
     strip_tags,
 )
+from penn_canvas.archive.sink import ArchiveSink
+from penn_canvas.downloads import DOWNLOAD_WORKERS
 from penn_canvas.helpers import (
     create_directory,
-    download_file,
     print_task_complete_message,
     write_file,
 )
 from penn_canvas.report import flatten
 from penn_canvas.style import color, print_item
+from penn_canvas.users import get_user_resolver
 
 GRADES_COMPRESSED_FILE = f"grades.{CSV_COMPRESSION_TYPE}"
 USER_ID = "User ID"
@@ -46,11 +46,20 @@ GRADE = "Grade"
 SCORE = "Score"
 GRADER_NAME = "Grader Name"
 UNPACK_SUBMISSIONS_DIRECTORY = "Submissions"
+MIME_SNIFF_SIZE = 2048
+SUBMISSION_FILES_TAR_STEM = "submission_files"
+
+
+@dataclass
+class SubmissionAttachment:
+    url: str
+    extension: str
+    names: list[str] = field(default_factory=list)
 
 
 def get_grader(submission: Submission, instance: Instance) -> Optional[User]:
     try:
-        return get_user(submission.grader_id, instance=instance)
+        return get_user_resolver(instance).get(submission.grader_id)
     except Exception:
         return None
 
@@ -85,20 +94,33 @@ def get_attachment_url_and_filename(attachment: dict):
 def get_attachments(submission: Submission) -> Optional[list[tuple]]:
     try:
         return [
-            get_attachment_url_and_filename(attachment)
+            (attachment.get("id"), *get_attachment_url_and_filename(attachment))
             for attachment in submission.attachments
         ]
     except Exception:
         return None
 
 
-def download_submission_files(
-    submission: Submission, user_name: str, assignment_path: Path
+def get_submission_user_name(submission: Submission, instance: Instance) -> str:
+    user = getattr(submission, "user", None)
+    if isinstance(user, dict) and user.get("name"):
+        return user["name"]
+    return get_user_resolver(instance).get(submission.user_id).name
+
+
+def get_mime_extension(head: bytes) -> str:
+    return guess_extension(from_buffer(head, mime=True)) or ""
+
+
+def add_submission_attachments(
+    submission: Submission,
+    user_name: str,
+    assignment_path: str,
+    attachments: dict[str, SubmissionAttachment],
 ):
-    attachments = get_attachments(submission)
-    if not attachments:
-        return
-    for url, filename in attachments:
+    for attachment_id, url, filename in get_attachments(submission) or list():
+        if not url:
+            continue
         try:
             name, extension = filename.split(".")
         except Exception:
@@ -106,13 +128,28 @@ def download_submission_files(
             extension = ""
         name = f"{format_name(name)} ({user_name})"
         file_name = f"{name} ({user_name}).{extension.lower()}" if extension else name
-        submission_file_path = create_directory(assignment_path) / file_name
-        download_file(submission_file_path, url)
-        if not extension:
-            mime_type = from_file(str(submission_file_path), mime=True)
-            submission_file_path.rename(
-                f"{submission_file_path}{guess_extension(mime_type)}"
-            )
+        attachment = attachments.setdefault(
+            str(attachment_id or url), SubmissionAttachment(url, extension)
+        )
+        member_name = f"{assignment_path}/{file_name}"
+        if member_name not in attachment.names:
+            attachment.names.append(member_name)
+
+
+def download_submission_files(
+    files_sink: ArchiveSink,
+    attachments: list[SubmissionAttachment],
+    workers=DOWNLOAD_WORKERS,
+):
+    urls = (attachment.url for attachment in attachments)
+    downloads = files_sink.fetch_all(urls, workers=workers, head_size=MIME_SNIFF_SIZE)
+    for attachment, download in zip(attachments, downloads):
+        if not download:
+            continue
+        extension = "" if attachment.extension else get_mime_extension(download.head)
+        for name in attachment.names:
+            files_sink.add_file(f"{name}{extension}", download.path)
+        download.path.unlink()
 
 
 def get_submission_grades(
@@ -122,7 +159,7 @@ def get_submission_grades(
     index: int,
     total: int,
 ) -> list[User | str | int]:
-    user = get_user(submission.user_id, instance=instance)
+    user = get_user_resolver(instance).get(submission.user_id)
     grader = get_grader(submission, instance)
     grade = get_grade(submission)
     score = get_score(submission)
@@ -181,12 +218,12 @@ def get_assignment_grades(
 def unpack_submissions(
     compress_path: Path, archive_tar_path: Path, unpack_path: Path, verbose: bool
 ):
-    assignments_tar_file = open_tarfile(archive_tar_path)
-    assignments_tar_file.extract(f"./{GRADES_COMPRESSED_FILE}", compress_path)
-    assignments_tar_file.extract(f"./submission_files.{TAR_EXTENSION}", compress_path)
+    extract_file(f"./{GRADES_COMPRESSED_FILE}", archive_tar_path, compress_path)
+    unpacked_files_path = extract_archive(
+        f"./{SUBMISSION_FILES_TAR_STEM}", archive_tar_path, compress_path
+    )
     unpacked_submissions_path = compress_path / GRADES_COMPRESSED_FILE
-    unpacked_files_path = compress_path / f"submission_files.{TAR_EXTENSION}"
-    unpack_archive(unpacked_files_path, unpack_path)
+    unpack_tar(unpacked_files_path, unpack_path)
     submissions_data = read_csv(unpacked_submissions_path)
     columns = [USER_ID, GRADER_ID]
     submissions_data = submissions_data.drop(columns, axis=1)
@@ -228,13 +265,13 @@ def unpack_submissions(
     if verbose:
         print_task_complete_message(unpack_path)
     remove(unpacked_submissions_path)
-    remove(compress_path / f"submission_files.{TAR_EXTENSION}")
+    remove(unpacked_files_path)
     return unpack_path
 
 
 def fetch_submissions(
     assignments: list[Assignment],
-    assignments_path: Path,
+    sink: ArchiveSink,
     instance: Instance,
     verbose: bool,
     total: int,
@@ -258,29 +295,41 @@ def fetch_submissions(
         BODY,
     ]
     grades_data = DataFrame(grades, columns=columns)
-    grades_path = assignments_path / GRADES_COMPRESSED_FILE
-    grades_data.to_csv(grades_path, index=False)
+    sink.add_csv(GRADES_COMPRESSED_FILE, grades_data)
     echo(") Fetching submission files...")
-    submissions_path = create_directory(assignments_path / "submission_files")
+    attachments: dict[str, SubmissionAttachment] = dict()
     for index, assignment in enumerate(assignments):
-        assignment_name = format_name(assignment.name)
+        get_assignment_attachments(
+            assignment, attachments, instance, verbose, index, total
+        )
+    files_tar_name = sink.codec.get_archive_name(SUBMISSION_FILES_TAR_STEM)
+    with sink.open_archive(files_tar_name) as files_sink:
+        download_submission_files(files_sink, list(attachments.values()))
+
+
+def get_assignment_attachments(
+    assignment: Assignment,
+    attachments: dict[str, SubmissionAttachment],
+    instance: Instance,
+    verbose: bool,
+    index: int,
+    total: int,
+):
+    assignment_name = format_name(assignment.name)
+    if verbose:
+        assignment_display = color(format_display_text(assignment_name))
+        print_item(index, total, color(assignment_display))
+    submissions = get_assignment_submissions(assignment)
+    submissions_total = len(submissions)
+    for submission_index, submission in enumerate(submissions):
         if verbose:
-            assignment_display = color(format_display_text(assignment_name))
-            print_item(index, total, color(assignment_display))
-        submissions = get_assignment_submissions(assignment)
-        submissions_total = len(submissions)
-        for submission_index, submission in enumerate(submissions):
-            if verbose:
-                submission_display = get_submission_display(submission)
-                print_item(
-                    submission_index,
-                    submissions_total,
-                    submission_display,
-                    prefix="\t*",
-                )
-            user_name = get_user(submission.user_id, instance=instance).name
-            assignment_path = submissions_path / assignment_name / "Submissions"
-            download_submission_files(submission, user_name, assignment_path)
-    submission_files = str(submissions_path)
-    make_archive(submission_files, TAR_COMPRESSION_TYPE, root_dir=submission_files)
-    rmtree(submissions_path, ignore_errors=True)
+            submission_display = get_submission_display(submission)
+            print_item(
+                submission_index,
+                submissions_total,
+                submission_display,
+                prefix="\t*",
+            )
+        user_name = get_submission_user_name(submission, instance)
+        assignment_path = f"{assignment_name}/Submissions"
+        add_submission_attachments(submission, user_name, assignment_path, attachments)
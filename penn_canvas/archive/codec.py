@@ -0,0 +1,167 @@
+from contextlib import ExitStack, contextmanager
+from dataclasses import dataclass
+from functools import lru_cache
+from importlib.util import find_spec
+from pathlib import Path
+from tarfile import TarFile
+from tarfile import open as open_tarfile
+from typing import Iterator, Optional
+
+from typer import BadParameter
+
+GZIP = "gzip"
+ZSTD = "zstd"
+NONE = "none"
+CODEC_LEVELS = {GZIP: range(1, 10), ZSTD: range(1, 23), NONE: range(0)}
+DEFAULT_LEVELS = {GZIP: 6, ZSTD: 3, NONE: None}
+CODEC_EXTENSIONS = {GZIP: "tar.gz", ZSTD: "tar.zst", NONE: "tar"}
+GZIP_MAGIC = b"\x1f\x8b"
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+ZSTD_THREADS = -1
+
+
+@lru_cache
+def has_zstandard() -> bool:
+    return find_spec("zstandard") is not None
+
+
+@dataclass(frozen=True)
+class Codec:
+    name: str = GZIP
+    level: Optional[int] = DEFAULT_LEVELS[GZIP]
+
+    def __str__(self) -> str:
+        return f"{self.name}:{self.level}" if self.level else self.name
+
+    @property
+    def extension(self) -> str:
+        return CODEC_EXTENSIONS[self.name]
+
+    def get_archive_name(self, stem: str) -> str:
+        return f"{stem}.{self.extension}"
+
+    def get_csv_level(self) -> int:
+        return self.level if self.name == GZIP and self.level else DEFAULT_LEVELS[GZIP]
+
+    def open_writer(self, path: Path, streams: ExitStack) -> TarFile:
+        if self.name == ZSTD:
+            from zstandard import ZstdCompressor
+
+            compressor = ZstdCompressor(level=self.level, threads=ZSTD_THREADS)
+            stream = streams.enter_context(open(path, "wb"))
+            writer = streams.enter_context(compressor.stream_writer(stream))
+            return open_tarfile(fileobj=writer, mode="w|")
+        if self.name == NONE:
+            return open_tarfile(path, "w")
+        return open_tarfile(path, "w:gz", compresslevel=self.level)
+
+
+DEFAULT_CODEC = Codec()
+ARCHIVE_CODECS = {"codec": DEFAULT_CODEC}
+
+
+def parse_codec(value: str) -> Codec:
+    name, _, level = value.lower().partition(":")
+    if name not in CODEC_LEVELS:
+        raise BadParameter(f"Codec must be one of: {', '.join(CODEC_LEVELS)}")
+    if level and (not level.isdigit() or int(level) not in CODEC_LEVELS[name]):
+        raise BadParameter(f"Invalid {name} compression level: {level}")
+    if name == ZSTD and not has_zstandard():
+        raise BadParameter("zstd requires the zstandard package")
+    return Codec(name, int(level) if level else DEFAULT_LEVELS[name])
+
+
+def get_archive_codec() -> Codec:
+    return ARCHIVE_CODECS["codec"]
+
+
+def set_archive_codec(codec: Codec):
+    ARCHIVE_CODECS["codec"] = codec
+
+
+def get_archive_name(stem: str) -> str:
+    return get_archive_codec().get_archive_name(stem)
+
+
+def get_archive_stem(name: str) -> Optional[str]:
+    for extension in CODEC_EXTENSIONS.values():
+        if name.endswith(f".{extension}"):
+            return name[: -len(extension) - 1]
+    return None
+
+
+def get_archive_paths(directory: Path, stem: str) -> list[Path]:
+    paths = (
+        directory / f"{stem}.{extension}" for extension in CODEC_EXTENSIONS.values()
+    )
+    return [path for path in paths if path.is_file()]
+
+
+def find_archive(directory: Path, stem: str) -> Optional[Path]:
+    paths = get_archive_paths(directory, stem)
+    return max(paths, key=lambda path: path.stat().st_mtime) if paths else None
+
+
+def remove_other_archives(path: Path):
+    stem = get_archive_stem(path.name)
+    if not stem:
+        return
+    for archive_path in get_archive_paths(path.parent, stem):
+        if archive_path != path:
+            archive_path.unlink(missing_ok=True)
+
+
+def detect_codec(path: Path) -> str:
+    with open(path, "rb") as archive:
+        magic = archive.read(len(ZSTD_MAGIC))
+    if magic.startswith(GZIP_MAGIC):
+        return GZIP
+    if magic == ZSTD_MAGIC:
+        return ZSTD
+    return NONE
+
+
+@contextmanager
+def open_archive(path: Path) -> Iterator[TarFile]:
+    if detect_codec(path) != ZSTD:
+        with open_tarfile(path, "r:*") as archive:
+            yield archive
+        return
+    from zstandard import ZstdDecompressor
+
+    with open(path, "rb") as stream:
+        with ZstdDecompressor().stream_reader(stream) as reader:
+            with open_tarfile(fileobj=reader, mode="r|") as archive:
+                yield archive
+
+
+def read_file(file_name: str, tar_file: Path) -> Optional[bytes]:
+    with open_archive(tar_file) as archive:
+        for member in archive:
+            if member.name == file_name:
+                member_file = archive.extractfile(member)
+                return member_file.read() if member_file else None
+    return None
+
+
+def extract_file(file_name: str, tar_file: Path, destination: Path):
+    with open_archive(tar_file) as archive:
+        for member in archive:
+            if member.name == file_name:
+                archive.extract(member, destination)
+                return
+    raise KeyError(f"{file_name} not found in {tar_file}")
+
+
+def extract_archive(stem: str, tar_file: Path, destination: Path) -> Path:
+    with open_archive(tar_file) as archive:
+        for member in archive:
+            if get_archive_stem(member.name) == stem:
+                archive.extract(member, destination)
+                return destination / member.name
+    raise KeyError(f"{stem} archive not found in {tar_file}")
+
+
+def unpack_tar(tar_file: Path, destination: Path):
+    with open_archive(tar_file) as archive:
+        archive.extractall(destination)
@@ -1,9 +1,10 @@
-from dataclasses import dataclass
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
 from os import remove
 from pathlib import Path
 from re import search
-from shutil import make_archive, rmtree, unpack_archive
-from time import sleep
+from threading import Condition, Thread
+from time import monotonic, sleep
 from typing import Optional
 from zipfile import ZipFile
 
@@ -12,18 +13,31 @@ from loguru import logger
 from typer import echo
 
 from penn_canvas.api import Instance, get_canvas
-from penn_canvas.archive.helpers import (
-    TAR_COMPRESSION_TYPE,
-    TAR_EXTENSION,
-    print_unpacked_file,
+from penn_canvas.archive.codec import (
+    find_archive,
+    get_archive_name,
+    get_archive_stem,
+    unpack_tar,
 )
-from penn_canvas.helpers import create_directory, download_file
+from penn_canvas.archive.helpers import print_unpacked_file
+from penn_canvas.archive.sink import ArchiveSink
+from penn_canvas.downloads import download_file
+from penn_canvas.helpers import create_directory, remove_directory
 from penn_canvas.style import color
 
 CONTENT_EXPORT_TYPES = ["common_cartridge", "zip"]
 CONTENT_TAR_STEM = "content"
-CONTENT_TAR_NAME = f"{CONTENT_TAR_STEM}.{TAR_EXTENSION}"
 UNPACK_CONTENT_DIRECTORY = CONTENT_TAR_STEM.title()
+EXPORT_RUNNING_STATES = {"created", "running", "queued"}
+EXPORT_DOWNLOAD_WORKERS = 2
+EXPORT_POLL_DELAY = 2.0
+EXPORT_POLL_MAXIMUM_DELAY = 30.0
+EXPORT_POLL_BACKOFF = 1.5
+EXPORT_TIMEOUT = 900.0
+
+
+class ContentExportError(Exception):
+    pass
 
 
 @dataclass
@@ -53,20 +67,18 @@ def format_export_type(export_type: str) -> str:
     return export_type.replace("_", " ").title()
 
 
-def unzip_content(compress_path: Path):
-    unzip_parent = compress_path.parent
-    with ZipFile(compress_path) as unzipper:
-        unzipper.extractall(unzip_parent)
-    return unzip_parent
-
-
 def is_running(exports: list[Export]) -> bool:
     states = [export.workflow_state for export in exports]
-    running_states = {"created", "running", "queued"}
-    running_progress = (state for state in states if state in running_states)
+    running_progress = (state for state in states if state in EXPORT_RUNNING_STATES)
     return bool(next(running_progress, False))
 
 
+def print_export_states(exports: list[Export]):
+    for export in exports:
+        export_display = color(export.export_type, "cyan")
+        echo(f"\t* {export_display} {export.workflow_state}...")
+
+
 def download_export_files(
     course: Course,
     exports: list[Export],
@@ -78,27 +90,22 @@ def download_export_files(
     for export in exports:
         echo(f") Downloading {export.export_type} export files...")
         url = course.get_content_export(export.export_id).attachment["url"]
-        file_name = f"{export.export_type}_content.zip"
         formatted_export_type = format_export_type(export.export_type)
-        export_path = create_directory(compress_path / formatted_export_type)
-        file_path = export_path / file_name
-        download_file(file_path, url)
-        if file_path.is_file():
-            unzipped_path = unzip_content(file_path)
-            remove(file_path)
-            path_name = str(unzipped_path)
-            make_archive(path_name, TAR_COMPRESSION_TYPE, root_dir=path_name)
-            if unpack:
-                unpack_path = unpack_path / export.export_type.replace("_", " ").title()
-                unzipped_path.replace(unpack_path)
-                if verbose:
-                    print_unpacked_file(unzipped_path)
-            else:
-                try:
-                    rmtree(unzipped_path)
-                except Exception as error:
-                    logger.error(f'Failed to remove {unzipped_path}: "{error}"')
-                    rmtree(unzipped_path, ignore_errors=True)
+        file_path = compress_path / f"{export.export_type}_content.zip"
+        if not download_file(file_path, url):
+            raise ContentExportError(f"Failed to download {export.export_type} export")
+        tar_path = compress_path / get_archive_name(formatted_export_type)
+        with ArchiveSink(tar_path) as sink:
+            sink.add_zip(file_path)
+        if unpack:
+            export_unpack_path = create_directory(
+                unpack_path / formatted_export_type, clear=True
+            )
+            with ZipFile(file_path) as zip_file:
+                zip_file.extractall(export_unpack_path)
+            if verbose:
+                print_unpacked_file(export_unpack_path)
+        remove(file_path)
 
 
 def run_content_exports(
@@ -118,18 +125,28 @@ def run_content_exports(
     attempts = 0
     running = is_running(exports)
     while running and attempts <= 180:
-        for export in exports:
-            export_display = color(export.export_type, "cyan")
-            echo(f"\t* {export_display} {export.workflow_state}...")
+        print_export_states(exports)
         sleep(5)
         for export in exports:
             export.update_workflow_state()
         running = is_running(exports)
         attempts += 1
+    download_completed_exports(
+        course, exports, compress_path, unpack_path, unpack, verbose
+    )
+
+
+def download_completed_exports(
+    course: Course,
+    exports: list[Export],
+    compress_path: Path,
+    unpack_path: Path,
+    unpack: bool,
+    verbose: bool,
+):
     failed_exports = [
         export for export in exports if export.workflow_state != "completed"
     ]
-    exports = [export for export in exports if export.workflow_state == "completed"]
     if failed_exports:
         for export in failed_exports:
             message = color(
@@ -137,13 +154,176 @@ def run_content_exports(
             )
             logger.error(message)
             echo(message)
+        export_types = ", ".join(export.export_type for export in failed_exports)
+        raise ContentExportError(f"Content exports did not complete: {export_types}")
     download_export_files(course, exports, compress_path, unpack_path, unpack, verbose)
 
 
+@dataclass
+class CourseExports:
+    course: Course
+    content_path: Path
+    unpack_path: Path
+    unpack: bool
+    exports: list[Export]
+    future: Future = field(default_factory=Future)
+    started_at: float = field(default_factory=monotonic)
+    next_poll: float = 0.0
+    delay: float = EXPORT_POLL_DELAY
+
+
+class ContentExportPipeline:
+    def __init__(
+        self,
+        instance: Instance = Instance.PRODUCTION,
+        verbose=False,
+        download_workers=EXPORT_DOWNLOAD_WORKERS,
+        delay=EXPORT_POLL_DELAY,
+        maximum_delay=EXPORT_POLL_MAXIMUM_DELAY,
+        backoff=EXPORT_POLL_BACKOFF,
+        timeout=EXPORT_TIMEOUT,
+    ):
+        self.instance = instance
+        self.verbose = verbose
+        self.delay = delay
+        self.maximum_delay = maximum_delay
+        self.backoff = backoff
+        self.timeout = timeout
+        self.submitted: dict[int, Future] = dict()
+        self.running: dict[int, CourseExports] = dict()
+        self.stopped = False
+        self.condition = Condition()
+        self.downloader = ThreadPoolExecutor(max_workers=download_workers)
+        self.poller = Thread(target=self.poll, daemon=True)
+        self.poller.start()
+
+    def __enter__(self) -> "ContentExportPipeline":
+        return self
+
+    def __exit__(self, *exception):
+        self.shutdown()
+
+    def submit(
+        self, course: Course, content_path: Path, unpack_path: Path, unpack: bool
+    ) -> Future:
+        with self.condition:
+            if course.id in self.submitted:
+                return self.submitted[course.id]
+            future: Future = Future()
+            self.submitted[course.id] = future
+        try:
+            exports = [
+                Export(course, export_type, self.instance)
+                for export_type in CONTENT_EXPORT_TYPES
+            ]
+            for export in exports:
+                export.create_content_export()
+        except Exception as error:
+            logger.error(f"Failed to start content exports for {course}: {error}")
+            self.fail(course.id, future, error)
+            return future
+        course_exports = CourseExports(
+            course, content_path, unpack_path, unpack, exports, future
+        )
+        course_exports.next_poll = monotonic() + self.delay
+        with self.condition:
+            self.running[course.id] = course_exports
+            self.condition.notify()
+        return future
+
+    def get_due_course_exports(self) -> Optional[list[CourseExports]]:
+        with self.condition:
+            while not self.stopped:
+                if not self.running:
+                    self.condition.wait()
+                    continue
+                now = monotonic()
+                due = [
+                    course_exports
+                    for course_exports in self.running.values()
+                    if course_exports.next_poll <= now
+                ]
+                if due:
+                    return due
+                next_poll = min(
+                    course_exports.next_poll for course_exports in self.running.values()
+                )
+                self.condition.wait(next_poll - now)
+            return None
+
+    def poll(self):
+        while True:
+            due = self.get_due_course_exports()
+            if due is None:
+                return
+            for course_exports in due:
+                self.poll_course_exports(course_exports)
+
+    def poll_course_exports(self, course_exports: CourseExports):
+        try:
+            for export in course_exports.exports:
+                if export.workflow_state in EXPORT_RUNNING_STATES:
+                    export.update_workflow_state()
+        except Exception as error:
+            logger.warning(
+                f"Failed to poll exports for {course_exports.course}: {error}"
+            )
+        running = is_running(course_exports.exports)
+        timed_out = monotonic() - course_exports.started_at > self.timeout
+        if running and not timed_out:
+            if self.verbose:
+                print_export_states(course_exports.exports)
+            course_exports.delay = min(
+                course_exports.delay * self.backoff, self.maximum_delay
+            )
+            course_exports.next_poll = monotonic() + course_exports.delay
+            return
+        with self.condition:
+            self.running.pop(course_exports.course.id, None)
+        if running:
+            error = ContentExportError(
+                f"Content exports for {course_exports.course} timed out"
+            )
+            logger.error(error)
+            self.fail(course_exports.course.id, course_exports.future, error)
+            return
+        self.downloader.submit(self.download, course_exports)
+
+    def download(self, course_exports: CourseExports):
+        try:
+            download_completed_exports(
+                course_exports.course,
+                course_exports.exports,
+                course_exports.content_path,
+                course_exports.unpack_path,
+                course_exports.unpack,
+                self.verbose,
+            )
+            course_exports.future.set_result(course_exports.content_path)
+        except Exception as error:
+            self.fail(course_exports.course.id, course_exports.future, error)
+
+    def fail(self, course_id: int, future: Future, error: Exception):
+        with self.condition:
+            if self.submitted.get(course_id) is future:
+                del self.submitted[course_id]
+        future.set_exception(error)
+
+    def shutdown(self):
+        with self.condition:
+            self.stopped = True
+            for course_exports in self.running.values():
+                course_exports.future.cancel()
+            self.running.clear()
+            self.condition.notify_all()
+        self.poller.join()
+        self.downloader.shutdown(wait=True)
+
+
 def unpack_content(compress_path: Path, unpack_path: Path, force: bool, verbose: bool):
     echo(") Unpacking content...")
-    archive_file = compress_path / CONTENT_TAR_NAME
-    if not archive_file.is_file():
+    archive_file = find_archive(compress_path, CONTENT_TAR_STEM)
+    if not archive_file:
         return None
     content_path = unpack_path / UNPACK_CONTENT_DIRECTORY
     already_complete = not force and content_path.exists()
@@ -151,14 +331,35 @@ def unpack_content(compress_path: Path, unpack_path: Path, force: bool, verbose:
         echo("Content already unpacked.")
         return
     content_path = create_directory(unpack_path / UNPACK_CONTENT_DIRECTORY, clear=True)
-    unpack_archive(archive_file, content_path)
-    for tar_file in content_path.glob(f"*.{TAR_EXTENSION}"):
-        unpack_archive(tar_file, content_path / tar_file.stem.replace(".tar", ""))
-        remove(tar_file)
+    unpack_tar(archive_file, content_path)
+    for tar_file in list(content_path.iterdir()):
+        tar_stem = get_archive_stem(tar_file.name)
+        if tar_file.is_file() and tar_stem:
+            unpack_tar(tar_file, content_path / tar_stem)
+            remove(tar_file)
     if verbose:
         print_unpacked_file(content_path)
 
 
+def get_unpack_content_path(unpack_path: Path, unpack: bool) -> Path:
+    return unpack_path / UNPACK_CONTENT_DIRECTORY if unpack else unpack_path
+
+
+def prefetch_content(
+    course: Course,
+    compress_path: Path,
+    unpack_path: Path,
+    unpack: bool,
+    force: bool,
+    pipeline: ContentExportPipeline,
+) -> Optional[Future]:
+    if not force and find_archive(compress_path, CONTENT_TAR_STEM):
+        return None
+    content_path = create_directory(compress_path / CONTENT_TAR_STEM)
+    unpack_content_path = get_unpack_content_path(unpack_path, unpack)
+    return pipeline.submit(course, content_path, unpack_content_path, unpack)
+
+
 def fetch_content(
     course: Course,
     compress_path: Path,
@@ -167,23 +368,29 @@ def fetch_content(
     force: bool,
     instance: Instance,
     verbose: bool,
+    pipeline: Optional[ContentExportPipeline] = None,
 ):
     echo(") Fetching content...")
-    if unpack:
-        unpack_content_path = unpack_path / UNPACK_CONTENT_DIRECTORY
-    else:
-        unpack_content_path = unpack_path
-    archive_file = compress_path / CONTENT_TAR_NAME
-    already_complete = not force and archive_file.is_file()
+    unpack_content_path = get_unpack_content_path(unpack_path, unpack)
+    archive_file = compress_path / get_archive_name(CONTENT_TAR_STEM)
+    already_complete = not force and bool(find_archive(compress_path, CONTENT_TAR_STEM))
     if already_complete:
         echo("Content already fetched.")
         if unpack:
             unpack_content(compress_path, unpack_content_path, force, verbose)
         return
     content_path = create_directory(compress_path / CONTENT_TAR_STEM)
-    run_content_exports(
-        course, content_path, unpack_content_path, unpack, instance, verbose
-    )
-    content_directory = str(content_path)
-    make_archive(content_directory, TAR_COMPRESSION_TYPE, root_dir=content_directory)
-    rmtree(content_path)
+    try:
+        if pipeline:
+            pipeline.submit(course, content_path, unpack_content_path, unpack).result()
+        else:
+            run_content_exports(
+                course, content_path, unpack_content_path, unpack, instance, verbose
+            )
+    except Exception:
+        remove_directory(content_path, ignore_errors=True)
+        raise
+    with ArchiveSink(archive_file) as sink:
+        for export_file in sorted(content_path.iterdir()):
+            sink.add_file(export_file.name, export_file, remove=True)
+    remove_directory(content_path)
@@ -1,6 +1,5 @@
 from os import remove
 from pathlib import Path
-from shutil import make_archive, rmtree, unpack_archive
 from typing import Optional
 
 from canvasapi.course import Course
@@ -9,28 +8,29 @@ from pandas import DataFrame, read_csv
 from pandas.core.reshape.concat import concat
 from typer import echo, progressbar
 
-from penn_canvas.api import Instance, get_user
+from penn_canvas.api import Instance
 from penn_canvas.helpers import (
     create_directory,
     format_timestamp,
     print_task_complete_message,
+    remove_directory,
     write_file,
 )
 from penn_canvas.style import color, print_item
+from penn_canvas.users import get_user_resolver
 
+from .codec import find_archive, get_archive_name, unpack_tar
 from .helpers import (
     CSV_COMPRESSION_TYPE,
-    TAR_COMPRESSION_TYPE,
-    TAR_EXTENSION,
     format_display_text,
     format_name,
     format_text,
     print_description,
     print_unpacked_file,
 )
+from .sink import ArchiveSink
 
 DISCUSSIONS_TAR_STEM = "discussions"
-DISCUSSIONS_TAR_NAME = f"{DISCUSSIONS_TAR_STEM}.{TAR_EXTENSION}"
 UNPACK_DISCUSSIONS_DIRECTORY = DISCUSSIONS_TAR_STEM.title()
 UNPACK_DESCRIPTIONS_DIRECTORY = "Descriptions"
 UNPACK_ENTRIES_DIRECTORY = "Entries"
@@ -52,7 +52,7 @@ def get_entry(
 ) -> list[str]:
     user_id = entry.user["id"]
     user = entry.user["display_name"]
-    email = get_user(user_id, instance=instance).email
+    email = get_user_resolver(instance).get(user_id).email
     timestamp = format_timestamp(entry.created_at)
     message = format_text(entry.message)
     if verbose:
@@ -197,21 +197,21 @@ def unpack_discussions(
 ) -> Optional[Path]:
     echo(") Unpacking discussions...")
     unpack_discussions_path = unpack_path / UNPACK_DISCUSSIONS_DIRECTORY
-    archive_file = compress_path / DISCUSSIONS_TAR_NAME
-    already_complete = not force and archive_file.exists()
+    archive_file = find_archive(compress_path, DISCUSSIONS_TAR_STEM)
+    already_complete = not force and bool(archive_file)
     if already_complete:
         echo("Discussions already unpacked.")
         return None
-    if not archive_file.is_file():
+    if not archive_file:
         return None
     discussions_path = compress_path / DISCUSSIONS_TAR_STEM
-    unpack_archive(archive_file, discussions_path)
+    unpack_tar(archive_file, discussions_path)
     unpack_discussions_path = create_directory(unpack_discussions_path, clear=True)
     unpack_descriptions_path = unpack_discussions_path / UNPACK_DESCRIPTIONS_DIRECTORY
     unpack_entries_path = unpack_discussions_path / UNPACK_ENTRIES_DIRECTORY
     unpack_descriptions(discussions_path, unpack_descriptions_path, verbose)
     unpack_entries(discussions_path, unpack_entries_path, verbose)
-    rmtree(discussions_path)
+    remove_directory(discussions_path)
     if verbose:
         print_unpacked_file(unpack_discussions_path)
     return unpack_discussions_path
@@ -227,13 +227,16 @@ def fetch_discussions(
     verbose: bool,
 ):
     echo(") Fetching discussions...")
-    archive_file = compress_path / DISCUSSIONS_TAR_NAME
-    already_complete = not force and archive_file.is_file()
+    archive_file = compress_path / get_archive_name(DISCUSSIONS_TAR_STEM)
+    already_complete = not force and bool(
+        find_archive(compress_path, DISCUSSIONS_TAR_STEM)
+    )
     if already_complete:
         echo("Discussions already fetched.")
     else:
         discussion_topics = list(course.get_discussion_topics())
         total = len(discussion_topics)
+        get_user_resolver(instance).load_course(course)
         if verbose:
             descriptions = get_discussion_descriptions(discussion_topics, verbose)
             echo(") Fetching discussion entries...")
@@ -248,17 +251,9 @@ def fetch_discussions(
                     get_discussion_entries(discussion, instance, verbose)
                     for discussion in progress
                 ]
-        discussions_path = create_directory(compress_path / DISCUSSIONS_TAR_STEM)
-        descriptions_path = discussions_path / DESCRIPTIONS_COMPRESSED_FILE
-        descriptions.to_csv(descriptions_path, index=False)
-        discussion_entries_data = concat(discussion_entries)
-        discussion_entries_path = discussions_path / ENTRIES_COMPRESSED_FILE
-        discussion_entries_data.to_csv(discussion_entries_path, index=False)
-        discussions_directory = str(discussions_path)
-        make_archive(
-            discussions_directory, TAR_COMPRESSION_TYPE, root_dir=discussions_directory
-        )
-        rmtree(discussions_path)
+        with ArchiveSink(archive_file) as sink:
+            sink.add_csv(DESCRIPTIONS_COMPRESSED_FILE, descriptions)
+            sink.add_csv(ENTRIES_COMPRESSED_FILE, concat(discussion_entries))
     if unpack:
         unpacked_path = unpack_discussions(
             compress_path, unpack_path, force, verbose=False
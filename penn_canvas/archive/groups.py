@@ -1,6 +1,5 @@
 from os import remove
 from pathlib import Path
-from shutil import make_archive, rmtree, unpack_archive
 from typing import Optional
 
 from canvasapi.course import Course
@@ -9,22 +8,23 @@ from canvasapi.user import User
 from pandas import DataFrame, Series, concat, read_csv
 from typer import echo, progressbar
 
-from penn_canvas.helpers import (
-    create_directory,
-    download_file,
-    print_task_complete_message,
-)
+from penn_canvas.helpers import create_directory, print_task_complete_message
 from penn_canvas.style import color, print_item
 
+from .codec import (
+    extract_archive,
+    extract_file,
+    find_archive,
+    get_archive_name,
+    unpack_tar,
+)
 from .helpers import (
     CSV_COMPRESSION_TYPE,
-    TAR_COMPRESSION_TYPE,
-    TAR_EXTENSION,
-    extract_file,
     format_display_text,
     format_name,
     print_unpacked_file,
 )
+from .sink import ArchiveSink
 
 GROUPS = "groups"
 GROUPS_COMPRESSED_FILE = f"groups.{CSV_COMPRESSION_TYPE}"
@@ -33,8 +33,7 @@ CATEGORY_NAME = "Category Name"
 GROUP_ID = "Group ID"
 GROUP_NAME = "Group Name"
 UNPACK_GROUP_DIRECTORY = GROUPS.title()
-GROUPS_TAR_NAME = f"group_files.{TAR_EXTENSION}"
-ALL_GROUPS_TAR_NAME = f"{GROUPS}.{TAR_EXTENSION}"
+GROUP_FILES_TAR_STEM = "group_files"
 COLUMNS = [
     CATEGORY_ID,
     CATEGORY_NAME,
@@ -74,18 +73,17 @@ def get_group_users(
     return DataFrame(rows, columns=COLUMNS)
 
 
-def download_files(
-    group: Group, group_files_path: Path, verbose: bool, index: int, total: int
-):
+def get_group_files(
+    group: Group, category_name: str, verbose: bool, index: int, total: int
+) -> list[tuple[str, str]]:
     if verbose:
         print_item(
             index, total, color(format_display_text(group.name), "yellow"), prefix="\t-"
         )
     files = list(group.get_files())
     file_total = len(files)
-    if not file_total:
-        rmtree(group_files_path)
-        return
+    group_name = format_name(group.name)
+    group_files = list()
     for file_index, group_file in enumerate(files):
         display_name = group_file.display_name
         try:
@@ -93,15 +91,18 @@ def download_files(
         except Exception:
             name = group_file.filename
             extension = "txt"
-        download_file(group_files_path / f"{name}.{extension}", group_file.url)
+        group_files.append(
+            (f"{category_name}/{group_name}/{name}.{extension}", group_file.url)
+        )
         if verbose:
             print_item(
                 file_index, file_total, color(display_name, "blue"), prefix="\t\t*"
             )
+    return group_files
 
 
 def get_category(
-    category: GroupCategory, category_files_path: Path, verbose: bool, index=0, total=0
+    category: GroupCategory, files_sink: ArchiveSink, verbose: bool, index=0, total=0
 ) -> DataFrame:
     if verbose:
         print_item(index, total, color(category))
@@ -113,12 +114,16 @@ def get_category(
         for group_index, group in enumerate(groups)
     ]
     echo(") Fetching group files...")
-    group_files_path = create_directory(
-        category_files_path / format_name(category.name)
-    )
-    for group_index, group in enumerate(groups):
-        files_path = create_directory(group_files_path / format_name(group.name))
-        download_files(group, files_path, verbose, group_index, group_total)
+    category_name = format_name(category.name)
+    files_sink.add_directory(category_name)
+    group_files = [
+        group_file
+        for group_index, group in enumerate(groups)
+        for group_file in get_group_files(
+            group, category_name, verbose, group_index, group_total
+        )
+    ]
+    files_sink.add_downloads(group_files)
     return concat(group_data) if group_data else DataFrame(columns=COLUMNS)
 
 
@@ -136,14 +141,15 @@ def unpack_groups(
     if already_complete:
         echo("Groups already unpacked.")
         return None
-    archive_tar_path = compress_path / ALL_GROUPS_TAR_NAME
-    if not archive_tar_path.is_file():
+    archive_tar_path = find_archive(compress_path, GROUPS)
+    if not archive_tar_path:
         return None
     extract_file(f"./{GROUPS_COMPRESSED_FILE}", archive_tar_path, compress_path)
-    extract_file(f"./{GROUPS_TAR_NAME}", archive_tar_path, compress_path)
     extracted_csv = compress_path / GROUPS_COMPRESSED_FILE
-    extracted_tar = compress_path / GROUPS_TAR_NAME
-    unpack_archive(extracted_tar, create_directory(unpack_path / "Groups"))
+    extracted_tar = extract_archive(
+        f"./{GROUP_FILES_TAR_STEM}", archive_tar_path, compress_path
+    )
+    unpack_tar(extracted_tar, create_directory(unpack_path / "Groups"))
     categories_data = read_csv(extracted_csv)
     category_ids = categories_data[CATEGORY_ID].unique()
     category_series = [
@@ -184,8 +190,8 @@ def fetch_groups(
     verbose: bool,
 ):
     echo(") Fetching groups...")
-    archive_tar_path = compress_path / ALL_GROUPS_TAR_NAME
-    already_complete = not force and archive_tar_path.is_file()
+    archive_tar_path = compress_path / get_archive_name(GROUPS)
+    already_complete = not force and bool(find_archive(compress_path, GROUPS))
     if already_complete:
         echo("Groups already fetched.")
         if unpack:
@@ -193,38 +199,23 @@ def fetch_groups(
         return
     category_objects = list(course.get_group_categories())
     total = len(category_objects)
-    all_groups_path = create_directory(compress_path / "groups")
-    category_files_path = create_directory(all_groups_path / "group_files")
-    if verbose:
-        categories = [
-            get_category(category, category_files_path, verbose, index, total)
-            for index, category in enumerate(category_objects)
-        ]
-    else:
-        with progressbar(category_objects, length=total) as progress:
-            categories = [
-                get_category(category, category_files_path, verbose)
-                for category in progress
-            ]
-    groups_path = all_groups_path / GROUPS_COMPRESSED_FILE
-    groups_data = concat(categories) if categories else DataFrame(columns=COLUMNS)
-    groups_data.to_csv(groups_path, index=False)
-    group_files_archive_path = str(category_files_path)
-    make_archive(
-        group_files_archive_path,
-        TAR_COMPRESSION_TYPE,
-        root_dir=group_files_archive_path,
-    )
+    with ArchiveSink(archive_tar_path) as sink:
+        files_tar_name = sink.codec.get_archive_name(GROUP_FILES_TAR_STEM)
+        with sink.open_archive(files_tar_name) as files_sink:
+            if verbose:
+                categories = [
+                    get_category(category, files_sink, verbose, index, total)
+                    for index, category in enumerate(category_objects)
+                ]
+            else:
+                with progressbar(category_objects, length=total) as progress:
+                    categories = [
+                        get_category(category, files_sink, verbose)
+                        for category in progress
+                    ]
+        groups_data = concat(categories) if categories else DataFrame(columns=COLUMNS)
+        sink.add_csv(GROUPS_COMPRESSED_FILE, groups_data)
     if unpack:
-        unpack_groups_path = create_directory(
-            unpack_path / UNPACK_GROUP_DIRECTORY, clear=True
-        )
-        category_files_path.replace(unpack_groups_path)
-        unpacked_path = unpack_groups(compress_path, unpack_path, force, verbose=False)
+        unpacked_path = unpack_groups(compress_path, unpack_path, True, verbose=False)
         if verbose:
             print_unpacked_file(unpacked_path)
-    else:
-        rmtree(category_files_path)
-    make_archive_path = str(all_groups_path)
-    make_archive(make_archive_path, TAR_COMPRESSION_TYPE, root_dir=make_archive_path)
-    rmtree(all_groups_path)
@@ -2,21 +2,20 @@ from functools import lru_cache
 from html.parser import HTMLParser
 from io import StringIO
 from pathlib import Path
-from tarfile import open as open_tarfile
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
-from canvasapi.assignment import Assignment
-from canvasapi.quiz import QuizQuestion
-from canvasapi.submission import Submission
 from loguru import logger
 from typer import echo
 
 from penn_canvas.style import color, print_item
 
+if TYPE_CHECKING:
+    from canvasapi.assignment import Assignment
+    from canvasapi.quiz import QuizQuestion
+    from canvasapi.submission import Submission
+
 COMPRESSION_TYPE = "gz"
 CSV_COMPRESSION_TYPE = f"csv.{COMPRESSION_TYPE}"
-TAR_COMPRESSION_TYPE = f"{COMPRESSION_TYPE}tar"
-TAR_EXTENSION = f"tar.{COMPRESSION_TYPE}"
 
 
 class HTMLStripper(HTMLParser):
@@ -41,7 +40,7 @@ def strip_tags(html: str) -> str:
 
 
 @lru_cache
-def get_assignment_submissions(assignment: Assignment) -> list[Submission]:
+def get_assignment_submissions(assignment: "Assignment") -> list["Submission"]:
     return list(assignment.get_submissions(include=["submission_comments", "user"]))
 
 
@@ -79,7 +78,7 @@ def format_display_text(text: str, limit=50) -> str:
 
 
 @lru_cache
-def format_question_text(question: QuizQuestion) -> str:
+def format_question_text(question: "QuizQuestion") -> str:
     return strip_tags(question.question_text)
 
 
@@ -97,8 +96,3 @@ def print_unpacked_file(unpacked_path: Optional[Path]):
         message = "ERROR: failed to unpack."
         logger.error(message)
         echo(message)
-
-
-def extract_file(file_name: str, tar_file: Path, destination: Path):
-    with open_tarfile(tar_file) as archive:
-        archive.extract(file_name, destination)
@@ -1,6 +1,5 @@
 from json import loads
 from pathlib import Path
-from shutil import make_archive, rmtree, unpack_archive
 from typing import Optional
 
 from canvasapi.course import Course
@@ -10,20 +9,14 @@ from requests import get
 from typer import echo, progressbar
 
 from penn_canvas.api import Instance, get_canvas_key
-from penn_canvas.helpers import create_directory, write_file
+from penn_canvas.helpers import create_directory
 from penn_canvas.style import color, print_item
 
-from .helpers import (
-    TAR_COMPRESSION_TYPE,
-    TAR_EXTENSION,
-    format_display_text,
-    format_name,
-    print_unpacked_file,
-    strip_tags,
-)
+from .codec import find_archive, get_archive_name, unpack_tar
+from .helpers import format_display_text, format_name, print_unpacked_file, strip_tags
+from .sink import ArchiveSink
 
 MODULES_TAR_STEM = "modules"
-MODULES_TAR_NAME = f"{MODULES_TAR_STEM}.{TAR_EXTENSION}"
 UNPACK_MODULES_DIRECTORY = MODULES_TAR_STEM.title()
 
 
@@ -71,7 +64,8 @@ def get_item_body(url: str, item_type: str, instance: Instance) -> str:
 
 def get_module_item(
     item: ModuleItem,
-    module_path: Path,
+    sink: ArchiveSink,
+    module_name: str,
     instance: Instance,
     verbose: bool,
     index: int,
@@ -81,7 +75,7 @@ def get_module_item(
     body = get_item_body(url, item.type, instance)
     content = strip_tags(body) if body else "[missing url]"
     item_title = format_name(item.title)
-    write_file(module_path / f"{item_title}.txt", content)
+    sink.add_text(f"{module_name}/{item_title}.txt", content)
     if verbose:
         title_display = color(format_display_text(item_title), "yellow")
         content_display = color(format_display_text(content), "cyan")
@@ -91,7 +85,7 @@ def get_module_item(
 
 def get_module(
     module: Module,
-    modules_path: Path,
+    sink: ArchiveSink,
     instance: Instance,
     verbose: bool,
     index=0,
@@ -100,11 +94,13 @@ def get_module(
     module_name = format_name(module.name)
     if verbose:
         print_item(index, total, color(module_name))
-    module_path = create_directory(modules_path / module_name)
+    sink.add_directory(module_name)
     items = list(module.get_module_items())
     item_total = len(items)
     for item_index, item in enumerate(items):
-        get_module_item(item, module_path, instance, verbose, item_index, item_total)
+        get_module_item(
+            item, sink, module_name, instance, verbose, item_index, item_total
+        )
 
 
 def unpack_modules(
@@ -116,11 +112,11 @@ def unpack_modules(
     if already_complete:
         echo("Modules already unpacked.")
         return None
-    archive_file = compress_path / MODULES_TAR_NAME
-    if not archive_file.is_file():
+    archive_file = find_archive(compress_path, MODULES_TAR_STEM)
+    if not archive_file:
         return None
     unpack_modules_path = create_directory(unpack_modules_path, clear=True)
-    unpack_archive(archive_file, unpack_modules_path)
+    unpack_tar(archive_file, unpack_modules_path)
     if verbose:
         print_unpacked_file(unpack_modules_path)
     return unpack_modules_path
@@ -136,32 +132,24 @@ def fetch_modules(
     verbose: bool,
 ):
     echo(") Fetching modules...")
-    archive_file = compress_path / MODULES_TAR_NAME
-    already_complete = not force and archive_file.is_file()
+    archive_file = compress_path / get_archive_name(MODULES_TAR_STEM)
+    already_complete = not force and bool(find_archive(compress_path, MODULES_TAR_STEM))
     if already_complete:
         echo("Modules already fetched.")
         if unpack:
             unpack_modules(compress_path, unpack_path, force, verbose=False)
         return
-    modules_path = create_directory(compress_path / "modules")
     modules = list(course.get_modules())
     total = len(modules)
-    if verbose:
-        for index, module in enumerate(modules):
-            get_module(module, modules_path, instance, verbose, index, total)
-    else:
-        with progressbar(modules, length=total) as progress:
-            for module in progress:
-                get_module(module, modules_path, instance, verbose)
-    modules_directory = str(modules_path)
-    make_archive(modules_directory, TAR_COMPRESSION_TYPE, root_dir=modules_directory)
+    with ArchiveSink(archive_file) as sink:
+        if verbose:
+            for index, module in enumerate(modules):
+                get_module(module, sink, instance, verbose, index, total)
+        else:
+            with progressbar(modules, length=total) as progress:
+                for module in progress:
+                    get_module(module, sink, instance, verbose)
     if unpack:
-        unpack_groups_path = create_directory(
-            unpack_path / UNPACK_MODULES_DIRECTORY, clear=True
-        )
-        modules_path.replace(unpack_groups_path)
-        unpacked_path = unpack_modules(compress_path, unpack_path, force, verbose=False)
+        unpacked_path = unpack_modules(compress_path, unpack_path, True, verbose=False)
         if verbose:
             print_unpacked_file(unpacked_path)
-    else:
-        rmtree(modules_path)
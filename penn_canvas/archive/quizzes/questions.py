@@ -1,6 +1,5 @@
 from os import remove
 from pathlib import Path
-from tarfile import open as open_tarfile
 from typing import Optional
 
 from canvasapi.quiz import Quiz, QuizQuestion
@@ -9,11 +8,13 @@ from pandas.core.reshape.concat import concat
 from typer import echo
 
 from penn_canvas.archive.assignments.assignment_descriptions import QUIZ_ID
+from penn_canvas.archive.codec import extract_file
 from penn_canvas.archive.helpers import (
     COMPRESSION_TYPE,
     format_name,
     format_question_text,
 )
+from penn_canvas.archive.sink import ArchiveSink
 from penn_canvas.helpers import create_directory
 from penn_canvas.style import color, print_item
 
@@ -43,8 +44,7 @@ def unpack_quiz_questions(
 ) -> Optional[Path]:
     if verbose:
         echo("Unpacking quiz questions...")
-    quizzes_tar_file = open_tarfile(archive_tar_path)
-    quizzes_tar_file.extract(f"./questions.csv.{COMPRESSION_TYPE}", compress_path)
+    extract_file(f"./questions.csv.{COMPRESSION_TYPE}", archive_tar_path, compress_path)
     unpacked_questions_path = compress_path / f"questions.csv.{COMPRESSION_TYPE}"
     questions_data = read_csv(unpacked_questions_path)
     questions_data.fillna("", inplace=True)
@@ -65,7 +65,7 @@ def unpack_quiz_questions(
     return unpack_path
 
 
-def fetch_quiz_questions(quizzes: list[Quiz], quiz_path: Path):
+def fetch_quiz_questions(quizzes: list[Quiz], sink: ArchiveSink):
     questions = [get_questions_and_answers(quiz) for quiz in quizzes]
     questions_data = concat(questions)
-    questions_data.to_csv(quiz_path / f"questions.csv.{COMPRESSION_TYPE}", index=False)
+    sink.add_csv(f"questions.csv.{COMPRESSION_TYPE}", questions_data)
@@ -1,6 +1,6 @@
+from io import BytesIO
 from os import remove
 from pathlib import Path
-from tarfile import open as open_tarfile
 
 from canvasapi.quiz import Quiz
 from pandas import DataFrame, read_csv
@@ -14,13 +14,15 @@ from penn_canvas.archive.assignments.assignment_descriptions import (
     DESCRIPTIONS_COMPRESSED_FILE,
     QUIZ_ASSIGNMENT,
 )
-from penn_canvas.archive.assignments.assignments import ASSIGNMENTS_TAR_NAME
+from penn_canvas.archive.assignments.assignments import ASSIGNMENTS
+from penn_canvas.archive.codec import extract_file, find_archive, read_file
 from penn_canvas.archive.helpers import (
     COMPRESSION_TYPE,
     format_name,
     format_text,
     print_description,
 )
+from penn_canvas.archive.sink import ArchiveSink
 from penn_canvas.helpers import create_directory, write_file
 from penn_canvas.style import color, print_item
 
@@ -28,12 +30,15 @@ QUIZ_ID = "Quiz ID"
 QUIZ_TITLE = "Quiz Title"
 
 
-def get_assignment_descriptions(
-    assignments_tar_path: Path, compress_path: Path, descriptions_path: Path
-) -> DataFrame:
-    assignments_tar_file = open_tarfile(assignments_tar_path)
-    assignments_tar_file.extract(f"./{DESCRIPTIONS_COMPRESSED_FILE}", compress_path)
-    descriptions = read_csv(descriptions_path, dtype={QUIZ_ID: str})
+def get_assignment_descriptions(assignments_tar_path: Path) -> DataFrame:
+    descriptions_file = read_file(
+        f"./{DESCRIPTIONS_COMPRESSED_FILE}", assignments_tar_path
+    )
+    if not descriptions_file:
+        return DataFrame(columns=[QUIZ_ID, QUIZ_TITLE, DESCRIPTION])
+    descriptions = read_csv(
+        BytesIO(descriptions_file), dtype={QUIZ_ID: str}, compression="gzip"
+    )
     descriptions = descriptions[descriptions[QUIZ_ASSIGNMENT] == True]  # noqa
     descriptions = descriptions.reset_index(drop=True)
     descriptions = descriptions.drop([ASSIGNMENT_ID, QUIZ_ASSIGNMENT], axis="columns")
@@ -56,8 +61,9 @@ def unpack_descriptions(
     archive_tar_path = compress_path / quizzes_tar_name
     if not archive_tar_path.is_file():
         return None
-    quizzes_tar_file = open_tarfile(archive_tar_path)
-    quizzes_tar_file.extract(f"./descriptions.csv.{COMPRESSION_TYPE}", compress_path)
+    extract_file(
+        f"./descriptions.csv.{COMPRESSION_TYPE}", archive_tar_path, compress_path
+    )
     descriptions = read_csv(compress_path / f"descriptions.csv.{COMPRESSION_TYPE}")
     descriptions = descriptions.drop(QUIZ_ID, axis="columns")
     descriptions = descriptions.fillna("")
@@ -73,18 +79,16 @@ def unpack_descriptions(
 
 
 def fetch_descriptions(
-    quiz_path: Path,
+    compress_path: Path,
+    sink: ArchiveSink,
     quizzes: list[Quiz],
     verbose: bool,
 ):
-    assignments_tar_path = quiz_path / ASSIGNMENTS_TAR_NAME
-    descriptions_path = quiz_path / DESCRIPTIONS_COMPRESSED_FILE
+    assignments_tar_path = find_archive(compress_path, ASSIGNMENTS)
     fetched_descriptions = list()
     descriptions = DataFrame()
-    if assignments_tar_path.exists():
-        descriptions = get_assignment_descriptions(
-            assignments_tar_path, quiz_path, descriptions_path
-        )
+    if assignments_tar_path:
+        descriptions = get_assignment_descriptions(assignments_tar_path)
         fetched_descriptions = descriptions[QUIZ_ID].tolist()
     fetched_descriptions_count = len(fetched_descriptions)
     if verbose and fetched_descriptions_count:
@@ -99,4 +103,4 @@ def fetch_descriptions(
     columns = [QUIZ_ID, QUIZ_TITLE, DESCRIPTION]
     quiz_descriptions_data_frame = DataFrame(quiz_descriptions, columns=columns)
     descriptions = concat([descriptions, quiz_descriptions_data_frame])
-    descriptions.to_csv(descriptions_path, index=False)
+    sink.add_csv(DESCRIPTIONS_COMPRESSED_FILE, descriptions)
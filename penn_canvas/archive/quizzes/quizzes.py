@@ -1,16 +1,13 @@
 from pathlib import Path
-from shutil import make_archive, rmtree
 from typing import Optional
 
 from canvasapi.course import Course
 from typer import echo
 
 from penn_canvas.api import Instance
-from penn_canvas.archive.helpers import (
-    TAR_COMPRESSION_TYPE,
-    TAR_EXTENSION,
-    print_unpacked_file,
-)
+from penn_canvas.archive.codec import find_archive, get_archive_name
+from penn_canvas.archive.helpers import print_unpacked_file
+from penn_canvas.archive.sink import ArchiveSink
 from penn_canvas.helpers import create_directory
 
 from .questions import fetch_quiz_questions, unpack_quiz_questions
@@ -20,7 +17,6 @@ from .scores import fetch_submission_scores, unpack_quiz_scores
 
 QUIZZES_TAR_STEM = "quizzes"
 UNPACK_QUIZZES_DIRECTORY = QUIZZES_TAR_STEM.title()
-QUIZZES_TAR_NAME = f"{QUIZZES_TAR_STEM}.{TAR_EXTENSION}"
 
 
 def unpack_quizzes(
@@ -32,11 +28,11 @@ def unpack_quizzes(
     if already_comlete:
         echo("Quizzes already unpacked.")
         return None
-    archive_tar_path = compress_path / QUIZZES_TAR_NAME
-    if not archive_tar_path.is_file():
+    archive_tar_path = find_archive(compress_path, QUIZZES_TAR_STEM)
+    if not archive_tar_path:
         return None
     unpack_path = create_directory(unpack_path)
-    unpack_descriptions(compress_path, QUIZZES_TAR_NAME, unpack_path, verbose)
+    unpack_descriptions(compress_path, archive_tar_path.name, unpack_path, verbose)
     unpack_quiz_questions(compress_path, archive_tar_path, unpack_path, verbose)
     unpack_quiz_scores(compress_path, archive_tar_path, unpack_path, verbose)
     unpack_quiz_responses(compress_path, archive_tar_path, unpack_path, verbose)
@@ -53,24 +49,18 @@ def fetch_quizzes(
     verbose: bool,
 ):
     echo(") Fetching quizzes...")
-    quizzes_path = create_directory(compress_path / QUIZZES_TAR_STEM)
-    archive_tar_path = compress_path / QUIZZES_TAR_NAME
-    already_complete = not force and archive_tar_path.is_file()
+    archive_tar_path = compress_path / get_archive_name(QUIZZES_TAR_STEM)
+    already_complete = not force and bool(find_archive(compress_path, QUIZZES_TAR_STEM))
     if already_complete:
         echo("Quizzes already fetched.")
     else:
         quizzes = list(course.get_quizzes())
-        quiz_path = create_directory(compress_path / "Quizzes")
-        fetch_descriptions(quiz_path, quizzes, verbose)
-        fetch_quiz_questions(quizzes, quiz_path)
-        fetch_submission_scores(quizzes, quiz_path, instance)
-        fetch_quiz_responses(course, quiz_path, instance, verbose)
-        quizzes_directory = str(quizzes_path)
-        make_archive(
-            quizzes_directory, TAR_COMPRESSION_TYPE, root_dir=quizzes_directory
-        )
+        with ArchiveSink(archive_tar_path) as sink:
+            fetch_descriptions(compress_path, sink, quizzes, verbose)
+            fetch_quiz_questions(quizzes, sink)
+            fetch_submission_scores(quizzes, sink, instance)
+            fetch_quiz_responses(course, sink, instance, verbose)
     if unpack:
         unpacked_path = unpack_quizzes(compress_path, unpack_path, force, verbose=False)
         if verbose and unpacked_path:
             print_unpacked_file(unpacked_path)
-    rmtree(quizzes_path)
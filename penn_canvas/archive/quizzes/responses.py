@@ -1,7 +1,6 @@
 from functools import lru_cache
 from os import remove
 from pathlib import Path
-from tarfile import open as open_tarfile
 from typing import Optional
 
 from canvasapi.assignment import Assignment
@@ -16,12 +15,14 @@ from typer import echo
 
 from penn_canvas.api import Instance
 from penn_canvas.archive.assignments.assignment_descriptions import QUIZ_ID
+from penn_canvas.archive.codec import extract_file
 from penn_canvas.archive.helpers import (
     COMPRESSION_TYPE,
     format_name,
     format_question_text,
     strip_tags,
 )
+from penn_canvas.archive.sink import ArchiveSink
 from penn_canvas.helpers import create_directory
 from penn_canvas.style import color, print_item
 
@@ -117,8 +118,7 @@ def unpack_quiz_responses(
     compress_path: Path, archive_tar_path: Path, unpack_path: Path, verbose: bool
 ) -> Optional[Path]:
     echo("Unpacking quiz responses...")
-    quizzes_tar_file = open_tarfile(archive_tar_path)
-    quizzes_tar_file.extract(f"./responses.csv.{COMPRESSION_TYPE}", compress_path)
+    extract_file(f"./responses.csv.{COMPRESSION_TYPE}", archive_tar_path, compress_path)
     unpacked_responses_path = compress_path / f"responses.csv.{COMPRESSION_TYPE}"
     responses = read_csv(unpacked_responses_path)
     responses.fillna("", inplace=True)
@@ -148,7 +148,7 @@ def unpack_quiz_responses(
 
 def fetch_quiz_responses(
     course: Course,
-    quiz_path: Path,
+    sink: ArchiveSink,
     instance: Instance,
     verbose: bool,
 ):
@@ -166,4 +166,4 @@ def fetch_quiz_responses(
         submissions = get_assignment_submissions(assignment)
         responses.append(get_quiz_responses(submissions, quiz, verbose))
     response_data = concat(responses)
-    response_data.to_csv(quiz_path / f"responses.csv.{COMPRESSION_TYPE}", index=False)
+    sink.add_csv(f"responses.csv.{COMPRESSION_TYPE}", response_data)
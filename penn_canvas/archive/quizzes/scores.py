@@ -1,6 +1,5 @@
 from os import remove
 from pathlib import Path
-from tarfile import open as open_tarfile
 from typing import Optional
 
 from canvasapi.quiz import Quiz
@@ -11,7 +10,9 @@ from typer import echo
 
 from penn_canvas.api import Instance, get_user
 from penn_canvas.archive.assignments.assignment_descriptions import QUIZ_ID
+from penn_canvas.archive.codec import extract_file
 from penn_canvas.archive.helpers import COMPRESSION_TYPE, format_name
+from penn_canvas.archive.sink import ArchiveSink
 from penn_canvas.helpers import create_directory
 from penn_canvas.style import color, print_item
 
@@ -42,8 +43,7 @@ def unpack_quiz_scores(
 ) -> Optional[Path]:
     if verbose:
         echo("Unpacking quiz scores...")
-    quizzes_tar_file = open_tarfile(archive_tar_path)
-    quizzes_tar_file.extract(f"./scores.csv.{COMPRESSION_TYPE}", compress_path)
+    extract_file(f"./scores.csv.{COMPRESSION_TYPE}", archive_tar_path, compress_path)
     unpacked_scores_path = compress_path / f"scores.csv.{COMPRESSION_TYPE}"
     scores_data = read_csv(unpacked_scores_path)
     scores_data.fillna("", inplace=True)
@@ -62,10 +62,10 @@ def unpack_quiz_scores(
     return unpack_path
 
 
-def fetch_submission_scores(quizzes: list[Quiz], quiz_path: Path, instance: Instance):
+def fetch_submission_scores(quizzes: list[Quiz], sink: ArchiveSink, instance: Instance):
     scores = list()
     for quiz in quizzes:
         submissions = list(quiz.get_submissions())
         scores.append(get_submission_scores(submissions, quiz, instance))
     scores_data = concat(scores)
-    scores_data.to_csv(quiz_path / f"scores.csv.{COMPRESSION_TYPE}", index=False)
+    sink.add_csv(f"scores.csv.{COMPRESSION_TYPE}", scores_data)
@@ -0,0 +1,330 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime
+from enum import Enum
+from importlib import import_module
+from json import dumps, loads
+from pathlib import Path
+from threading import Lock
+from typing import TYPE_CHECKING, Callable, Iterable, Optional
+
+from loguru import logger
+from typer import echo
+
+from penn_canvas.constants import Instance
+from penn_canvas.helpers import create_directory, map_rows
+from penn_canvas.style import color, print_item
+
+from .helpers import format_name
+
+if TYPE_CHECKING:
+    from canvasapi.course import Course
+
+    from .content import ContentExportPipeline
+
+ARCHIVE_MANIFEST = "archive_manifest.json"
+COMPONENTS = [
+    "content",
+    "announcements",
+    "modules",
+    "pages",
+    "syllabus",
+    "assignments",
+    "groups",
+    "discussions",
+    "grades",
+    "rubrics",
+    "quizzes",
+]
+COMPONENT_MODULES = {
+    "assignments": "assignments.assignments",
+    "quizzes": "quizzes.quizzes",
+}
+INSTANCE_COMPONENTS = {"content", "modules", "assignments", "discussions", "quizzes"}
+EXPORT_LOOKAHEAD = 2
+
+
+class ComponentStatus(Enum):
+    RUNNING = "running"
+    COMPLETE = "complete"
+    FAILED = "failed"
+
+
+def get_component_module(component: str):
+    return import_module(f".{COMPONENT_MODULES.get(component, component)}", __package__)
+
+
+def get_component(component: str, action: str) -> Callable:
+    return getattr(get_component_module(component), f"{action}_{component}")
+
+
+def get_course(course_id: int, include: list[str], instance: Instance):
+    from penn_canvas.api import get_course
+
+    return get_course(course_id, include=include, instance=instance)
+
+
+def format_course_name(course: "Course") -> str:
+    return f"{format_name(course.name)} ({course.id})"
+
+
+def print_course(index: int, total: int, course_name: str):
+    print_item(index, total, color(course_name, "blue"))
+
+
+class CourseManifest:
+    def __init__(self, path: Path):
+        self.path = path
+        self.lock = Lock()
+        self.components: dict[str, dict] = self.read()
+
+    def read(self) -> dict[str, dict]:
+        if not self.path.is_file():
+            return dict()
+        try:
+            return loads(self.path.read_text())
+        except ValueError as error:
+            logger.warning(f"Ignoring unreadable archive manifest {self.path}: {error}")
+            return dict()
+
+    def is_complete(self, component: str) -> bool:
+        status = self.components.get(component, dict()).get("status")
+        return status == ComponentStatus.COMPLETE.value
+
+    def update(
+        self, component: str, status: ComponentStatus, error: Optional[str] = None
+    ):
+        with self.lock:
+            self.components[component] = {
+                "status": status.value,
+                "updated_at": datetime.now().isoformat(),
+                "error": error,
+            }
+            partial_path = self.path.with_name(f"{self.path.name}.part")
+            partial_path.write_text(dumps(self.components, indent=2))
+            partial_path.replace(self.path)
+
+
+def fetch_component(
+    component: str,
+    args: tuple,
+    instance: Instance,
+    verbose: bool,
+    assignments: Optional[Future] = None,
+    content_exports: Optional["ContentExportPipeline"] = None,
+):
+    fetch = get_component(component, "fetch")
+    if component == "grades":
+        assignment_objects = assignments.result() if assignments else None
+        return fetch(*args, assignment_objects, instance, verbose)
+    if component == "content" and content_exports:
+        return fetch(*args, instance, verbose, content_exports)
+    if component in INSTANCE_COMPONENTS:
+        return fetch(*args, instance, verbose)
+    return fetch(*args, verbose)
+
+
+def run_component(
+    component: str,
+    manifest: CourseManifest,
+    args: tuple,
+    instance: Instance,
+    verbose: bool,
+    assignments: Optional[Future] = None,
+    content_exports: Optional["ContentExportPipeline"] = None,
+):
+    manifest.update(component, ComponentStatus.RUNNING)
+    try:
+        result = fetch_component(
+            component, args, instance, verbose, assignments, content_exports
+        )
+    except Exception as error:
+        logger.error(f"Failed to fetch {component} for {args[0]}: {error}")
+        manifest.update(component, ComponentStatus.FAILED, str(error))
+        return None
+    manifest.update(component, ComponentStatus.COMPLETE)
+    return result
+
+
+def archive_course(
+    course_id: int,
+    components: list[str],
+    compressed_courses: Path,
+    unpacked_courses: Path,
+    instance: Instance,
+    unpack: bool,
+    force: bool,
+    verbose: bool,
+    component_workers: int,
+    index: int,
+    total: int,
+    content_exports: Optional["ContentExportPipeline"] = None,
+) -> bool:
+    try:
+        course = get_course(course_id, include=["syllabus_body"], instance=instance)
+    except Exception as error:
+        logger.error(f"Failed to get course {course_id}: {error}")
+        return False
+    course_name = format_course_name(course)
+    print_course(index, total, course_name)
+    compress_path = create_directory(compressed_courses / course_name)
+    unpack_path = unpacked_courses / course_name
+    manifest = CourseManifest(compress_path / ARCHIVE_MANIFEST)
+    pending = [
+        component
+        for component in components
+        if force or not manifest.is_complete(component)
+    ]
+    args = (course, compress_path, unpack_path, unpack, force)
+    futures: dict[str, Future] = dict()
+    with ThreadPoolExecutor(max_workers=component_workers) as executor:
+        for component in pending:
+            futures[component] = executor.submit(
+                run_component,
+                component,
+                manifest,
+                args,
+                instance,
+                verbose,
+                futures.get("assignments"),
+                content_exports,
+            )
+    complete = all(manifest.is_complete(component) for component in components)
+    status = color("COMPLETE", "green") if complete else color("INCOMPLETE", "red")
+    echo(f"{course_name}: {status}")
+    return complete
+
+
+def prefetch_course_content(
+    course_id: int,
+    compressed_courses: Path,
+    unpacked_courses: Path,
+    instance: Instance,
+    unpack: bool,
+    force: bool,
+    content_exports: "ContentExportPipeline",
+):
+    try:
+        course = get_course(course_id, include=["syllabus_body"], instance=instance)
+        course_name = format_course_name(course)
+        compress_path = create_directory(compressed_courses / course_name)
+        manifest = CourseManifest(compress_path / ARCHIVE_MANIFEST)
+        if force or not manifest.is_complete("content"):
+            prefetch = get_component("content", "prefetch")
+            prefetch(
+                course,
+                compress_path,
+                unpacked_courses / course_name,
+                unpack,
+                force,
+                content_exports,
+            )
+    except Exception as error:
+        logger.warning(f"Failed to prefetch content for course {course_id}: {error}")
+
+
+def get_prefetched_course_ids(
+    course_ids: list[int], prefetch: Callable[[int], Future], lookahead: int
+):
+    for course_id in course_ids[:lookahead]:
+        prefetch(course_id)
+    for index, course_id in enumerate(course_ids):
+        if index + lookahead < len(course_ids):
+            prefetch(course_ids[index + lookahead])
+        yield index, course_id
+
+
+def archive_courses(
+    course_ids: list[int],
+    components: list[str],
+    compressed_courses: Path,
+    unpacked_courses: Path,
+    instance: Instance,
+    unpack: bool,
+    force: bool,
+    verbose: bool,
+    course_workers=1,
+    component_workers=1,
+    export_lookahead=0,
+) -> int:
+    if "content" not in components or export_lookahead < 1:
+        return count_incomplete(
+            course_ids,
+            enumerate(course_ids),
+            components,
+            compressed_courses,
+            unpacked_courses,
+            instance,
+            unpack,
+            force,
+            verbose,
+            course_workers,
+            component_workers,
+        )
+    from .content import ContentExportPipeline
+
+    with ContentExportPipeline(instance, verbose) as content_exports:
+        with ThreadPoolExecutor(max_workers=1) as prefetcher:
+            prefetched_course_ids = get_prefetched_course_ids(
+                course_ids,
+                lambda course_id: prefetcher.submit(
+                    prefetch_course_content,
+                    course_id,
+                    compressed_courses,
+                    unpacked_courses,
+                    instance,
+                    unpack,
+                    force,
+                    content_exports,
+                ),
+                export_lookahead,
+            )
+            return count_incomplete(
+                course_ids,
+                prefetched_course_ids,
+                components,
+                compressed_courses,
+                unpacked_courses,
+                instance,
+                unpack,
+                force,
+                verbose,
+                course_workers,
+                component_workers,
+                content_exports,
+            )
+
+
+def count_incomplete(
+    course_ids: list[int],
+    indexed_course_ids: Iterable[tuple[int, int]],
+    components: list[str],
+    compressed_courses: Path,
+    unpacked_courses: Path,
+    instance: Instance,
+    unpack: bool,
+    force: bool,
+    verbose: bool,
+    course_workers: int,
+    component_workers: int,
+    content_exports: Optional["ContentExportPipeline"] = None,
+) -> int:
+    total = len(course_ids)
+    results = map_rows(
+        indexed_course_ids,
+        lambda course: archive_course(
+            course[1],
+            components,
+            compressed_courses,
+            unpacked_courses,
+            instance,
+            unpack,
+            force,
+            verbose,
+            component_workers,
+            course[0],
+            total,
+            content_exports,
+        ),
+        course_workers,
+    )
+    return sum(1 for complete in results if not complete)
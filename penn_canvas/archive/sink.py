@@ -0,0 +1,179 @@
+from contextlib import ExitStack, contextmanager
+from io import BytesIO
+from pathlib import Path, PurePosixPath
+from tarfile import DIRTYPE, REGTYPE, TarInfo
+from threading import Lock
+from time import time
+from typing import TYPE_CHECKING, BinaryIO, Iterable, Iterator, Optional
+from zipfile import ZipFile
+
+from penn_canvas.downloads import (
+    DOWNLOAD_WORKERS,
+    Download,
+    download_file,
+    download_files,
+    fetch_files,
+)
+
+from .codec import Codec, get_archive_codec, remove_other_archives
+from .helpers import COMPRESSION_TYPE
+
+if TYPE_CHECKING:
+    from pandas import DataFrame
+
+PARTIAL_SUFFIX = ".part"
+SCRATCH_SUFFIX = ".scratch"
+
+
+def get_member_path(name: str) -> str:
+    parts = [part for part in PurePosixPath(name).parts if part not in {"/", ".", ".."}]
+    return "/".join(parts)
+
+
+class ArchiveSink:
+    def __init__(self, path: Path, codec: Optional[Codec] = None):
+        self.path = path
+        self.codec = codec or get_archive_codec()
+        self.partial_path = path.with_name(f"{path.name}{PARTIAL_SUFFIX}")
+        self.lock = Lock()
+        self.directories: set[str] = set()
+        self.scratch_count = 0
+        self.streams = ExitStack()
+        self.archive = self.codec.open_writer(self.partial_path, self.streams)
+        self.write_directory("")
+
+    def __enter__(self) -> "ArchiveSink":
+        return self
+
+    def __exit__(self, exception_type, *args):
+        if exception_type:
+            self.abort()
+        else:
+            self.close()
+
+    def get_member(self, path: str, member_type=REGTYPE, size=0) -> TarInfo:
+        member = TarInfo(f"./{path}" if path else ".")
+        member.type = member_type
+        member.size = size
+        member.mtime = int(time())
+        member.mode = 0o755 if member_type == DIRTYPE else 0o644
+        return member
+
+    def write_directory(self, path: str):
+        parts = path.split("/") if path else list()
+        for index in range(len(parts) + 1):
+            directory = "/".join(parts[:index])
+            if directory not in self.directories:
+                self.directories.add(directory)
+                self.archive.addfile(self.get_member(directory, DIRTYPE))
+
+    def add_directory(self, name: str):
+        with self.lock:
+            self.write_directory(get_member_path(name))
+
+    def add_stream(self, name: str, stream: BinaryIO, size: int):
+        path = get_member_path(name)
+        with self.lock:
+            self.write_directory(path.rpartition("/")[0])
+            self.archive.addfile(self.get_member(path, size=size), stream)
+
+    def add_bytes(self, name: str, content: bytes):
+        self.add_stream(name, BytesIO(content), len(content))
+
+    def add_text(self, name: str, text: str):
+        self.add_bytes(name, text.encode())
+
+    def add_csv(self, name: str, data_frame: "DataFrame"):
+        compression = None
+        if name.endswith(f".{COMPRESSION_TYPE}"):
+            compression = {
+                "method": "gzip",
+                "compresslevel": self.codec.get_csv_level(),
+            }
+        buffer = BytesIO()
+        data_frame.to_csv(buffer, index=False, compression=compression)
+        self.add_bytes(name, buffer.getvalue())
+
+    def add_file(self, name: str, path: Path, remove=False):
+        with open(path, "rb") as stream:
+            self.add_stream(name, stream, path.stat().st_size)
+        if remove:
+            path.unlink()
+
+    def add_zip(self, path: Path, name=""):
+        with ZipFile(path) as zip_file:
+            for member in zip_file.infolist():
+                member_name = f"{name}/{member.filename}" if name else member.filename
+                if member.is_dir():
+                    self.add_directory(member_name)
+                    continue
+                with zip_file.open(member) as stream:
+                    self.add_stream(member_name, stream, member.file_size)
+
+    def get_scratch_path(self) -> Path:
+        with self.lock:
+            self.scratch_count += 1
+            scratch_name = f"{self.path.name}.{self.scratch_count}{SCRATCH_SUFFIX}"
+        return self.path.with_name(scratch_name)
+
+    def download(self, url: str, headers: Optional[dict] = None) -> Optional[Path]:
+        return download_file(self.get_scratch_path(), url, headers)
+
+    def download_all(
+        self,
+        urls: Iterable[str],
+        headers: Optional[dict] = None,
+        workers=DOWNLOAD_WORKERS,
+    ) -> Iterator[Optional[Path]]:
+        downloads = ((self.get_scratch_path(), url) for url in urls)
+        return download_files(downloads, headers, workers)
+
+    def fetch_all(
+        self,
+        urls: Iterable[str],
+        headers: Optional[dict] = None,
+        workers=DOWNLOAD_WORKERS,
+        head_size=0,
+    ) -> Iterator[Optional[Download]]:
+        downloads = ((self.get_scratch_path(), url) for url in urls)
+        return fetch_files(downloads, headers, workers, head_size)
+
+    def add_downloads(
+        self,
+        files: list[tuple[str, str]],
+        headers: Optional[dict] = None,
+        workers=DOWNLOAD_WORKERS,
+    ) -> int:
+        urls = (url for _, url in files)
+        added = 0
+        for (name, _), path in zip(files, self.download_all(urls, headers, workers)):
+            if path:
+                self.add_file(name, path, remove=True)
+                added += 1
+        return added
+
+    def add_download(self, name: str, url: str, headers: Optional[dict] = None) -> bool:
+        path = self.download(url, headers)
+        if not path:
+            return False
+        self.add_file(name, path, remove=True)
+        return True
+
+    @contextmanager
+    def open_archive(self, name: str) -> Iterator["ArchiveSink"]:
+        with ArchiveSink(self.get_scratch_path(), self.codec) as archive:
+            yield archive
+        self.add_file(name, archive.path, remove=True)
+
+    def close(self):
+        with self.lock:
+            self.archive.close()
+            self.streams.close()
+            self.partial_path.replace(self.path)
+            remove_other_archives(self.path)
+
+    def abort(self):
+        with self.lock:
+            self.archive.close()
+            self.streams.close()
+            self.partial_path.unlink(missing_ok=True)
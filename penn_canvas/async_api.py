@@ -0,0 +1,170 @@
+from asyncio import Semaphore, gather, sleep
+from typing import Any, AsyncIterator, Awaitable, Callable, Iterable, Optional
+
+from aiohttp import ClientSession, ClientTimeout, TCPConnector
+from loguru import logger
+
+from .api import Instance, get_canvas_url_and_key, validate_instance_name
+from .rate_limit import RateGovernor, is_rate_limited
+
+CONNECTION_LIMIT = 100
+CONNECTION_LIMIT_PER_HOST = 20
+KEEP_ALIVE_TIMEOUT = 30
+REQUEST_TIMEOUT = 300
+PER_PAGE = 100
+
+
+class CanvasRequestError(Exception):
+    def __init__(self, method: str, url: str, status: int, text: str):
+        super().__init__(f"{method} {url} failed with status {status}: {text}")
+        self.status = status
+
+
+class AsyncCanvas:
+    def __init__(
+        self,
+        base_url: str,
+        access_token: str,
+        limit=CONNECTION_LIMIT,
+        limit_per_host=CONNECTION_LIMIT_PER_HOST,
+        governor: Optional[RateGovernor] = None,
+        maximum_retries=6,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.api_url = f"{self.base_url}/api/v1/"
+        self.access_token = access_token
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.governor = governor or RateGovernor()
+        self.maximum_retries = maximum_retries
+        self.session: Optional[ClientSession] = None
+
+    async def __aenter__(self) -> "AsyncCanvas":
+        await self.open()
+        return self
+
+    async def __aexit__(self, *exception):
+        await self.close()
+
+    async def open(self):
+        if self.session:
+            return
+        connector = TCPConnector(
+            limit=self.limit,
+            limit_per_host=self.limit_per_host,
+            keepalive_timeout=KEEP_ALIVE_TIMEOUT,
+        )
+        self.session = ClientSession(
+            connector=connector,
+            headers={"Authorization": f"Bearer {self.access_token}"},
+            timeout=ClientTimeout(total=REQUEST_TIMEOUT),
+        )
+
+    async def close(self):
+        if self.session:
+            await self.session.close()
+            self.session = None
+
+    def get_url(self, endpoint: str) -> str:
+        if endpoint.startswith("http"):
+            return endpoint
+        return f"{self.api_url}{endpoint.lstrip('/')}"
+
+    async def request(
+        self, method: str, endpoint: str, params: Optional[Any] = None
+    ) -> tuple[Any, Optional[str]]:
+        await self.open()
+        assert self.session
+        url = self.get_url(endpoint)
+        attempt = 0
+        while True:
+            wait_time = self.governor.reserve_slot()
+            if wait_time > 0:
+                await sleep(wait_time)
+            async with self.session.request(method, url, params=params) as response:
+                content = await response.read()
+                self.governor.update(response.headers)
+                rate_limited = is_rate_limited(response.status, content)
+                if rate_limited and attempt < self.maximum_retries:
+                    self.governor.back_off(attempt)
+                    attempt += 1
+                    continue
+                if response.status >= 400:
+                    text = content.decode(errors="replace")
+                    logger.error(f"{method} {url}: {response.status} {text}")
+                    raise CanvasRequestError(method, url, response.status, text)
+                next_link = response.links.get("next")
+                next_url = str(next_link["url"]) if next_link else None
+                return (await response.json() if content else None), next_url
+
+    async def get(self, endpoint: str, **params) -> Any:
+        data, _ = await self.request("GET", endpoint, format_params(params))
+        return data
+
+    async def paginate(self, endpoint: str, **params) -> AsyncIterator[dict]:
+        params.setdefault("per_page", PER_PAGE)
+        next_url: Optional[str] = endpoint
+        page_params: Optional[list[tuple[str, str]]] = format_params(params)
+        while next_url:
+            data, next_url = await self.request("GET", next_url, page_params)
+            page_params = None
+            for item in data or list():
+                yield item
+
+    async def get_course(self, course_id: int | str, **params) -> dict:
+        return await self.get(f"courses/{course_id}", **params)
+
+    def get_tabs(self, course_id: int | str, **params) -> AsyncIterator[dict]:
+        return self.paginate(f"courses/{course_id}/tabs", **params)
+
+    def get_enrollments(self, course_id: int | str, **params) -> AsyncIterator[dict]:
+        return self.paginate(f"courses/{course_id}/enrollments", **params)
+
+    def get_assignments(self, course_id: int | str, **params) -> AsyncIterator[dict]:
+        return self.paginate(f"courses/{course_id}/assignments", **params)
+
+    def get_submissions(
+        self, course_id: int | str, assignment_id: int | str, **params
+    ) -> AsyncIterator[dict]:
+        return self.paginate(
+            f"courses/{course_id}/assignments/{assignment_id}/submissions", **params
+        )
+
+
+def format_params(params: dict) -> list[tuple[str, str]]:
+    formatted_params = list()
+    for key, value in params.items():
+        if value is None:
+            continue
+        values = value if isinstance(value, (list, tuple, set)) else [value]
+        name = f"{key}[]" if isinstance(value, (list, tuple, set)) else key
+        for item in values:
+            item = str(item).lower() if isinstance(item, bool) else str(item)
+            formatted_params.append((name, item))
+    return formatted_params
+
+
+async def collect(items: AsyncIterator) -> list:
+    return [item async for item in items]
+
+
+async def map_concurrently(
+    items: Iterable, callback: Callable[[Any], Awaitable], limit: int
+) -> list:
+    semaphore = Semaphore(limit)
+
+    async def run(item):
+        async with semaphore:
+            return await callback(item)
+
+    return await gather(*(run(item) for item in items))
+
+
+def get_async_canvas(
+    instance: str | Instance = Instance.PRODUCTION,
+    limit=CONNECTION_LIMIT,
+    limit_per_host=CONNECTION_LIMIT_PER_HOST,
+) -> AsyncCanvas:
+    instance = validate_instance_name(instance)
+    url, key = get_canvas_url_and_key(instance)
+    return AsyncCanvas(url, key, limit, limit_per_host)
@@ -1,4 +1,4 @@
-from functools import lru_cache
+from functools import lru_cache, partial
 from pathlib import Path
 from typing import Optional, Text, cast
 
@@ -6,37 +6,45 @@ from bs4 import BeautifulSoup, Tag
 from canvasapi.account import Account
 from canvasapi.course import Course
 from canvasapi.tab import Tab
-from click.termui import progressbar
 from loguru import logger
 from pandas import DataFrame, isna, read_csv
 from pandas.core.reshape.concat import concat
 from requests import Session, get, request
 from typer import echo
 
+from penn_canvas.accounts import get_account_descendants
 from penn_canvas.helpers import (
     BASE_PATH,
-    create_directory,
+    ResultWriter,
+    create_directories,
     get_start_index,
     make_csv_paths,
     make_index_headers,
     print_skip_message,
+    process_rows,
     switch_logger_file,
 )
-from penn_canvas.report import Report, ReportType, create_reports
+from penn_canvas.report import (
+    Report,
+    ReportPath,
+    ReportType,
+    iterate_reports,
+    read_report,
+)
 
 from .api import (
     Instance,
     format_instance_name,
     get_account,
     get_course,
-    get_sub_account_ids,
     request_external_url,
     validate_instance_name,
 )
 from .style import color, pluralize, print_item
+from .terms import get_term_names
 
-COMMAND_PATH = create_directory(BASE_PATH / "Blue Jeans")
-LOGS = create_directory(COMMAND_PATH / "Logs")
+COMMAND_PATH = BASE_PATH / "Blue Jeans"
+LOGS = COMMAND_PATH / "Logs"
 BLUE_JEANS_LABELS = {"Virtual Meetings", "BlueJeans", "Blue Jeans"}
 HEADERS = [
     "canvas course id",
@@ -52,27 +60,25 @@ HEADERS = [
     "total current",
     "total upcoming",
 ]
+REPORT_COLUMNS = [
+    "canvas_course_id",
+    "course_id",
+    "short_name",
+    "canvas_account_id",
+    "term_id",
+    "status",
+]
 
 
 def process_report(
-    report_path: Path, start: int, account_id: Optional[int]
+    report_path: ReportPath, start: int, account_id: Optional[int]
 ) -> tuple[DataFrame, int]:
-    report = read_csv(report_path)
-    report = report[
-        [
-            "canvas_course_id",
-            "course_id",
-            "short_name",
-            "canvas_account_id",
-            "term_id",
-            "status",
-        ]
-    ]
+    report = read_report(report_path, usecols=REPORT_COLUMNS, dtype="string")
+    report = report[REPORT_COLUMNS]
     report.drop_duplicates(inplace=True)
     report.sort_values("course_id", inplace=True, ignore_index=True)
-    report = report.astype("string", copy=False, errors="ignore")
     if account_id:
-        sub_accounts = get_sub_account_ids(account_id)
+        sub_accounts = get_account_descendants(account_id)
         report = report[report["canvas_account_id"].isin(sub_accounts)]
     total = len(report.index)
     report["term_id"].fillna("N/A", inplace=True)
@@ -149,25 +155,16 @@ def get_account_name(account_id: int, instance: Instance) -> Account:
 
 
 def get_blue_jeans_data(
-    report: DataFrame,
-    total: int,
-    course: tuple,
-    result_path: Path,
-    instance: Instance,
-    verbose: bool,
-):
-    (
-        index,
-        canvas_course_id,
-        course_id,
-        short_name,
-        canvas_account_id,
-    ) = course[:5]
+    course: tuple, instance: Instance
+) -> tuple[tuple, dict[str, Optional[str | bool]], Optional[Course], Optional[Tab]]:
+    canvas_course_id, canvas_account_id = course[1], course[4]
+    values: dict[str, Optional[str | bool]] = dict()
     try:
-        account_name = get_account_name(int(canvas_account_id), instance)
+        values["canvas account name"] = get_account_name(
+            int(canvas_account_id), instance
+        )
     except Exception:
-        account_name = ""
-    report.at[index, "canvas account name"] = account_name
+        values["canvas account name"] = ""
     try:
         canvas_course = get_course(canvas_course_id, instance=instance)
         blue_jeans_tab = get_blue_jeans_tab(canvas_course)
@@ -177,21 +174,37 @@ def get_blue_jeans_data(
         blue_jeans_tab = None
         canvas_course = None
         enabled = None
-    total_meetings = "0"
     if blue_jeans_tab:
         upcoming, current, recorded = get_meetings_from_tab(
             blue_jeans_tab, instance=instance
         )
-        total_meetings = str(upcoming + current + recorded)
-        report.at[index, "total meetings"] = total_meetings
-        report.at[index, "total recordings"] = str(recorded)
-        report.at[index, "total current"] = str(current)
-        report.at[index, "total upcoming"] = str(upcoming)
+        values["total meetings"] = str(upcoming + current + recorded)
+        values["total recordings"] = str(recorded)
+        values["total current"] = str(current)
+        values["total upcoming"] = str(upcoming)
+    values["tool status"] = enabled
+    return course, values, canvas_course, blue_jeans_tab
+
+
+def write_blue_jeans_result(
+    report: DataFrame,
+    total: int,
+    result: tuple[
+        tuple, dict[str, Optional[str | bool]], Optional[Course], Optional[Tab]
+    ],
+    result_writer: ResultWriter,
+    verbose: bool,
+):
+    course, values, canvas_course, blue_jeans_tab = result
+    index, _, course_id, short_name, canvas_account_id = course[:5]
+    total_meetings = values.get("total meetings", "0")
+    for column, value in values.items():
+        report.at[index, column] = value
     if isna(course_id):
         report.at[index, "course_id"] = f"{short_name} ({canvas_account_id})"
-    report.at[index, "tool status"] = enabled
-    report.loc[index].to_frame().T.to_csv(result_path, mode="a", header=False)
+    result_writer.write_report_row(report, index)
     if verbose:
+        enabled = values["tool status"]
         label_display = f'"{blue_jeans_tab.label}"' if blue_jeans_tab else ""
         total_display = f"({total_meetings} {pluralize('meeting', total_meetings)})"
         found_display = f"FOUND {label_display} {total_display}"
@@ -221,32 +234,40 @@ def blue_jeans_main(
     verbose: bool,
     force: bool,
     force_report: bool,
+    workers: int = 1,
 ):
     instance = validate_instance_name(instance_name, verbose=not verbose)
+    terms = get_term_names(terms, instance)
     instance_display = format_instance_name(instance)
     switch_logger_file(LOGS, "blue_jeans", instance.name)
+    create_directories(COMMAND_PATH)
     report_objects = [
         Report(ReportType.COURSES, instance=instance, term=term, force=force_report)
         for term in terms
     ]
-    report_paths = create_reports(report_objects, verbose=verbose)
-    reports = zip(terms, report_paths)
-    for term, report_path in reports:
+    for report_object, report_path in iterate_reports(report_objects, verbose=verbose):
+        if not report_path:
+            continue
+        term = report_object.term
         result_path = COMMAND_PATH / f"Blue_Jeans_usage_{term}{instance_display}.csv"
         start = get_start_index(force, result_path)
         make_csv_paths(result_path, make_index_headers(HEADERS))
         print_skip_message(start, "course")
-        report, total = process_report(report_path, start, account_id)
-        if verbose:
-            for course in report.itertuples():
-                get_blue_jeans_data(
-                    report, total, course, result_path, instance, verbose
-                )
-        else:
-            with progressbar(report.itertuples(), length=total) as progress:
-                for course in progress:
-                    get_blue_jeans_data(
-                        report, total, course, result_path, instance, verbose
-                    )
+        report, total = process_report(cast(ReportPath, report_path), start, account_id)
+        with ResultWriter(result_path) as result_writer:
+            process_rows(
+                report.itertuples(),
+                partial(get_blue_jeans_data, instance=instance),
+                partial(
+                    write_blue_jeans_result,
+                    report,
+                    total,
+                    result_writer=result_writer,
+                    verbose=verbose,
+                ),
+                verbose,
+                workers,
+                length=len(report.index),
+            )
         process_result(result_path)
     echo("COMPLETE")
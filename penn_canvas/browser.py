@@ -11,7 +11,7 @@ from ua_parser import user_agent_parser
 
 from penn_canvas.helpers import (
     BASE_PATH,
-    create_directory,
+    create_directories,
     get_course_ids_from_input,
     get_start_index,
     make_list_from_optional_iterable,
@@ -22,11 +22,12 @@ from penn_canvas.helpers import (
 )
 
 from .api import Instance, format_instance_name, get_course, validate_instance_name
+from .pagination import iterate_pages
 from .style import color, print_item
 
-COMMAND_PATH = create_directory(BASE_PATH / "Browser")
-RESULTS = create_directory(COMMAND_PATH / "Results")
-LOGS = create_directory(COMMAND_PATH / "Logs")
+COMMAND_PATH = BASE_PATH / "Browser"
+RESULTS = COMMAND_PATH / "Results"
+LOGS = COMMAND_PATH / "Logs"
 
 
 def get_user_account_data(user: User) -> list:
@@ -77,7 +78,7 @@ def get_user_agents(
         print_item(index, total, f"Fetching user agents for {color(user)}...")
     user_agents = {
         page_view.user_agent
-        for page_view in tqdm(user.get_page_views())
+        for page_view in tqdm(iterate_pages(user.get_page_views()))
         if page_view.user_agent
     }
     if verbose:
@@ -147,6 +148,7 @@ def browser_main(
         raise Exit()
     instance = validate_instance_name(instance_name, verbose=True)
     switch_logger_file(LOGS, "browser", instance.name)
+    create_directories(RESULTS)
     courses = get_course_ids_from_input(course_ids)
     total_courses = len(courses)
     if verbose:
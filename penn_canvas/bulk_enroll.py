@@ -17,21 +17,21 @@ from .helpers import (
     BASE_PATH,
     YEAR,
     color,
-    create_directory,
+    create_directories,
     find_input,
-    get_processed,
-    handle_clear_processed,
     make_csv_paths,
     process_input,
     switch_logger_file,
 )
+from .ledger import ProcessedLedger, clear_processed_ledgers
+from .pagination import iterate_pages
 
 INPUT_FILE_NAME = "Terms input file"
-COMMAND_PATH = create_directory(BASE_PATH / "Storage")
-INPUT = create_directory(COMMAND_PATH / "Input")
-RESULTS = create_directory(COMMAND_PATH / "Results")
-LOGS = create_directory(COMMAND_PATH / "Logs")
-PROCESSED = create_directory(COMMAND_PATH / ".processed")
+COMMAND_PATH = BASE_PATH / "Storage"
+INPUT = COMMAND_PATH / "Input"
+RESULTS = COMMAND_PATH / "Results"
+LOGS = COMMAND_PATH / "Logs"
+PROCESSED = COMMAND_PATH / ".processed"
 ONGOING_TERM_ID = 4373
 HEADERS = ["canvas course id", "canvas sis course id", "error"]
 PROCESSED_HEADERS = HEADERS[:2]
@@ -61,6 +61,7 @@ def bulk_enroll_main(
 ):
     instance = validate_instance_name(instance_name)
     switch_logger_file(LOGS, "bulk_enroll", instance.name)
+    create_directories(INPUT, RESULTS, PROCESSED)
     try:
         user_name = get_user(user, instance=instance).name
     except Exception:
@@ -83,11 +84,11 @@ def bulk_enroll_main(
         f"{prefix}processed_errors{format_instance_name(instance)}.csv"
     )
     processed_errors_path = PROCESSED / processed_errors_stem_string
-    handle_clear_processed(
-        clear_processed, [processed_path, processed_errors_path], item_plural="courses"
+    processed_courses = ProcessedLedger(processed_path, PROCESSED_HEADERS)
+    processed_errors = ProcessedLedger(processed_errors_path, PROCESSED_HEADERS)
+    clear_processed_ledgers(
+        clear_processed, [processed_courses, processed_errors], item_plural="courses"
     )
-    processed_courses = get_processed(processed_path, PROCESSED_HEADERS)
-    processed_errors = get_processed(processed_errors_path, PROCESSED_HEADERS)
     if input_file:
         input_files, missing_file_message = find_input(
             INPUT_FILE_NAME, INPUT, date=False, bulk_enroll=True
@@ -120,12 +121,11 @@ def bulk_enroll_main(
     COURSES = list()
     for term in terms:
         COURSES.extend(
-            [
-                course
-                for course in account.get_courses(
+            iterate_pages(
+                account.get_courses(
                     enrollment_term_id=term, by_subaccounts=[sub_account]
                 )
-            ]
+            )
         )
     if dry_run:
         course_codes = [
@@ -139,12 +139,10 @@ def bulk_enroll_main(
             index=False,
         )
     else:
-        COURSES = [
-            course for course in COURSES if str(course.id) not in processed_courses
-        ]
+        COURSES = [course for course in COURSES if course.id not in processed_courses]
         if not check_errors:
             COURSES = [
-                course for course in COURSES if str(course.id) not in processed_errors
+                course for course in COURSES if course.id not in processed_errors
             ]
         ERROR_FILE = (
             RESULTS / f"{sub_account}_bulk_enrollment_{user_name}_{YEAR}_ERRORS.csv"
@@ -201,16 +199,8 @@ def bulk_enroll_main(
                         " Failed to restore original term and/or end_at data. Please"
                         f" see log path for details: {color(LOG_PATH, 'green')}"
                     )
-                if str(course.id) in processed_errors:
-                    processed_errors_csv = read_csv(processed_errors_path)
-                    processed_errors_csv = processed_errors_csv[
-                        processed_errors_csv["canvas sis course id"]
-                        != sis_course_id_or_name
-                    ]
-                    processed_errors_csv.to_csv(processed_errors_path, index=False)
-
-                with open(processed_path, "a+", newline="") as processed_file:
-                    writer(processed_file).writerow([course.id, sis_course_id_or_name])
+                processed_errors.remove(course.id)
+                processed_courses.add([course.id, sis_course_id_or_name])
             except Exception as error:
                 color(
                     f"- ({index}/{TOTAL_COURSES}) ERROR: Failed to enroll"
@@ -229,11 +219,8 @@ def bulk_enroll_main(
                                 error,
                             ]
                         )
-                if str(course.id) not in processed_errors:
-                    with open(
-                        processed_errors_path, "a+", newline=""
-                    ) as processed_file:
-                        writer(processed_file).writerow(
-                            [course.id, sis_course_id_or_name]
-                        )
+                if course.id not in processed_errors:
+                    processed_errors.add([course.id, sis_course_id_or_name])
+    processed_courses.close()
+    processed_errors.close()
     color("FINISHED", "yellow", True)
@@ -0,0 +1,274 @@
+from dataclasses import dataclass
+from hashlib import sha256
+from json import dumps, loads
+from pathlib import Path
+from re import compile
+from sqlite3 import Connection, connect
+from threading import Lock
+from time import time
+from typing import Optional
+from urllib.parse import urlparse
+
+from loguru import logger
+from requests import Request, Response
+from requests.structures import CaseInsensitiveDict
+
+from .config import CONFIG_DIRECTORY
+from .helpers import create_directory
+from .rate_limit import GovernedSession, RateGovernor
+
+CACHE_PATH = CONFIG_DIRECTORY / "cache.sqlite3"
+MAXIMUM_CACHE_SIZE = 256 * 1024 * 1024
+HOUR = 60 * 60
+DAY = 24 * HOUR
+RESOURCE_TTLS = {
+    "accounts": 7 * DAY,
+    "users": DAY,
+    "courses": HOUR,
+    "sections": HOUR,
+}
+RESOURCE_PATH = compile(r"^(/api/v1/(\w+)/(?!self/?$)[^/]+)/?$")
+WRITE_PATH = compile(r"^(/api/v1/\w+/[^/]+)")
+
+
+@dataclass
+class CacheSettings:
+    enabled: bool = False
+    refresh: bool = False
+    path: Path = CACHE_PATH
+    maximum_size: int = MAXIMUM_CACHE_SIZE
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    revalidations: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+
+CACHE_SETTINGS = CacheSettings()
+
+
+def configure_cache(enabled: bool, refresh: bool):
+    CACHE_SETTINGS.enabled = enabled or refresh
+    CACHE_SETTINGS.refresh = refresh
+
+
+def get_resource(url: str) -> Optional[tuple[str, int]]:
+    match = RESOURCE_PATH.match(urlparse(url).path)
+    if not match:
+        return None
+    resource_path, resource = match.groups()
+    ttl = RESOURCE_TTLS.get(resource)
+    return (resource_path, ttl) if ttl else None
+
+
+def get_cache_key(url: str, authorization: str) -> str:
+    return sha256(f"{authorization} {url}".encode()).hexdigest()
+
+
+def create_response(
+    url: str, status_code: int, headers: dict, content: bytes
+) -> Response:
+    response = Response()
+    response.url = url
+    response.status_code = status_code
+    response.reason = "OK"
+    response.headers = CaseInsensitiveDict(headers)
+    response._content = content
+    response.encoding = "utf-8"
+    return response
+
+
+class ResponseCache:
+    def __init__(self, path=CACHE_PATH, maximum_size=MAXIMUM_CACHE_SIZE):
+        self.path = path
+        self.maximum_size = maximum_size
+        self.stats = CacheStats()
+        self.lock = Lock()
+        self.connection = self.open()
+        self.size = self.connection.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()[0]
+
+    def open(self) -> Connection:
+        create_directory(self.path.parent)
+        connection = connect(self.path, check_same_thread=False)
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, url TEXT,"
+            " resource_path TEXT, status_code INTEGER, headers TEXT, content BLOB,"
+            " etag TEXT, stored_at REAL, expires_at REAL, accessed_at REAL,"
+            " size INTEGER)"
+        )
+        connection.execute(
+            "CREATE INDEX IF NOT EXISTS responses_accessed_at"
+            " ON responses (accessed_at)"
+        )
+        connection.execute(
+            "CREATE INDEX IF NOT EXISTS responses_resource_path"
+            " ON responses (resource_path)"
+        )
+        return connection
+
+    def close(self):
+        with self.lock:
+            self.connection.close()
+
+    def get(self, key: str) -> Optional[tuple[Response, Optional[str], bool]]:
+        with self.lock:
+            row = self.connection.execute(
+                "SELECT url, status_code, headers, content, etag, expires_at"
+                " FROM responses WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if not row:
+                return None
+            self.connection.execute(
+                "UPDATE responses SET accessed_at = ? WHERE key = ?", (time(), key)
+            )
+            self.connection.commit()
+        url, status_code, headers, content, etag, expires_at = row
+        response = create_response(url, status_code, loads(headers), content)
+        return response, etag, expires_at > time()
+
+    def set(self, key: str, response: Response, resource_path: str, ttl: int):
+        now = time()
+        headers = dumps(dict(response.headers))
+        content = response.content
+        size = len(content) + len(headers)
+        with self.lock:
+            previous = self.connection.execute(
+                "SELECT size FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            self.connection.execute(
+                "INSERT OR REPLACE INTO responses VALUES"
+                " (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    response.url,
+                    resource_path,
+                    response.status_code,
+                    headers,
+                    content,
+                    response.headers.get("ETag"),
+                    now,
+                    now + ttl,
+                    now,
+                    size,
+                ),
+            )
+            self.size += size - (previous[0] if previous else 0)
+            self.evict()
+            self.connection.commit()
+
+    def renew(self, key: str, ttl: int):
+        now = time()
+        with self.lock:
+            self.connection.execute(
+                "UPDATE responses SET stored_at = ?, expires_at = ?, accessed_at = ?"
+                " WHERE key = ?",
+                (now, now + ttl, now, key),
+            )
+            self.connection.commit()
+
+    def evict(self):
+        while self.size > self.maximum_size:
+            rows = self.connection.execute(
+                "SELECT key, size FROM responses ORDER BY accessed_at LIMIT 100"
+            ).fetchall()
+            if not rows:
+                self.size = 0
+                return
+            for key, size in rows:
+                if self.size <= self.maximum_size:
+                    break
+                self.connection.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self.size -= size
+                self.stats.evictions += 1
+
+    def invalidate(self, resource_path: str):
+        with self.lock:
+            rows = self.connection.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM responses WHERE resource_path = ?",
+                (resource_path,),
+            ).fetchone()
+            self.connection.execute(
+                "DELETE FROM responses WHERE resource_path = ?", (resource_path,)
+            )
+            self.connection.commit()
+            self.size -= rows[0]
+
+    def clear(self):
+        with self.lock:
+            self.connection.execute("DELETE FROM responses")
+            self.connection.commit()
+            self.size = 0
+
+
+class CachedSession(GovernedSession):
+    def __init__(
+        self,
+        cache: ResponseCache,
+        refresh=False,
+        governor: Optional[RateGovernor] = None,
+        maximum_retries=6,
+    ):
+        super().__init__(governor, maximum_retries)
+        self.cache = cache
+        self.refresh = refresh
+
+    def request(self, method, url, *args, **kwargs) -> Response:
+        if method.upper() != "GET":
+            match = WRITE_PATH.match(urlparse(url).path)
+            if match:
+                self.cache.invalidate(match.group(1))
+            return super().request(method, url, *args, **kwargs)
+        resource = get_resource(url)
+        if not resource:
+            return super().request(method, url, *args, **kwargs)
+        resource_path, ttl = resource
+        headers = dict(kwargs.pop("headers", None) or dict())
+        full_url = Request("GET", url, params=kwargs.get("params")).prepare().url or url
+        key = get_cache_key(full_url, headers.get("Authorization", ""))
+        cached = None if self.refresh else self.cache.get(key)
+        if cached:
+            cached_response, etag, fresh = cached
+            if fresh:
+                self.cache.stats.hits += 1
+                return cached_response
+            if etag:
+                headers["If-None-Match"] = etag
+        response = super().request(method, url, *args, headers=headers, **kwargs)
+        if cached and response.status_code == 304:
+            self.cache.stats.revalidations += 1
+            self.cache.renew(key, ttl)
+            return cached[0]
+        self.cache.stats.misses += 1
+        if response.status_code == 200:
+            self.cache.set(key, response, resource_path, ttl)
+        return response
+
+
+RESPONSE_CACHES: dict[str, ResponseCache] = dict()
+RESPONSE_CACHES_LOCK = Lock()
+
+
+def get_response_cache() -> ResponseCache:
+    path = str(CACHE_SETTINGS.path)
+    with RESPONSE_CACHES_LOCK:
+        cache = RESPONSE_CACHES.get(path)
+        if not cache:
+            cache = ResponseCache(CACHE_SETTINGS.path, CACHE_SETTINGS.maximum_size)
+            RESPONSE_CACHES[path] = cache
+    return cache
+
+
+def log_response_cache_stats():
+    for cache in RESPONSE_CACHES.values():
+        stats = cache.stats
+        logger.info(
+            f"Response cache hits: {stats.hits}, revalidations:"
+            f" {stats.revalidations}, misses: {stats.misses}, evictions:"
+            f" {stats.evictions}, size: {cache.size:,} bytes"
+        )
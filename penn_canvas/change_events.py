@@ -3,13 +3,10 @@ from pathlib import Path
 
 from tqdm import tqdm
 
-from penn_canvas.api import (
-    get_account,
-    get_enrollment_term_id,
-    request_canvas_api_endpoint,
-)
+from penn_canvas.api import get_account, request_canvas_api_endpoint
 from penn_canvas.helpers import format_timestamp, write_row
 from penn_canvas.style import color, print_item
+from penn_canvas.terms import get_enrollment_term_id
 
 
 def is_relevant_event(event):
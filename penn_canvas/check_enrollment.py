@@ -7,16 +7,10 @@ from pandas import read_csv
 from pytz import utc
 from typer import echo
 
-from .api import (
-    Instance,
-    format_instance_name,
-    get_course,
-    get_user,
-    validate_instance_name,
-)
+from .api import Instance, format_instance_name, get_course, validate_instance_name
 from .helpers import (
     BASE_PATH,
-    create_directory,
+    create_directories,
     get_start_index,
     make_csv_paths,
     print_skip_message,
@@ -25,10 +19,11 @@ from .helpers import (
     write_row,
 )
 from .style import color, print_item
+from .users import get_user_resolver
 
-COMMAND_PATH = create_directory(BASE_PATH / "Check Enrollment")
-RESULTS = create_directory(COMMAND_PATH / "Results")
-LOGS = create_directory(COMMAND_PATH / "Logs")
+COMMAND_PATH = BASE_PATH / "Check Enrollment"
+RESULTS = COMMAND_PATH / "Results"
+LOGS = COMMAND_PATH / "Logs"
 HEADERS = ["index", "Date Enrolled", "Name", "Email"]
 
 
@@ -40,12 +35,14 @@ class Enrollment:
 
 
 def get_email(user_id: int, instance: Instance) -> str:
+    user = get_user_resolver(instance).get(user_id)
+    email = getattr(user, "email", None)
+    if email:
+        return email
     return next(
         (
             channel.address
-            for channel in get_user(
-                user_id, instance=instance
-            ).get_communication_channels()
+            for channel in user.get_communication_channels()
             if channel.type == "email"
         ),
         "",
@@ -80,6 +77,7 @@ def check_enrollment_main(
 ):
     instance = validate_instance_name(instance_name, verbose=True)
     switch_logger_file(LOGS, "check_enrollment", instance.name)
+    create_directories(RESULTS)
     start_date = utc.localize(datetime.strptime(date, "%Y-%m-%d"))
     course = get_course(course_id, instance=instance)
     instance_display = format_instance_name(instance)
@@ -96,6 +94,7 @@ def check_enrollment_main(
         if enrollment.created_at_date > start_date
     ]
     enrollments = sorted(enrollments, key=lambda enrollment: enrollment.created_at_date)
+    get_user_resolver(instance).load_course(course)
     if verbose:
         echo(f"{color(course)} enrollments after {color(date, 'cyan')}: ")
     total = len(enrollments)
@@ -0,0 +1,19 @@
+from typer import echo
+
+from .helpers import get_reports_directory, remove_old_reports_directories
+from .style import color, pluralize
+
+
+def cleanup_main(days: int, verbose: bool):
+    reports_path = get_reports_directory()
+    echo(f") Removing reports older than {color(days)} days...")
+    removed_paths = remove_old_reports_directories(reports_path, days)
+    if verbose:
+        for path in removed_paths:
+            echo(f"- {color(path, 'yellow')}")
+    echo(
+        f"- Removed {color(len(removed_paths))}"
+        f" {pluralize('directory', len(removed_paths))} from"
+        f" {color(reports_path, 'blue')}."
+    )
+    echo(color("FINISHED", "yellow"))
@@ -9,8 +9,8 @@ from typer import Exit, confirm, echo, prompt
 from .helpers import BASE_PATH, create_directory, switch_logger_file
 from .style import color
 
-CONFIG_DIRECTORY = create_directory(Path.home() / ".config" / "penn-canvas")
-LOGS = create_directory(BASE_PATH / "Logs")
+CONFIG_DIRECTORY = Path.home() / ".config" / "penn-canvas"
+LOGS = BASE_PATH / "Logs"
 CONFIG_FILE = CONFIG_DIRECTORY / "penn-canvas.ini"
 CONFIG_OPTIONS = {
     "canvas_urls": [
@@ -151,6 +151,7 @@ def write_config_options(
     else:
         for section in CONFIG_OPTIONS.keys():
             config = write_config_section(config, section, first_time)
+    create_directory(CONFIG_DIRECTORY)
     with open(CONFIG_FILE, "w") as config_file:
         config.write(config_file)
     return get_all_config_options()
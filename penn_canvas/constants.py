@@ -1,5 +1,26 @@
+from enum import Enum
+
+
+class Instance(Enum):
+    PRODUCTION = "prod"
+    TEST = "test"
+    BETA = "beta"
+    OPEN = "open"
+    OPEN_TEST = "open_test"
+    OPEN_BETA = "open_beta"
+
+
+class ReportType(Enum):
+    COURSES = "courses"
+    USERS = "users"
+    STORAGE = "storage"
+    PROVISIONING = "provisioning"
+    PUBLIC_COURSES = "public_courses"
+
+
 PENN_CANVAS_MAIN_ACCOUNT_ID = 96678
 OPEN_CANVAS_MAIN_ACCOUNT_ID = 1
+REPORT_WORKERS = 4
 TOOLS = [
     "agora test build",
     "atomic search",
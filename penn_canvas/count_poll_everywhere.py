@@ -1,4 +1,5 @@
 from pathlib import Path
+from typing import Any
 
 from canvasapi.module import ModuleItem
 from pandas import read_csv
@@ -11,7 +12,9 @@ from penn_canvas.style import print_item
 from .api import Instance, get_canvas, get_course
 from .helpers import (
     YEAR,
+    ResultWriter,
     color,
+    create_directories,
     find_input,
     get_command_paths,
     get_start_index,
@@ -77,7 +80,14 @@ def print_messages(total: int, courses_with_quiz: int):
     echo(color("FINISHED", "yellow"))
 
 
-def count_poll_everywhere_main(test: bool, force: bool, verbose: bool):
+def count_poll_everywhere_main(test: bool, force: bool, verbose: bool, workers=1):
+    def write_course(result: tuple[Any, list, str]):
+        index, values, message = result
+        report.at[index, HEADERS] = values
+        RESULT_WRITER.write_report_row(report, index)
+        if verbose:
+            print_item(index, TOTAL, message)
+
     def count_poll_everywhere_for_course(
         course: Series, instance: Instance, verbose: bool
     ):
@@ -106,7 +116,7 @@ def count_poll_everywhere_main(test: bool, force: bool, verbose: bool):
             course_name = canvas_course_id
             poll_everywhere = "error"
             error_message = error
-        report.at[index, HEADERS] = [
+        values = [
             canvas_course_id,
             course_id,
             short_name,
@@ -115,22 +125,18 @@ def count_poll_everywhere_main(test: bool, force: bool, verbose: bool):
             status,
             poll_everywhere,
         ]
-        report.loc[index].to_frame().T.to_csv(RESULT_PATH, mode="a", header=False)
-        if verbose:
-            text_and_color = (
-                ("FOUND", "green")
-                if poll_everywhere == "Y"
-                else ("NOT FOUND", "yellow")
+        text_and_color = (
+            ("FOUND", "green") if poll_everywhere == "Y" else ("NOT FOUND", "yellow")
+        )
+        if not error_message:
+            message = (
+                f"{color(course_name)}: {color(text_and_color[0], text_and_color[1])}"
             )
-            if not error_message:
-                message = (
-                    f"{color(course_name)}:"
-                    f" {color(text_and_color[0], text_and_color[1])}"
-                )
-            else:
-                message = f"{color(course_name)}: {color(error_message, 'red')}"
-            print_item(index, TOTAL, message)
+        else:
+            message = f"{color(course_name)}: {color(error_message, 'red')}"
+        return index, values, message
 
+    create_directories(RESULTS)
     reports, missing_file_message = find_input(INPUT_FILE_NAME, REPORTS)
     RESULT_PATH = RESULTS / f"{YEAR}_poll_everywhere_usage_report.csv"
     START = get_start_index(force, RESULT_PATH)
@@ -149,6 +155,14 @@ def count_poll_everywhere_main(test: bool, force: bool, verbose: bool):
     INSTANCE = Instance.TEST if test else Instance.PRODUCTION
     CANVAS = get_canvas(INSTANCE)
     echo(") Processing courses...")
-    toggle_progress_bar(report, count_poll_everywhere_for_course, CANVAS, verbose)
+    with ResultWriter(RESULT_PATH) as RESULT_WRITER:
+        toggle_progress_bar(
+            report,
+            count_poll_everywhere_for_course,
+            CANVAS,
+            verbose,
+            write=write_course,
+            workers=workers,
+        )
     courses_with_poll_everywhere = process_result(RESULT_PATH, TERM_ID)
     print_messages(TOTAL, courses_with_poll_everywhere)
@@ -4,7 +4,9 @@ from typer import echo
 from .api import Instance, get_canvas
 from .helpers import (
     YEAR,
+    ResultWriter,
     color,
+    create_directories,
     find_input,
     get_command_paths,
     get_start_index,
@@ -121,7 +123,14 @@ def print_messages(total, courses_with_quiz):
     color("FINISHED", "yellow", True)
 
 
-def count_quizzes_main(new_quizzes, test, force, verbose):
+def count_quizzes_main(new_quizzes, test, force, verbose, workers=1):
+    def write_course(result):
+        index, headers, values, total_quizzes, error_message, course_name = result
+        report.at[index, headers] = values
+        RESULT_WRITER.write_report_row(report, index)
+        if verbose:
+            print_course(total_quizzes, error_message, index, TOTAL, course_name)
+
     def count_new_quizzes_for_course(course, canvas, verbose):
         (
             index,
@@ -150,7 +159,7 @@ def count_quizzes_main(new_quizzes, test, force, verbose):
             number_of_students = "error"
             course_name = canvas_course_id
             error_message = error
-        report.at[index, NEW_QUIZ_HEADERS] = [
+        values = [
             canvas_course_id,
             course_id,
             short_name,
@@ -160,9 +169,14 @@ def count_quizzes_main(new_quizzes, test, force, verbose):
             str(number_of_students),
             str(total_quizzes),
         ]
-        report.loc[index].to_frame().T.to_csv(RESULT_PATH, mode="a", header=False)
-        if verbose:
-            print_course(total_quizzes, error_message, index, TOTAL, course_name)
+        return (
+            index,
+            NEW_QUIZ_HEADERS,
+            values,
+            total_quizzes,
+            error_message,
+            course_name,
+        )
 
     def count_quizzes_for_course(course, canvas, verbose):
         (
@@ -224,7 +238,7 @@ def count_quizzes_main(new_quizzes, test, force, verbose):
             course_name = canvas_course_id
             error_message = error
 
-        report.at[index, HEADERS] = [
+        values = [
             canvas_course_id,
             course_id,
             short_name,
@@ -242,10 +256,9 @@ def count_quizzes_main(new_quizzes, test, force, verbose):
             str(total_unpublished_quizzes),
             str(total_quizzes),
         ]
-        report.loc[index].to_frame().T.to_csv(RESULT_PATH, mode="a", header=False)
-        if verbose:
-            print_course(total_quizzes, error_message, index, TOTAL, course_name)
+        return index, HEADERS, values, total_quizzes, error_message, course_name
 
+    create_directories(RESULTS)
     reports, missing_file_message = find_input(INPUT_FILE_NAME, REPORTS)
     RESULT_PATH = (
         RESULTS / f"{YEAR}_{'new_' if new_quizzes else ''}quiz_usage_report.csv"
@@ -269,9 +282,14 @@ def count_quizzes_main(new_quizzes, test, force, verbose):
     INSTANCE = Instance.TEST if test else Instance.PRODUCTION
     CANVAS = get_canvas(INSTANCE)
     echo(") Processing courses...")
-    if new_quizzes:
-        toggle_progress_bar(report, count_new_quizzes_for_course, CANVAS, verbose)
-    else:
-        toggle_progress_bar(report, count_quizzes_for_course, CANVAS, verbose)
+    with ResultWriter(RESULT_PATH) as RESULT_WRITER:
+        toggle_progress_bar(
+            report,
+            count_new_quizzes_for_course if new_quizzes else count_quizzes_for_course,
+            CANVAS,
+            verbose,
+            write=write_course,
+            workers=workers,
+        )
     courses_with_quiz = process_result(RESULT_PATH, TERM_ID)
     print_messages(TOTAL, courses_with_quiz)
@@ -1,7 +1,9 @@
 from typer import echo
 
 from .api import Instance, get_account, get_main_account_id, validate_instance_name
+from .pagination import iterate_pages
 from .style import color
+from .terms import find_enrollment_term
 
 
 def is_grad_course(course_number, graduate_course_minimum_number):
@@ -48,17 +50,12 @@ def count_sites_main(
 ):
     instance = validate_instance_name(instance_name)
     account = get_account(get_main_account_id(instance))
-    term = next(
-        (
-            term.id
-            for term in account.get_enrollment_terms()
-            if year_and_term in term.name
-        ),
-        None,
-    )
+    enrollment_term = find_enrollment_term(year_and_term, instance)
+    term = enrollment_term.id if enrollment_term else None
     echo(f') Finding course codes for term "{color(year_and_term, "blue")}"...')
     sis_course_ids = [
-        course.sis_course_id for course in account.get_courses(enrollment_term_id=term)
+        course.sis_course_id
+        for course in iterate_pages(account.get_courses(enrollment_term_id=term))
     ]
     sis_course_ids = get_main_sections(sis_course_ids, year_and_term)
     if separate:
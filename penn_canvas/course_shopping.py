@@ -1,18 +1,19 @@
-from csv import writer
 from pathlib import Path
 
 from pandas import concat, read_csv, read_excel
 from pandas.core.frame import DataFrame
 from typer import Exit, echo
 
-from .api import Instance, get_canvas, get_course, get_sub_account_ids
+from .accounts import get_sub_account_ids
+from .api import Instance, get_canvas, get_course
 from .helpers import (
     TODAY,
     YEAR,
+    ResultWriter,
     color,
+    create_directories,
     find_input,
     get_command_paths,
-    get_processed,
     get_start_index,
     make_csv_paths,
     make_index_headers,
@@ -20,6 +21,7 @@ from .helpers import (
     process_input,
     toggle_progress_bar,
 )
+from .ledger import ProcessedLedger
 from .style import print_item
 
 COMMAND = "Course Shopping"
@@ -66,10 +68,10 @@ def cleanup_data(data, args):
     data.drop_duplicates(subset=["canvas_course_id"], inplace=True)
     data.dropna(subset=["course_id"], inplace=True)
     data = data.astype("string", copy=False, errors="ignore")
-    data = data[~data["canvas_course_id"].isin(processed_courses)]
+    data = data[~data["canvas_course_id"].isin(list(processed_courses))]
     already_processed_count = len(processed_courses)
     if new:
-        data = data[~data["canvas_course_id"].isin(processed_errors)]
+        data = data[~data["canvas_course_id"].isin(list(processed_errors))]
         already_processed_count = already_processed_count + len(processed_errors)
     if already_processed_count:
         message = color(
@@ -251,7 +253,7 @@ def course_shopping_main(test, disable, force, verbose, new):
             canvas_account_id,
             status,
         ]
-        report.loc[index].to_frame().T.to_csv(RESULT_PATH, mode="a", header=False)
+        RESULT_WRITER.write_report_row(report, index)
         if verbose:
             green_status = color(status.upper(), "green")
             yellow_status = color(status, "yellow")
@@ -268,20 +270,13 @@ def course_shopping_main(test, disable, force, verbose, new):
             "enabled",
             "grad course",
         }:
-            if canvas_course_id in PROCESSED_ERRORS:
-                processed_errors_csv = read_csv(PROCESSED_ERRORS_PATH)
-                processed_errors_csv = processed_errors_csv[
-                    processed_errors_csv["canvas course id"] != canvas_course_id
-                ]
-                processed_errors_csv.to_csv(PROCESSED_ERRORS_PATH, index=False)
-            with open(PROCESSED_PATH, "a+", newline="") as processed_file:
-                writer(processed_file).writerow([canvas_course_id, status])
+            PROCESSED_ERRORS.remove(canvas_course_id)
+            PROCESSED_COURSES.add([canvas_course_id, status])
         elif canvas_course_id not in PROCESSED_ERRORS:
-            with open(PROCESSED_ERRORS_PATH, "a+", newline="") as processed_file:
-                writer(processed_file).writerow([canvas_course_id, status])
+            PROCESSED_ERRORS.add([canvas_course_id, status])
 
-    def disable_course_shopping(processed_path, result_path, canvas, verbose):
-        processed = read_csv(processed_path)
+    def disable_course_shopping(processed_courses, result_path, canvas, verbose):
+        processed = DataFrame(processed_courses.get_rows(), columns=PROCESSED_HEADERS)
         processed = processed[processed["status"] == "enabled"]
         processed.reset_index(drop=True, inplace=True)
         if processed.empty:
@@ -312,9 +307,7 @@ def course_shopping_main(test, disable, force, verbose, new):
                 status = "failed to disable"
             with open(result_path, "a") as writer:
                 writer.write(f"{index},{canvas_course_id},{status}\n")
-            processed = read_csv(processed_path)
-            processed = processed[processed["canvas course id"] != canvas_course_id]
-            processed.to_csv(processed_path, index=False)
+            processed_courses.remove(canvas_course_id)
             if verbose:
                 green_status = color(status.upper(), "green")
                 yellow_status = color(status, "yellow")
@@ -328,6 +321,7 @@ def course_shopping_main(test, disable, force, verbose, new):
         result.sort_values("status", ascending=False, inplace=True)
         result.to_csv(result_path, index=False)
 
+    create_directories(*PATHS.values())
     PROCESSED_PATH = (
         PROCESSED
         / f"{YEAR}_course_shopping_processed_courses{'_test' if test else ''}.csv"
@@ -336,8 +330,8 @@ def course_shopping_main(test, disable, force, verbose, new):
         PROCESSED
         / f"{YEAR}_course_shopping_processed_errors{'_test' if test else ''}.csv"
     )
-    PROCESSED_COURSES = get_processed(PROCESSED_PATH, PROCESSED_HEADERS)
-    PROCESSED_ERRORS = get_processed(PROCESSED_ERRORS_PATH, PROCESSED_HEADERS)
+    PROCESSED_COURSES = ProcessedLedger(PROCESSED_PATH, PROCESSED_HEADERS)
+    PROCESSED_ERRORS = ProcessedLedger(PROCESSED_ERRORS_PATH, PROCESSED_HEADERS)
     TOTAL = ""
     report = DataFrame()
     result_path_string = (
@@ -402,8 +396,14 @@ def course_shopping_main(test, disable, force, verbose, new):
     )
     echo(") Processing courses...")
     if disable:
-        disable_course_shopping(PROCESSED_PATH, RESULT_PATH, CANVAS, verbose)
+        disable_course_shopping(PROCESSED_COURSES, RESULT_PATH, CANVAS, verbose)
+        PROCESSED_COURSES.close()
     else:
-        toggle_progress_bar(report, enable_course_shopping, CANVAS, verbose)
+        with ResultWriter(
+            RESULT_PATH, ledgers=[PROCESSED_COURSES, PROCESSED_ERRORS]
+        ) as RESULT_WRITER:
+            toggle_progress_bar(report, enable_course_shopping, CANVAS, verbose)
+        PROCESSED_COURSES.close()
+        PROCESSED_ERRORS.close()
         process_result(RESULT_PATH, PROCESSED_PATH)
         print_messages(TOTAL)
@@ -0,0 +1,230 @@
+from contextlib import contextmanager
+from functools import lru_cache
+from itertools import islice
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Iterator, Optional
+
+from .config import get_penn_canvas_config
+
+if TYPE_CHECKING:
+    from cx_Oracle import SessionPool
+
+ORACLE_LIB_DIRECTORY = Path.home() / "Downloads/instantclient_19_8"
+ORACLE_CONFIG_DIRECTORY = ORACLE_LIB_DIRECTORY / "network/admin"
+POOL_MINIMUM = 1
+POOL_MAXIMUM = 8
+POOL_INCREMENT = 1
+CALL_TIMEOUT = 10000
+BATCH_SIZE = 500
+LIKE_BATCH_SIZE = 100
+
+
+@lru_cache
+def get_data_warehouse_pool() -> "SessionPool":
+    from cx_Oracle import SPOOL_ATTRVAL_WAIT, SessionPool, init_oracle_client
+
+    init_oracle_client(
+        lib_dir=str(ORACLE_LIB_DIRECTORY),
+        config_dir=str(ORACLE_CONFIG_DIRECTORY),
+    )
+    user, password, dsn = get_penn_canvas_config("data_warehouse")
+    return SessionPool(
+        user=user,
+        password=password,
+        dsn=dsn,
+        min=POOL_MINIMUM,
+        max=POOL_MAXIMUM,
+        increment=POOL_INCREMENT,
+        threaded=True,
+        getmode=SPOOL_ATTRVAL_WAIT,
+    )
+
+
+@contextmanager
+def get_data_warehouse_connection(connection: Optional[Any] = None) -> Iterator:
+    if connection is not None:
+        yield connection
+        return
+    pool = get_data_warehouse_pool()
+    connection = pool.acquire()
+    connection.callTimeout = CALL_TIMEOUT
+    try:
+        yield connection
+    finally:
+        pool.release(connection)
+
+
+def get_batches(values: Iterable, batch_size: int) -> Iterator[list]:
+    values = iter(dict.fromkeys(value for value in values if value))
+    while batch := list(islice(values, batch_size)):
+        yield batch
+
+
+def get_bind_variables(values: list) -> tuple[list[str], dict[str, Any]]:
+    names = [f"v{index}" for index in range(len(values))]
+    return [f":{name}" for name in names], dict(zip(names, values))
+
+
+def format_in_condition(column: str, bind_names: list[str]) -> str:
+    return f"{column} IN ({', '.join(bind_names)})"
+
+
+def format_like_condition(column: str, bind_names: list[str]) -> str:
+    return " OR ".join(f"{column} LIKE {bind_name}" for bind_name in bind_names)
+
+
+def query_in_batches(
+    query: str,
+    column: str,
+    values: Iterable,
+    connection: Optional[Any] = None,
+    format_condition: Callable[[str, list[str]], str] = format_in_condition,
+    batch_size=BATCH_SIZE,
+) -> Iterator[tuple]:
+    with get_data_warehouse_connection(connection) as connection:
+        cursor = connection.cursor()
+        for batch in get_batches(values, batch_size):
+            bind_names, bind_variables = get_bind_variables(batch)
+            condition = format_condition(column, bind_names)
+            cursor.execute(query.format(condition=condition), bind_variables)
+            yield from cursor.fetchall()
+
+
+def group_rows(rows: Iterable[tuple]) -> dict[Any, list[tuple]]:
+    grouped_rows: dict[Any, list[tuple]] = dict()
+    for key, *values in rows:
+        grouped_rows.setdefault(key, list()).append(tuple(values))
+    return grouped_rows
+
+
+def get_penn_ids(
+    penn_keys: Iterable[str], connection: Optional[Any] = None
+) -> dict[str, str]:
+    penn_keys = list(penn_keys)
+    with get_data_warehouse_connection(connection) as connection:
+        penn_ids = dict(
+            query_in_batches(
+                "SELECT pennkey, penn_id FROM person_all_v WHERE {condition}",
+                "pennkey",
+                penn_keys,
+                connection,
+            )
+        )
+        missing_penn_keys = [
+            penn_key for penn_key in penn_keys if penn_key not in penn_ids
+        ]
+        penn_ids.update(
+            query_in_batches(
+                "SELECT pennkey, penn_id FROM employee_general WHERE {condition}",
+                "pennkey",
+                missing_penn_keys,
+                connection,
+            )
+        )
+    return penn_ids
+
+
+def get_emails_by_penn_key(
+    penn_keys: Iterable[str], table: str, connection: Optional[Any] = None
+) -> dict[str, list[str]]:
+    rows = query_in_batches(
+        f"SELECT pennkey, email_address FROM {table} WHERE {{condition}}",
+        "pennkey",
+        penn_keys,
+        connection,
+    )
+    return {
+        penn_key: [email for email, in emails]
+        for penn_key, emails in group_rows(rows).items()
+    }
+
+
+def get_existing_penn_keys(
+    penn_keys: Iterable[str], connection: Optional[Any] = None
+) -> set[str]:
+    rows = query_in_batches(
+        "SELECT pennkey FROM dwadmin.person_all_v WHERE {condition}",
+        "pennkey",
+        penn_keys,
+        connection,
+    )
+    return {penn_key for penn_key, in rows}
+
+
+def get_people_by_email(
+    emails: Iterable[str], connection: Optional[Any] = None
+) -> dict[str, list[tuple]]:
+    emails = list(dict.fromkeys(emails))
+    rows = query_in_batches(
+        """
+        SELECT
+            person.email_address,
+            person.first_name,
+            person.last_name,
+            person.email_address,
+            degree.last_degree_term,
+            person.pennkey
+        FROM dwadmin.person_all_v person
+        JOIN dwadmin.degree_pursual_all_v degree
+        ON degree.penn_id = person.penn_id
+        WHERE {condition}
+        """,
+        "person.email_address",
+        (f"%{email}%" for email in emails),
+        connection,
+        format_like_condition,
+        LIKE_BATCH_SIZE,
+    )
+    people: dict[str, list[tuple]] = dict()
+    for email_address, *person in rows:
+        for email in emails:
+            if email in (email_address or ""):
+                people.setdefault(email, list()).append(tuple(person))
+    return people
+
+
+def get_people_by_penn_key(
+    penn_keys: Iterable[str], connection: Optional[Any] = None
+) -> dict[str, list[tuple]]:
+    rows = query_in_batches(
+        """
+        SELECT
+            person.pennkey,
+            person.first_name,
+            person.last_name,
+            person.email_address,
+            degree.last_degree_term
+        FROM dwadmin.person_all_v person
+        JOIN dwadmin.degree_pursual_all_v degree
+        ON degree.penn_id = person.penn_id
+        WHERE {condition}
+        """,
+        "person.pennkey",
+        penn_keys,
+        connection,
+    )
+    return group_rows(rows)
+
+
+def get_employees_by_penn_key(
+    penn_keys: Iterable[str], connection: Optional[Any] = None
+) -> dict[str, list[tuple]]:
+    rows = query_in_batches(
+        """
+        SELECT
+            person.pennkey,
+            person.first_name,
+            person.last_name,
+            job.personnel_class,
+            person.email_address,
+            person.currently_employed
+        FROM dwadmin.employee_general_v person
+        JOIN dwadmin.job_class job
+        ON job.job_class = person.pri_acad_appt_job_class
+        WHERE {condition}
+        """,
+        "person.pennkey",
+        penn_keys,
+        connection,
+    )
+    return group_rows(rows)
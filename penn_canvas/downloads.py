@@ -0,0 +1,203 @@
+from dataclasses import dataclass
+from os import remove
+from pathlib import Path
+from time import sleep
+from typing import Iterable, Iterator, Optional
+
+from loguru import logger
+from requests import RequestException, Response, Session, get
+from requests.adapters import HTTPAdapter
+
+from .helpers import create_directory, map_rows
+
+CHUNK_SIZE = 1024 * 1024
+DOWNLOAD_RETRIES = 3
+DOWNLOAD_RETRY_DELAY = 1.0
+DOWNLOAD_TIMEOUT = 60
+DOWNLOAD_WORKERS = 8
+PARTIAL_SUFFIX = ".part"
+VALIDATOR_SUFFIX = ".validator"
+RANGE_NOT_SATISFIABLE = 416
+
+
+class DownloadError(Exception):
+    pass
+
+
+@dataclass
+class Download:
+    path: Path
+    head: bytes = b""
+
+
+def get_partial_path(path: Path) -> Path:
+    return path.with_name(f"{path.name}{PARTIAL_SUFFIX}")
+
+
+def get_validator_path(partial_path: Path) -> Path:
+    return partial_path.with_name(f"{partial_path.name}{VALIDATOR_SUFFIX}")
+
+
+def read_validator(partial_path: Path) -> Optional[str]:
+    validator_path = get_validator_path(partial_path)
+    if not partial_path.is_file() or not validator_path.is_file():
+        return None
+    return validator_path.read_text().strip() or None
+
+
+def write_validator(partial_path: Path, validator: Optional[str]):
+    validator_path = get_validator_path(partial_path)
+    if validator:
+        validator_path.write_text(validator)
+    elif validator_path.is_file():
+        remove(validator_path)
+
+
+def remove_partial(partial_path: Path):
+    for path in (partial_path, get_validator_path(partial_path)):
+        if path.is_file():
+            remove(path)
+
+
+def get_partial_size(partial_path: Path) -> int:
+    return partial_path.stat().st_size if partial_path.is_file() else 0
+
+
+def get_validator(response: Response) -> Optional[str]:
+    return response.headers.get("ETag") or response.headers.get("Last-Modified")
+
+
+def get_expected_size(response: Response, offset: int) -> Optional[int]:
+    content_length = response.headers.get("Content-Length")
+    if content_length is None or response.headers.get("Content-Encoding"):
+        return None
+    return offset + int(content_length)
+
+
+def get_error_status(error: Exception) -> Optional[int]:
+    response = getattr(error, "response", None)
+    return response.status_code if response is not None else None
+
+
+def is_client_error(error: Exception) -> bool:
+    status = get_error_status(error)
+    return status is not None and 400 <= status < 500
+
+
+def read_head(partial_path: Path, head_size: int) -> bytes:
+    if not head_size or not partial_path.is_file():
+        return b""
+    with open(partial_path, "rb") as stream:
+        return stream.read(head_size)
+
+
+def fetch_file(
+    path: Path,
+    url: str,
+    headers: Optional[dict] = None,
+    chunk_size=CHUNK_SIZE,
+    retries=DOWNLOAD_RETRIES,
+    session: Optional[Session] = None,
+    head_size=0,
+) -> Optional[Download]:
+    create_directory(path.parent)
+    partial_path = get_partial_path(path)
+    validator = read_validator(partial_path)
+    if not validator:
+        remove_partial(partial_path)
+    request = session.get if session else get
+    for attempt in range(retries + 1):
+        offset = get_partial_size(partial_path)
+        request_headers = dict(headers or dict())
+        if offset:
+            request_headers["Range"] = f"bytes={offset}-"
+            if validator:
+                request_headers["If-Range"] = validator
+        try:
+            with request(
+                url, headers=request_headers, stream=True, timeout=DOWNLOAD_TIMEOUT
+            ) as response:
+                response.raise_for_status()
+                if response.status_code != 206:
+                    offset = 0
+                    validator = get_validator(response)
+                    write_validator(partial_path, validator)
+                expected_size = get_expected_size(response, offset)
+                head = bytearray(read_head(partial_path, head_size) if offset else b"")
+                with open(partial_path, "ab" if offset else "wb") as stream:
+                    for chunk in response.iter_content(chunk_size=chunk_size):
+                        if len(head) < head_size:
+                            head += chunk[: head_size - len(head)]
+                        stream.write(chunk)
+            size = get_partial_size(partial_path)
+            if expected_size is not None and size != expected_size:
+                if size > expected_size:
+                    remove_partial(partial_path)
+                raise DownloadError(
+                    f"Received {size:,} of {expected_size:,} bytes for {path.name}"
+                )
+            write_validator(partial_path, None)
+            return Download(partial_path.replace(path), bytes(head))
+        except (RequestException, DownloadError) as error:
+            logger.warning(f"Download attempt {attempt + 1} failed: {error}")
+            range_error = get_error_status(error) == RANGE_NOT_SATISFIABLE
+            if range_error:
+                remove_partial(partial_path)
+                validator = None
+            client_error = is_client_error(error) and not range_error
+            if client_error or attempt == retries:
+                logger.error(f"Failed to download {path.name}: {error}")
+                if client_error or not validator:
+                    remove_partial(partial_path)
+                return None
+            sleep(DOWNLOAD_RETRY_DELAY * 2**attempt)
+    return None
+
+
+def download_file(
+    path: Path,
+    url: str,
+    headers: Optional[dict] = None,
+    chunk_size=CHUNK_SIZE,
+    retries=DOWNLOAD_RETRIES,
+    session: Optional[Session] = None,
+) -> Optional[Path]:
+    download = fetch_file(path, url, headers, chunk_size, retries, session)
+    return download.path if download else None
+
+
+def create_download_session(workers=DOWNLOAD_WORKERS) -> Session:
+    session = Session()
+    adapter = HTTPAdapter(pool_connections=workers, pool_maxsize=workers)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def fetch_files(
+    downloads: Iterable[tuple[Path, str]],
+    headers: Optional[dict] = None,
+    workers=DOWNLOAD_WORKERS,
+    head_size=0,
+) -> Iterator[Optional[Download]]:
+    with create_download_session(workers) as session:
+        yield from map_rows(
+            downloads,
+            lambda download: fetch_file(
+                download[0],
+                download[1],
+                headers,
+                session=session,
+                head_size=head_size,
+            ),
+            workers,
+        )
+
+
+def download_files(
+    downloads: Iterable[tuple[Path, str]],
+    headers: Optional[dict] = None,
+    workers=DOWNLOAD_WORKERS,
+) -> Iterator[Optional[Path]]:
+    for download in fetch_files(downloads, headers, workers):
+        yield download.path if download else None
@@ -1,47 +1,46 @@
-from csv import writer
+from functools import partial
 from os import remove
 from pathlib import Path
-from signal import SIGALRM, alarm, signal
+from typing import Optional
 
 from canvasapi.communication_channel import CommunicationChannel
+from canvasapi.exceptions import ResourceDoesNotExist
 from canvasapi.user import User
 from loguru import logger
 from pandas import concat, read_csv
 from pandas.core.frame import DataFrame
-from typer import Exit, echo, progressbar
+from typer import Exit, echo
 
-from penn_canvas.report import Report, ReportType, flatten, get_single_report
+from penn_canvas.report import Report, ReportType, get_single_report, read_report
 from penn_canvas.style import print_item
 
-from .api import (
-    Instance,
-    format_instance_name,
-    get_data_warehouse_cursor,
-    get_sub_account_ids,
-    get_user,
-    validate_instance_name,
-)
+from .accounts import get_account_descendants
+from .api import Instance, format_instance_name, validate_instance_name
+from .data_warehouse import get_data_warehouse_connection, get_emails_by_penn_key
 from .helpers import (
     BASE_PATH,
     YEAR,
+    ResultWriter,
     add_headers_to_empty_files,
     color,
     confirm_global_protect_enabled,
+    create_directories,
     create_directory,
     drop_duplicate_errors,
     dynamic_to_csv,
-    get_processed,
     get_start_index,
-    handle_clear_processed,
     make_csv_paths,
     make_index_headers,
     print_skip_message,
+    process_rows,
     switch_logger_file,
 )
+from .ledger import ProcessedLedger, clear_processed_ledgers
+from .users import get_user_resolver
 
-COMMAND_PATH = create_directory(BASE_PATH / "Email")
-LOGS = create_directory(COMMAND_PATH / "Logs")
-PROCESSED = create_directory(COMMAND_PATH / ".processed")
+COMMAND_PATH = BASE_PATH / "Email"
+LOGS = COMMAND_PATH / "Logs"
+PROCESSED = COMMAND_PATH / ".processed"
 RESULT_BASE = "email_result"
 HEADERS = [
     "canvas user id",
@@ -53,6 +52,8 @@ HEADERS = [
 ]
 LOG_HEADERS = HEADERS[:3]
 LOG_HEADERS.extend(["email address"])
+REPORT_COLUMNS = [header.replace(" ", "_") for header in HEADERS[:3]]
+REPORT_DTYPES = {"canvas_user_id": int, "login_id": "string", "full_name": "string"}
 ACCOUNT_IDS = [
     99243,
     99237,
@@ -75,26 +76,27 @@ PRINT_COLOR_MAPS = {
     "not found": "red",
     "error": "red",
 }
+DATA_WAREHOUSE_TABLES = ["employee_general", "person_all_v"]
 
 
 def process_report(
     report_path: Path,
     start: int,
-    processed_users: list[str],
-    processed_errors: list[str],
+    processed_users: ProcessedLedger,
+    processed_errors: ProcessedLedger,
     new: bool,
 ) -> tuple[DataFrame, int]:
-    report = read_csv(report_path)
-    report = report.loc[:, [header.replace(" ", "_") for header in HEADERS[:3]]]
+    report = read_report(report_path, usecols=REPORT_COLUMNS, dtype=REPORT_DTYPES)
+    report = report.loc[:, REPORT_COLUMNS]
     report.drop_duplicates(subset=["canvas_user_id"], inplace=True)
     report.sort_values(
         "canvas_user_id", ascending=False, inplace=True, ignore_index=True
     )
-    report = report.astype("string", copy=False, errors="ignore")
-    report = report[~report["canvas_user_id"].isin(processed_users)]
+    report = report.astype({"canvas_user_id": "string"})
+    report = report[~report["canvas_user_id"].isin(list(processed_users))]
     already_processed_count = len(processed_users)
     if new:
-        report = report[~report["canvas_user_id"].isin(processed_errors)]
+        report = report[~report["canvas_user_id"].isin(list(processed_errors))]
         report.reset_index(drop=True, inplace=True)
         already_processed_count = already_processed_count + len(processed_errors)
     if already_processed_count:
@@ -104,6 +106,14 @@ def process_report(
     return report, total
 
 
+def load_report_users(report: DataFrame, instance: Instance):
+    get_user_resolver(instance).add_users(
+        {"id": int(canvas_user_id), "login_id": login_id, "name": full_name}
+        for _, canvas_user_id, login_id, full_name in report.itertuples()
+        if str(canvas_user_id).isdigit()
+    )
+
+
 def get_user_emails(user: User) -> list[CommunicationChannel]:
     return [
         channel
@@ -123,12 +133,15 @@ def is_already_active(
     canvas_user = None
     emails = None
     try:
-        canvas_user = get_user(user_id, instance=instance)
+        canvas_user = get_user_resolver(instance).get(user_id)
     except Exception as error:
         logger.error(f"user {user_id} not found: {error}")
         return "user not found", canvas_user, emails
     try:
         emails = get_user_emails(canvas_user)
+    except ResourceDoesNotExist as error:
+        logger.error(f"user {user_id} not found: {error}")
+        return "user not found", None, emails
     except Exception as error:
         logger.error(f"failed to get user {user_id} emails: {error}")
         return "error", canvas_user, emails
@@ -147,7 +160,7 @@ def is_already_active(
 
 
 def check_schools(
-    canvas_user: User, sub_accounts: list[int]
+    canvas_user: User, sub_accounts: frozenset[str]
 ) -> tuple[bool, int | None]:
     account_ids = list(canvas_user.get_courses())
     fixable_id = next(
@@ -240,9 +253,7 @@ def process_result(result_path: Path, new: bool, instance: Instance):
         if data_frame is not unsupported_errors:
             columns.append("subaccount")
         data_frame.drop(["index", "supported", "subaccount"], axis=1, inplace=True)
-    BASE = COMMAND_PATH / f"{YEAR}"
-    if not BASE.exists():
-        Path.mkdir(BASE)
+    BASE = create_directory(COMMAND_PATH / f"{YEAR}")
     (
         activated_path,
         supported_errors_path,
@@ -345,49 +356,41 @@ def print_messages(
     color("FINISHED", "yellow", True)
 
 
+def get_data_warehouse_emails(report: DataFrame) -> dict[str, dict[str, list[str]]]:
+    login_ids = report["login_id"].dropna().tolist()
+    try:
+        with get_data_warehouse_connection() as connection:
+            return {
+                table: get_emails_by_penn_key(login_ids, table, connection)
+                for table in DATA_WAREHOUSE_TABLES
+            }
+    except Exception as error:
+        logger.error(f"Failed to query the Data Warehouse: {error}")
+        return {table: dict() for table in DATA_WAREHOUSE_TABLES}
+
+
 def query_data_warehouse(
     login_id: str,
     canvas_user_id: str,
     full_name: str,
     canvas_user: User,
-    table: str,
+    emails: list[str],
 ) -> str | None:
-    def signal_handler(signum, frame):
-        raise Exception(f'Signal "{signum}" at frame "{frame}"')
-
-    signal(SIGALRM, signal_handler)
-    alarm(10)
-    try:
-        cursor = get_data_warehouse_cursor()
-        cursor.execute(
-            f"SELECT penn_id, email_address FROM {table} WHERE pennkey = :pennkey",
-            pennkey=login_id,
-        )
-        for _, email in cursor:
-            if email:
-                return activate_user_email(
-                    canvas_user_id, login_id, full_name, canvas_user, [email.strip()]
-                )
-    except Exception as error:
-        logger.error(error)
-    alarm(0)
+    for email in emails:
+        if email:
+            return activate_user_email(
+                canvas_user_id, login_id, full_name, canvas_user, [email.strip()]
+            )
     return None
 
 
 def check_and_activate_emails(
-    report: DataFrame,
-    total: int,
     user: tuple,
-    sub_accounts: list[int],
-    use_data_warehouse: bool,
-    result_path: Path,
-    processed_path: Path,
-    processed_errors: list[str],
-    processed_errors_path: Path,
+    sub_accounts: frozenset[str],
+    data_warehouse_emails: Optional[dict[str, dict[str, list[str]]]],
     instance: Instance,
-    verbose: bool,
-):
-    index, canvas_user_id, login_id, full_name = user
+) -> tuple[tuple, str, str | None, int | None]:
+    _, canvas_user_id, login_id, full_name = user
     account = supported = None
     status, canvas_user, emails = is_already_active(user, instance)
     if not canvas_user:
@@ -396,37 +399,44 @@ def check_and_activate_emails(
         is_supported, account = check_schools(canvas_user, sub_accounts)
         if is_supported:
             supported = "Y"
-            canvas_user_id = user[1]
             if emails and status == "unconfirmed":
                 status = activate_user_email(
                     canvas_user_id, login_id, full_name, canvas_user, emails
                 )
-            elif use_data_warehouse:
-                query_status = query_data_warehouse(
-                    login_id,
-                    canvas_user_id,
-                    full_name,
-                    canvas_user,
-                    "employee_general",
-                )
-                status = query_status if query_status else status
-                if not status == "activated":
+            elif data_warehouse_emails is not None:
+                for table in DATA_WAREHOUSE_TABLES:
                     query_status = query_data_warehouse(
                         login_id,
                         canvas_user_id,
                         full_name,
                         canvas_user,
-                        "person_all_v",
+                        data_warehouse_emails[table].get(login_id, list()),
                     )
                     status = query_status if query_status else status
+                    if status == "activated":
+                        break
         else:
             supported = "N"
+    return user, status, supported, account
+
+
+def write_email_result(
+    report: DataFrame,
+    total: int,
+    result: tuple[tuple, str, str | None, int | None],
+    result_writer: ResultWriter,
+    processed_users: ProcessedLedger,
+    processed_errors: ProcessedLedger,
+    verbose: bool,
+):
+    user, status, supported, account = result
+    index, canvas_user_id, login_id, full_name = user
     report.at[index, ["email status", "supported", "subaccount"]] = [
         status,
         supported,
         str(account),
     ]
-    report.loc[index].to_frame().T.to_csv(result_path, mode="a", header=False)
+    result_writer.write_report_row(report, index)
     if verbose:
         status_color = PRINT_COLOR_MAPS.get(status, "magenta")
         status_display = color(
@@ -439,22 +449,12 @@ def check_and_activate_emails(
             unsupported_display = color(" (UNSUPPORTED)", "yellow")
         message = f"{user_display}: {status_display}{unsupported_display}"
         print_item(index, total, message)
+    row = [canvas_user_id, login_id, full_name, status, supported]
     if status in {"activated", "already active"} or supported == "N":
-        if canvas_user_id in processed_errors:
-            processed_errors_csv = read_csv(processed_errors_path)
-            processed_errors_csv = processed_errors_csv[
-                processed_errors_csv["canvas user id"] != canvas_user_id
-            ]
-            processed_errors_csv.to_csv(processed_errors_path, index=False)
-        with open(processed_path, "a+", newline="") as processed_file:
-            writer(processed_file).writerow(
-                [canvas_user_id, login_id, full_name, status, supported]
-            )
+        processed_errors.remove(canvas_user_id)
+        processed_users.add(row)
     elif canvas_user_id not in processed_errors:
-        with open(processed_errors_path, "a+", newline="") as processed_file:
-            writer(processed_file).writerow(
-                [canvas_user_id, login_id, full_name, status, supported]
-            )
+        processed_errors.add(row)
 
 
 def email_main(
@@ -466,11 +466,13 @@ def email_main(
     use_data_warehouse: bool,
     prompt: bool,
     verbose: bool,
+    workers: int = 1,
 ):
     if prompt and use_data_warehouse and not confirm_global_protect_enabled():
         raise Exit()
     instance = validate_instance_name(instance_name, verbose=not verbose)
     switch_logger_file(LOGS, "email", instance.name)
+    create_directories(COMMAND_PATH, PROCESSED)
     instance_display = format_instance_name(instance)
     result_path = COMMAND_PATH / f"{YEAR}_{RESULT_BASE}{instance_display}.csv"
     processed_path = PROCESSED / f"{YEAR}_email_processed_users{instance_display}.csv"
@@ -479,49 +481,49 @@ def email_main(
     )
     report_object = Report(ReportType.USERS, instance=instance, force=force_report)
     report_path = get_single_report(report_object, verbose=verbose)
-    handle_clear_processed(clear_processed, [processed_path, processed_errors_path])
-    processed_users = get_processed(processed_path, HEADERS)
-    processed_errors = get_processed(processed_errors_path, HEADERS)
+    processed_users = ProcessedLedger(processed_path, HEADERS)
+    processed_errors = ProcessedLedger(processed_errors_path, HEADERS)
+    clear_processed_ledgers(clear_processed, [processed_users, processed_errors])
     start = get_start_index(force, result_path)
     print_skip_message(start, "user", current_report=True)
     report, total = process_report(
         report_path, start, processed_users, processed_errors, new
     )
     make_csv_paths(result_path, make_index_headers(HEADERS))
-    sub_account_lists = [get_sub_account_ids(account_id) for account_id in ACCOUNT_IDS]
-    sub_accounts = flatten(sub_account_lists)
+    load_report_users(report, instance)
+    data_warehouse_emails = (
+        get_data_warehouse_emails(report) if use_data_warehouse else None
+    )
+    sub_accounts = frozenset().union(
+        *(get_account_descendants(account_id) for account_id in ACCOUNT_IDS)
+    )
     echo(") Processing users...")
-    if verbose:
-        for user in report.itertuples():
-            check_and_activate_emails(
+    with ResultWriter(
+        result_path, ledgers=[processed_users, processed_errors]
+    ) as result_writer:
+        process_rows(
+            report.itertuples(),
+            partial(
+                check_and_activate_emails,
+                sub_accounts=sub_accounts,
+                data_warehouse_emails=data_warehouse_emails,
+                instance=instance,
+            ),
+            partial(
+                write_email_result,
                 report,
                 total,
-                user,
-                sub_accounts,
-                use_data_warehouse,
-                result_path,
-                processed_path,
-                processed_errors,
-                processed_errors_path,
-                instance,
-                verbose,
-            )
-    else:
-        with progressbar(report.itertuples(), length=total) as progress:
-            for user in progress:
-                check_and_activate_emails(
-                    report,
-                    total,
-                    user,
-                    sub_accounts,
-                    use_data_warehouse,
-                    result_path,
-                    processed_path,
-                    processed_errors,
-                    processed_errors_path,
-                    instance,
-                    verbose,
-                )
+                result_writer=result_writer,
+                processed_users=processed_users,
+                processed_errors=processed_errors,
+                verbose=verbose,
+            ),
+            verbose,
+            workers,
+            length=len(report.index),
+        )
+    processed_users.close()
+    processed_errors.close()
     (
         activated,
         already_active,
@@ -3,7 +3,11 @@ from pathlib import Path
 from pandas import concat, read_csv
 from pandas.core.frame import DataFrame
 
-from .api import get_data_warehouse_cursor
+from .data_warehouse import (
+    get_employees_by_penn_key,
+    get_people_by_email,
+    get_people_by_penn_key,
+)
 from .style import color, print_item
 
 POSITIONS = {
@@ -26,29 +30,24 @@ def find_users_by_email_main(emails_path):
         emails = read_csv(emails_path)["Email"].tolist()
     except Exception:
         emails = read_csv(emails_path)["email"].tolist()
+    people = get_people_by_email(emails)
+    penn_keys = {
+        email: people[email][-1][-1] if email in people else "" for email in emails
+    }
+    missing_penn_keys = {
+        email: next(iter(email.split("@")), "")
+        for email, penn_key in penn_keys.items()
+        if not penn_key
+    }
+    people_by_penn_key = get_people_by_penn_key(missing_penn_keys.values())
+    penn_keys.update(missing_penn_keys)
+    employees = get_employees_by_penn_key(penn_keys.values())
     rows = list()
     total = len(emails)
     for index, email in enumerate(emails):
         first = last = pos = dwemail = employed = last_degree = pennkey = ""
         last_degrees = list()
-        email_search = f"%{email}%"
-        cursor = get_data_warehouse_cursor()
-        cursor.execute(
-            """
-            SELECT
-                person.first_name,
-                person.last_name,
-                person.email_address,
-                degree.last_degree_term,
-                person.pennkey
-            FROM dwadmin.person_all_v person
-            JOIN dwadmin.degree_pursual_all_v degree
-            ON degree.penn_id = person.penn_id
-            WHERE person.email_address LIKE :email
-            """,
-            email=email_search,
-        )
-        for first_name, last_name, dw_email, deg, pkey in cursor:
+        for first_name, last_name, dw_email, deg, pkey in people.get(email, list()):
             try:
                 dw_email = dw_email.strip().lower()
             except Exception:
@@ -59,22 +58,10 @@ def find_users_by_email_main(emails_path):
             pennkey = pkey
             last_degrees.append(deg)
         if not pennkey:
-            pennkey = next(iter(email.split("@")), "")
-            cursor.execute(
-                """
-                SELECT
-                    person.first_name,
-                    person.last_name,
-                    person.email_address,
-                    degree.last_degree_term
-                FROM dwadmin.person_all_v person
-                JOIN dwadmin.degree_pursual_all_v degree
-                ON degree.penn_id = person.penn_id
-                WHERE person.pennkey = :pennkey
-                """,
-                pennkey=pennkey,
-            )
-            for first_name, last_name, dw_email, deg in cursor:
+            pennkey = penn_keys[email]
+            for first_name, last_name, dw_email, deg in people_by_penn_key.get(
+                pennkey, list()
+            ):
                 try:
                     dw_email = dw_email.strip().lower()
                 except Exception:
@@ -83,22 +70,9 @@ def find_users_by_email_main(emails_path):
                 last = last_name
                 dwemail = dw_email
                 last_degrees.append(deg)
-        cursor.execute(
-            """
-            SELECT
-                person.first_name,
-                person.last_name,
-                job.personnel_class,
-                person.email_address,
-                person.currently_employed
-            FROM dwadmin.employee_general_v person
-            JOIN dwadmin.job_class job
-            ON job.job_class = person.pri_acad_appt_job_class
-            WHERE person.pennkey = :pennkey
-            """,
-            pennkey=pennkey,
-        )
-        for first_name, last_name, position, dw_email, emp in cursor:
+        for first_name, last_name, position, dw_email, emp in employees.get(
+            pennkey, list()
+        ):
             try:
                 dw_email = dw_email.strip().lower()
             except Exception:
@@ -1,21 +1,30 @@
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from csv import writer
 from datetime import datetime, timedelta
 from enum import Enum
+from functools import lru_cache
+from io import StringIO
 from os import remove
 from pathlib import Path
 from shutil import copy, rmtree
-from typing import Iterable, Optional
+from threading import Lock
+from time import monotonic
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Iterator, Optional, TextIO
 from zipfile import ZipFile
 
 from loguru import logger
-from pandas import read_csv
-from pandas.core.frame import DataFrame
 from pytz import timezone, utc
-from requests import get
 from typer import Exit, Option, confirm, echo, progressbar
 
+from .constants import Instance
 from .style import color, pluralize
 
+if TYPE_CHECKING:
+    from pandas import DataFrame
+
+    from .ledger import ProcessedLedger
+
 COMMAND_DIRECTORY_BASE = Path.home() / "penn-canvas"
 BOX_PATH = Path.home() / "Library/CloudStorage/Box-Box"
 BOX_CLI_PATH = BOX_PATH / "Penn Canvas CLI"
@@ -35,45 +44,91 @@ FORCE_REPORT = Option(
 FORCE = Option(False, "--force", help="Overwrite existing results")
 VERBOSE = Option(False, "--verbose", help="Print verbose output to the console")
 COURSE_IDS = Option(None, "--course", help="Canvas course id")
+WORKERS = Option(
+    1, "--workers", min=1, help="The number of rows to process concurrently"
+)
+FLUSH_ROWS = 50
+FLUSH_SECONDS = 5.0
+CACHE = Option(
+    False,
+    "--cache/--no-cache",
+    envvar="PENN_CANVAS_CACHE",
+    help="Cache Canvas user, course, section and account lookups on disk",
+)
+REFRESH = Option(
+    False, "--refresh", help="Ignore cached Canvas lookups and fetch them again"
+)
+REPORTS_RETENTION_DAYS = 30
+CREATED_DIRECTORIES: set[Path] = set()
+CREATED_DIRECTORIES_LOCK = Lock()
+
+
+def get_instance_option(default=Instance.PRODUCTION):
+    return Option(default.value, "--instance", help="Canvas instance name")
+
+
+def forget_created_directories(directory: Path):
+    CREATED_DIRECTORIES.difference_update(
+        path
+        for path in list(CREATED_DIRECTORIES)
+        if path == directory or directory in path.parents
+    )
+
+
+def remove_directory(directory: Path, ignore_errors=False):
+    with CREATED_DIRECTORIES_LOCK:
+        try:
+            rmtree(directory, ignore_errors=ignore_errors)
+        finally:
+            forget_created_directories(directory)
 
 
 def create_directory(directory: Path, parents=True, clear=False) -> Path:
-    if clear and directory.is_dir():
-        rmtree(directory)
-    if not directory.exists():
-        Path.mkdir(directory, parents=parents)
+    with CREATED_DIRECTORIES_LOCK:
+        if clear and directory.is_dir():
+            rmtree(directory)
+            forget_created_directories(directory)
+        if directory not in CREATED_DIRECTORIES:
+            directory.mkdir(parents=parents, exist_ok=True)
+            CREATED_DIRECTORIES.add(directory)
     return directory
 
 
-def remove_old_reports_directories(reports_path: Path):
-    def is_old_reports_directory(path):
-        if not path.is_dir() or path.name == "Logs":
-            return False
-        try:
-            date = datetime.strptime(str(path).split("/")[-1], "%Y-%m-%d")
-            return (CURRENT_DATE - date).days > 30
-        except Exception:
-            return True
+def create_directories(*directories: Path):
+    for directory in directories:
+        create_directory(directory)
+
+
+def is_old_reports_directory(path: Path, days: int) -> bool:
+    if not path.is_dir() or path.name == "Logs":
+        return False
+    try:
+        date = datetime.strptime(path.name, "%Y-%m-%d")
+        return (CURRENT_DATE - date).days > days
+    except Exception:
+        return True
+
 
+def remove_old_reports_directories(
+    reports_path: Path, days=REPORTS_RETENTION_DAYS
+) -> list[Path]:
+    if not reports_path.is_dir():
+        return list()
     previous_paths = [
-        path for path in reports_path.iterdir() if is_old_reports_directory(path)
+        path for path in reports_path.iterdir() if is_old_reports_directory(path, days)
     ]
     for path in previous_paths:
-        rmtree(path)
+        remove_directory(path)
+    return previous_paths
 
 
 def get_reports_directory() -> Path:
-    base_path = BOX_CLI_PATH if BOX_PATH.exists() else COMMAND_DIRECTORY_BASE
-    return create_directory(base_path / "REPORTS")
+    return BASE_PATH / "REPORTS"
 
 
+@lru_cache
 def get_current_reports_directory() -> Path:
-    reports_path = get_reports_directory()
-    remove_old_reports_directories(reports_path)
-    return create_directory(reports_path / TODAY_AS_Y_M_D.replace("_", "-"))
-
-
-REPORTS = get_current_reports_directory()
+    return create_directory(get_reports_directory() / TODAY_AS_Y_M_D.replace("_", "-"))
 
 
 class Term(Enum):
@@ -171,8 +226,6 @@ def get_command_paths(
         paths["input"] = command_directory / "Input"
     if include_completed_directory:
         paths["completed"] = command_directory / "Completed"
-    for path in paths.values():
-        create_directory(path)
     return paths
 
 
@@ -189,6 +242,8 @@ def print_task_complete_message(result_path: Path, already_complete=False):
 
 
 def get_start_index(force: bool, result_path: Path) -> int:
+    from pandas import read_csv
+
     index = 0
     if force:
         if result_path.exists():
@@ -226,11 +281,7 @@ def print_skip_message(start: int, item: str, current_report=False):
     echo(f") {message}")
 
 
-def handle_clear_processed(
-    clear_processed: bool, processed_path: Path | list[Path], item_plural="users"
-):
-    if not isinstance(processed_path, list):
-        processed_path = [processed_path]
+def confirm_clear_processed(clear_processed: bool, item_plural="users") -> bool:
     if clear_processed:
         message = color(
             f"You have asked to clear the list of {item_plural} already processed."
@@ -243,11 +294,18 @@ def handle_clear_processed(
         proceed = False
     if proceed:
         echo(f") Clearing list of {item_plural} already processed...")
-        for path in processed_path:
-            if path.exists():
-                remove(path)
     else:
         echo(f") Finding {item_plural} already processed...")
+    return proceed
+
+
+def handle_clear_processed(
+    clear_processed: bool, processed_path: Path | list[Path], item_plural="users"
+):
+    if confirm_clear_processed(clear_processed, item_plural):
+        for path in make_list(processed_path):
+            if path.exists():
+                remove(path)
 
 
 def print_missing_input_and_exit(
@@ -350,6 +408,8 @@ def process_input(
     bulk_enroll=False,
     open_canvas=False,
 ):
+    from pandas import read_csv
+
     echo(f") Preparing {input_file_name}...")
     reports = iter(input_files)
     error = True
@@ -392,6 +452,8 @@ def process_input(
 
 
 def get_processed(processed_path, columns: str | list[str] = "pennkey") -> list[str]:
+    from pandas import read_csv
+
     if isinstance(columns, str):
         columns = [columns]
     if processed_path.is_file():
@@ -418,7 +480,7 @@ def get_course_ids_from_input(course_ids):
     return make_list(courses)
 
 
-def dynamic_to_csv(path: Path, data_frame: DataFrame, condition):
+def dynamic_to_csv(path: Path, data_frame: "DataFrame", condition):
     if not path.exists():
         mode = "w"
         header = True
@@ -429,6 +491,8 @@ def dynamic_to_csv(path: Path, data_frame: DataFrame, condition):
 
 
 def drop_duplicate_errors(paths: Path | list[Path]):
+    from pandas import read_csv
+
     paths = make_list(paths)
     for path in paths:
         data_frame = read_csv(path)
@@ -437,6 +501,8 @@ def drop_duplicate_errors(paths: Path | list[Path]):
 
 
 def add_headers_to_empty_files(paths: Path | list[Path], headers: str | list[str]):
+    from pandas import read_csv
+
     paths = make_list(paths)
     for path in paths:
         try:
@@ -475,35 +541,59 @@ def format_timedelta(timedelta: timedelta) -> str:
     return ", ".join([time for time in [days, hours, minutes, seconds] if time])
 
 
-def toggle_progress_bar(data, callback, canvas, verbose, args=None):
-    def verbose_mode():
-        for item in data.itertuples():
-            callback(item, canvas, verbose, args)
-
-    def progress_bar_mode():
-        with progressbar(data.itertuples(), length=len(data.index)) as progress:
-            for item in progress:
-                callback(item, canvas, verbose, args)
-
-    def verbose_mode_no_args():
-        for item in data.itertuples():
-            callback(item, canvas, verbose)
+def map_rows(rows: Iterable, callback: Callable, workers=1) -> Iterator:
+    if workers <= 1:
+        for row in rows:
+            yield callback(row)
+        return
+    executor = ThreadPoolExecutor(max_workers=workers)
+    pending: deque[Future] = deque()
+    try:
+        for row in rows:
+            pending.append(executor.submit(callback, row))
+            if len(pending) >= workers * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        executor.shutdown(cancel_futures=True)
+
+
+def process_rows(
+    rows: Iterable,
+    callback: Callable,
+    write: Callable[[Any], None],
+    verbose: bool,
+    workers=1,
+    length: Optional[int] = None,
+):
+    results = map_rows(rows, callback, workers)
+    if verbose:
+        for result in results:
+            write(result)
+    else:
+        with progressbar(results, length=length) as progress:
+            for result in progress:
+                write(result)
 
-    def progress_bar_mode_no_args():
-        with progressbar(data.itertuples(), length=len(data.index)) as progress:
-            for item in progress:
-                callback(item, canvas, verbose)
 
-    if not args:
-        if verbose:
-            verbose_mode_no_args()
-        else:
-            progress_bar_mode_no_args()
-    else:
-        if verbose:
-            verbose_mode()
+def toggle_progress_bar(
+    data, callback, canvas, verbose, args=None, write=None, workers=1
+):
+    def process_item(item):
+        if args:
+            return callback(item, canvas, verbose, args)
         else:
-            progress_bar_mode()
+            return callback(item, canvas, verbose)
+
+    process_rows(
+        data.itertuples(),
+        process_item,
+        write or (lambda result: None),
+        verbose,
+        workers,
+        length=len(data.index),
+    )
 
 
 def write_row(path: Path, row: list, mode="w"):
@@ -516,16 +606,86 @@ def write_file(path: Path, text: str, mode="w"):
         output.write(text)
 
 
-def download_file(path: Path, url: str, headers=None):
-    response = get(url, headers=headers, stream=True)
-    with open(path, "wb") as stream:
-        for chunk in response.iter_content(chunk_size=128):
-            stream.write(chunk)
+def format_csv_value(value: Any) -> Any:
+    from pandas import isna
+
+    try:
+        return "" if isna(value) else value
+    except (TypeError, ValueError):
+        return value
+
+
+class ResultWriter:
+    def __init__(
+        self,
+        path: Path,
+        flush_rows=FLUSH_ROWS,
+        flush_seconds=FLUSH_SECONDS,
+        ledgers: Iterable["ProcessedLedger"] = (),
+    ):
+        self.path = path
+        self.ledgers = list(ledgers)
+        self.flush_rows = flush_rows
+        self.flush_seconds = flush_seconds
+        self.buffer = StringIO()
+        self.writer = writer(self.buffer)
+        self.rows = 0
+        self.flushed_at = monotonic()
+        self.file: Optional[TextIO] = None
+
+    def __enter__(self) -> "ResultWriter":
+        create_directory(self.path.parent)
+        self.file = open(self.path, "a", newline="")
+        self.ledger_flush_rows = [ledger.flush_rows for ledger in self.ledgers]
+        for ledger in self.ledgers:
+            ledger.before_flush = self.write_results
+            ledger.flush_rows = max(ledger.flush_rows, self.flush_rows)
+        return self
+
+    def __exit__(self, *exception):
+        self.close()
+
+    def write(self, row: Iterable):
+        self.writer.writerow([format_csv_value(value) for value in row])
+        self.rows += 1
+        if (
+            self.rows >= self.flush_rows
+            or monotonic() - self.flushed_at >= self.flush_seconds
+        ):
+            self.flush()
+
+    def write_report_row(self, report: "DataFrame", index: Any):
+        self.write([index, *report.loc[index].tolist()])
+
+    def write_results(self):
+        if self.file and self.rows:
+            self.file.write(self.buffer.getvalue())
+            self.file.flush()
+            self.buffer.seek(0)
+            self.buffer.truncate()
+        self.rows = 0
+        self.flushed_at = monotonic()
+
+    def flush(self):
+        self.write_results()
+        for ledger in self.ledgers:
+            ledger.flush()
+
+    def close(self):
+        if not self.file:
+            return
+        self.flush()
+        self.file.close()
+        self.file = None
+        for ledger, flush_rows in zip(self.ledgers, self.ledger_flush_rows):
+            ledger.before_flush = None
+            ledger.flush_rows = flush_rows
 
 
 def switch_logger_file(
     log_path: Path, log_name: str, instance_name: Optional[str] = None
 ):
+    create_directory(log_path)
     instance_name = f"_{instance_name}.log" if instance_name else ""
     log = log_path / (log_name + "_{time}" + instance_name)
     logger.remove()
@@ -11,7 +11,13 @@ from typer import echo
 from penn_canvas.api import Instance
 
 from .api import get_course, validate_instance_name
-from .helpers import format_timedelta, format_timestamp, get_command_paths
+from .helpers import (
+    create_directories,
+    format_timedelta,
+    format_timestamp,
+    get_command_paths,
+)
+from .pagination import iterate_pages
 from .style import color, print_item
 
 COMMAND_NAME = "Integrity"
@@ -29,7 +35,7 @@ def get_ip_addresses(user: User, quiz_id: str, start: str, end: str) -> str:
         page_views_paginator = user.get_page_views()
     page_views = {
         page_view.remote_ip
-        for page_view in page_views_paginator
+        for page_view in iterate_pages(page_views_paginator)
         if is_quiz_page_view(page_view, quiz_id)
     }
     return ", ".join(page_views)
@@ -119,6 +125,7 @@ def integrity_main(
     end="",
 ):
     instance = validate_instance_name(instance_name)
+    create_directories(RESULTS)
     course = get_course(course_id, instance=instance)
     echo(f") Checking student activity in {color(course, 'blue', bold=True)}...")
     quizzes = [course.get_quiz(quiz) for quiz in quiz_ids]
@@ -0,0 +1,291 @@
+from csv import reader, writer
+from enum import Enum
+from json import dumps, loads
+from os import getenv, remove
+from pathlib import Path
+from sqlite3 import Connection, connect
+from typing import Callable, Iterable, Iterator, Optional, TextIO
+
+from .helpers import (
+    confirm_clear_processed,
+    create_directory,
+    make_csv_paths,
+    make_list,
+)
+
+
+class LedgerBackend(Enum):
+    CSV = "csv"
+    SQLITE = "sqlite"
+
+
+LEDGER_BACKEND = (
+    LedgerBackend.SQLITE
+    if getenv("PENN_CANVAS_LEDGER") == LedgerBackend.SQLITE.value
+    else LedgerBackend.CSV
+)
+COMPACT_THRESHOLD = 500
+LEDGER_FLUSH_ROWS = 50
+CSV_SIGNATURE = "csv_signature"
+
+
+class ProcessedLedger:
+    def __init__(
+        self,
+        path: Path,
+        columns: str | list[str] = "pennkey",
+        backend: LedgerBackend = LEDGER_BACKEND,
+        compact_threshold=COMPACT_THRESHOLD,
+        flush_rows: Optional[int] = None,
+    ):
+        self.path = path
+        self.columns = make_list(columns)
+        self.backend = backend
+        self.compact_threshold = compact_threshold
+        self.flush_rows = flush_rows or (
+            LEDGER_FLUSH_ROWS if backend == LedgerBackend.SQLITE else 1
+        )
+        self.pending = 0
+        self.position = 0
+        self.removed_path = path.with_name(f"{path.stem}_removed{path.suffix}")
+        self.database_path = path.with_suffix(".sqlite3")
+        self.rows: dict[str, list] = dict()
+        self.removed: set[str] = set()
+        self.unwritten_rows: list[list] = list()
+        self.unwritten_removed: list[str] = list()
+        self.file: Optional[TextIO] = None
+        self.removed_file: Optional[TextIO] = None
+        self.connection: Optional[Connection] = None
+        self.before_flush: Optional[Callable[[], None]] = None
+        self.load()
+
+    def __contains__(self, key) -> bool:
+        return str(key) in self.rows
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self.rows))
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def __enter__(self) -> "ProcessedLedger":
+        return self
+
+    def __exit__(self, *exception):
+        self.close()
+
+    def load(self):
+        if self.backend == LedgerBackend.SQLITE:
+            self.load_database()
+        else:
+            self.load_csv()
+
+    def read_csv_rows(self, path: Path) -> Iterator[list[str]]:
+        if not path.is_file():
+            return
+        with open(path, newline="") as csv_file:
+            rows = reader(csv_file)
+            next(rows, None)
+            for row in rows:
+                if row:
+                    yield row
+
+    def load_csv(self):
+        for row in self.read_csv_rows(self.path):
+            self.rows[row[0]] = row
+        removed_keys = [row[0] for row in self.read_csv_rows(self.removed_path)]
+        for key in removed_keys:
+            self.rows.pop(key, None)
+        if removed_keys:
+            self.compact()
+        else:
+            make_csv_paths(self.path, self.columns)
+
+    def get_csv_signature(self) -> str:
+        return ";".join(
+            f"{path.stat().st_mtime_ns}:{path.stat().st_size}"
+            if path.is_file()
+            else "-"
+            for path in (self.path, self.removed_path)
+        )
+
+    def get_stored_csv_signature(self) -> Optional[str]:
+        row = self.connection.execute(
+            "SELECT value FROM metadata WHERE name = ?", (CSV_SIGNATURE,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def store_csv_signature(self):
+        self.connection.execute(
+            "INSERT OR REPLACE INTO metadata VALUES (?, ?)",
+            (CSV_SIGNATURE, self.get_csv_signature()),
+        )
+        self.connection.commit()
+
+    def import_csv(self):
+        removed_keys = {row[0] for row in self.read_csv_rows(self.removed_path)}
+        self.connection.execute("DELETE FROM processed")
+        self.connection.executemany(
+            "INSERT OR REPLACE INTO processed VALUES (?, ?, ?)",
+            (
+                (row[0], position, dumps(row))
+                for position, row in enumerate(self.read_csv_rows(self.path))
+                if row[0] not in removed_keys
+            ),
+        )
+        self.store_csv_signature()
+
+    def load_database(self):
+        create_directory(self.database_path.parent)
+        self.connection = connect(self.database_path)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS processed"
+            " (key TEXT PRIMARY KEY, position INTEGER, row TEXT)"
+        )
+        self.connection.execute(
+            "CREATE INDEX IF NOT EXISTS processed_position ON processed (position)"
+        )
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS metadata (name TEXT PRIMARY KEY, value TEXT)"
+        )
+        if self.get_stored_csv_signature() != self.get_csv_signature():
+            self.import_csv()
+        for key, row in self.connection.execute(
+            "SELECT key, row FROM processed ORDER BY position"
+        ):
+            self.rows[key] = loads(row)
+        (self.position,) = self.connection.execute(
+            "SELECT COALESCE(MAX(position), -1) + 1 FROM processed"
+        ).fetchone()
+
+    def get_rows(self) -> list[list]:
+        return list(self.rows.values())
+
+    def add(self, row: Iterable):
+        row = [str(value) for value in row]
+        key = row[0]
+        if key in self.removed:
+            self.compact()
+        self.rows.pop(key, None)
+        self.rows[key] = row
+        if self.connection:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO processed VALUES (?, ?, ?)",
+                (key, self.position, dumps(row)),
+            )
+            self.position += 1
+        else:
+            self.unwritten_rows.append(row)
+        self.count_pending()
+
+    def remove(self, key):
+        key = str(key)
+        if key not in self.rows:
+            return
+        del self.rows[key]
+        if self.connection:
+            self.connection.execute("DELETE FROM processed WHERE key = ?", (key,))
+            self.count_pending()
+            return
+        self.unwritten_removed.append(key)
+        self.removed.add(key)
+        self.count_pending()
+        if len(self.removed) >= self.compact_threshold:
+            self.compact()
+
+    def count_pending(self):
+        self.pending += 1
+        if self.pending >= self.flush_rows:
+            self.flush()
+
+    def write_csv_rows(self):
+        if self.unwritten_rows:
+            if not self.file:
+                self.file = open(self.path, "a", newline="")
+            writer(self.file).writerows(self.unwritten_rows)
+            self.file.flush()
+            self.unwritten_rows.clear()
+        if self.unwritten_removed:
+            if not self.removed_file:
+                new_file = not self.removed_path.is_file()
+                self.removed_file = open(self.removed_path, "a", newline="")
+                if new_file:
+                    writer(self.removed_file).writerow(self.columns[:1])
+            writer(self.removed_file).writerows([key] for key in self.unwritten_removed)
+            self.removed_file.flush()
+            self.unwritten_removed.clear()
+
+    def flush(self):
+        if self.before_flush:
+            self.before_flush()
+        if self.connection:
+            self.connection.commit()
+        self.write_csv_rows()
+        self.pending = 0
+
+    def close_files(self):
+        for csv_file in (self.file, self.removed_file):
+            if csv_file:
+                csv_file.close()
+        self.file = self.removed_file = None
+
+    def export_csv(self, path: Optional[Path] = None):
+        path = path or self.path
+        temporary_path = path.with_name(f".{path.name}.tmp")
+        with open(temporary_path, "w", newline="") as csv_file:
+            csv_writer = writer(csv_file)
+            csv_writer.writerow(self.columns)
+            csv_writer.writerows(self.rows.values())
+        temporary_path.replace(path)
+
+    def compact(self):
+        if self.before_flush:
+            self.before_flush()
+        self.unwritten_rows.clear()
+        self.unwritten_removed.clear()
+        self.close_files()
+        self.pending = 0
+        self.export_csv()
+        if self.removed_path.is_file():
+            remove(self.removed_path)
+        self.removed.clear()
+
+    def close(self):
+        if self.connection:
+            self.flush()
+            self.export_csv()
+            self.store_csv_signature()
+            self.connection.close()
+            self.connection = None
+        elif self.removed:
+            self.compact()
+        else:
+            self.flush()
+        self.close_files()
+
+    def clear(self):
+        self.close_files()
+        for path in (self.path, self.removed_path, self.database_path):
+            if path.is_file():
+                remove(path)
+        self.rows.clear()
+        self.removed.clear()
+        self.unwritten_rows.clear()
+        self.unwritten_removed.clear()
+        self.pending = self.position = 0
+        if self.connection:
+            self.connection.execute("DELETE FROM processed")
+            self.connection.commit()
+        make_csv_paths(self.path, self.columns)
+
+
+def clear_processed_ledgers(
+    clear_processed: bool,
+    ledgers: ProcessedLedger | list[ProcessedLedger],
+    item_plural="users",
+):
+    if confirm_clear_processed(clear_processed, item_plural):
+        for ledger in make_list(ledgers):
+            ledger.clear()
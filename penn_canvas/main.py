@@ -1,42 +1,26 @@
-from typing import Optional
+from importlib import import_module
+from typing import Callable, Optional
 
 from click.exceptions import Exit
 from typer import Argument, Option, Typer, echo
 
 from penn_canvas import __version__
-from penn_canvas.blue_jeans import blue_jeans_main
 
-from .api import Instance, get_instance_option
 from .archive.archive import archive_app
-from .browser import browser_main
-from .bulk_enroll import bulk_enroll_main
-from .check_enrollment import check_enrollment_main
 from .config import print_config, write_config_options
-from .count_poll_everywhere import count_poll_everywhere_main
-from .count_quizzes import count_quizzes_main
-from .count_sites import count_sites_main
-from .course_shopping import course_shopping_main
-from .email import email_main
-from .find_users_by_email import find_users_by_email_main
+from .constants import REPORT_WORKERS, Instance, ReportType
 from .helpers import (
+    CACHE,
     COURSE_IDS,
     CURRENT_DATE,
-    CURRENT_YEAR_AND_TERM,
     FORCE,
     FORCE_REPORT,
+    REFRESH,
+    REPORTS_RETENTION_DAYS,
     VERBOSE,
+    WORKERS,
+    get_instance_option,
 )
-from .integrity import integrity_main
-from .investigate import investigate_main
-from .module import module_main
-from .new_student_orientation import new_student_orientation_main
-from .open_canvas_bulk_action import open_canvas_bulk_action_main
-from .report import ReportType, report_main
-from .roles import roles_main
-from .storage import storage_main
-from .tool import tool_main
-from .update_term import update_term_main
-from .usage_count import usage_count_main
 
 app = Typer(
     no_args_is_help=True,
@@ -47,17 +31,42 @@ app = Typer(
 app.add_typer(archive_app, name="archive")
 
 
+def load_command(module_name: str) -> Callable:
+    module = import_module(f".{module_name}", __package__)
+    return getattr(module, f"{module_name}_main")
+
+
+@app.command()
+def accounts(
+    instance_name: str = get_instance_option(),
+    refresh: bool = Option(
+        False, "--refresh", help="Fetch the sub-account tree again from Canvas"
+    ),
+    verbose: bool = VERBOSE,
+):
+    """Cache the sub-account tree used for account lookups"""
+    load_command("accounts")(instance_name, refresh, verbose)
+
+
 @app.command()
 def blue_jeans(
-    terms: list[str] = Option([CURRENT_YEAR_AND_TERM], "--term", help="Term name"),
+    terms: list[str] = Option(
+        [],
+        "--term",
+        help="Term name (defaults to the current term)",
+        show_default=False,
+    ),
     instance_name: str = get_instance_option(),
     account_id: Optional[int] = Option(None, "--account", help="Canvas account id"),
     verbose: bool = VERBOSE,
     force: bool = FORCE,
     force_report: bool = FORCE_REPORT,
+    workers: int = WORKERS,
 ):
     """Get Blue Jeans usage for a courses"""
-    blue_jeans_main(terms, instance_name, account_id, verbose, force, force_report)
+    load_command("blue_jeans")(
+        terms, instance_name, account_id, verbose, force, force_report, workers
+    )
 
 
 @app.command()
@@ -68,7 +77,7 @@ def browser(
     verbose: bool = VERBOSE,
 ):
     """Report user browser data for Canvas courses"""
-    browser_main(course_ids, instance_name, force, verbose)
+    load_command("browser")(course_ids, instance_name, force, verbose)
 
 
 @app.command()
@@ -121,7 +130,7 @@ def bulk_enroll(
     ),
 ):
     """Enroll user into multiple courses"""
-    bulk_enroll_main(
+    load_command("bulk_enroll")(
         user,
         sub_account,
         terms,
@@ -142,7 +151,21 @@ def check_enrollment(
     verbose: bool = VERBOSE,
 ):
     """Check enrollment"""
-    check_enrollment_main(course, date, instance_name, force, verbose)
+    load_command("check_enrollment")(course, date, instance_name, force, verbose)
+
+
+@app.command()
+def cleanup(
+    days: int = Option(
+        REPORTS_RETENTION_DAYS,
+        "--days",
+        min=0,
+        help="Remove report directories older than this many days",
+    ),
+    verbose: bool = VERBOSE,
+):
+    """Remove old Canvas report downloads"""
+    load_command("cleanup")(days, verbose)
 
 
 @app.command()
@@ -178,9 +201,10 @@ def count_poll_everywhere(
     ),
     force: bool = FORCE,
     verbose: bool = VERBOSE,
+    workers: int = WORKERS,
 ):
     """Get Poll Everywhere usage for courses"""
-    count_poll_everywhere_main(test, force, verbose)
+    load_command("count_poll_everywhere")(test, force, verbose, workers)
 
 
 @app.command()
@@ -198,9 +222,10 @@ def count_quizzes(
     ),
     force: bool = FORCE,
     verbose: bool = VERBOSE,
+    workers: int = WORKERS,
 ):
     """Get quiz usage for courses"""
-    count_quizzes_main(new_quizzes, test, force, verbose)
+    load_command("count_quizzes")(new_quizzes, test, force, verbose, workers)
 
 
 @app.command()
@@ -223,7 +248,7 @@ def count_sites(
     instance_name=get_instance_option(),
 ):
     """Count course codes with a Canvas site"""
-    count_sites_main(
+    load_command("count_sites")(
         year_and_term, separate, graduate_course_minimum_number, instance_name
     )
 
@@ -255,7 +280,7 @@ def course_shopping(
     ),
 ):
     """Enable/disable "Course Shopping" """
-    course_shopping_main(test, disable, force, verbose, new)
+    load_command("course_shopping")(test, disable, force, verbose, new)
 
 
 @app.command()
@@ -285,6 +310,7 @@ def email(
         True, " /--no-prompt", help="Print out detailed information as the task runs."
     ),
     verbose: bool = VERBOSE,
+    workers: int = WORKERS,
 ):
     """
     Activate unconfirmed email for users in supported schools
@@ -293,7 +319,7 @@ def email(
 
         Wharton, Perelman School of Medicine
     """
-    email_main(
+    load_command("email")(
         instance_name,
         new,
         force,
@@ -302,13 +328,14 @@ def email(
         use_data_warehouse,
         prompt,
         verbose,
+        workers,
     )
 
 
 @app.command()
 def find_users_by_email(emails_path: str = Argument("", help="Path to input csv")):
     """Find Canvas users by email"""
-    find_users_by_email_main(emails_path)
+    load_command("find_users_by_email")(emails_path)
 
 
 @app.command()
@@ -324,13 +351,15 @@ def integrity(
     ),
 ):
     """Get page views for students"""
-    integrity_main(course_id, user_ids, quiz_ids, instance_name, skip_page_views)
+    load_command("integrity")(
+        course_id, user_ids, quiz_ids, instance_name, skip_page_views
+    )
 
 
 @app.command()
 def investigate():
     """Investigate student assignments"""
-    investigate_main()
+    load_command("investigate")()
 
 
 @app.command()
@@ -349,7 +378,7 @@ def module(
     ),
 ):
     """Re-lock modules for course"""
-    module_main(test, course_id)
+    load_command("module")(test, course_id)
 
 
 @app.command()
@@ -383,7 +412,7 @@ def new_student_orientation(
     year when the command is run. A file whose name contains any other year will
     not be accepted.
     """
-    new_student_orientation_main(test, verbose, force, clear_processed)
+    load_command("new_student_orientation")(test, verbose, force, clear_processed)
 
 
 @app.command()
@@ -393,25 +422,42 @@ def open_canvas_bulk_action(
     instance_name: str = get_instance_option(default=Instance.OPEN),
 ):
     """Process staff input files"""
-    open_canvas_bulk_action_main(verbose, force, instance_name)
+    load_command("open_canvas_bulk_action")(verbose, force, instance_name)
 
 
 @app.command()
 def report(
-    report_type: str = Option(
-        ReportType.PROVISIONING.value, "--report-type", help="Canvas AccountReport type"
+    report_types: list[str] = Option(
+        [ReportType.PROVISIONING.value],
+        "--report-type",
+        help="Canvas AccountReport type",
     ),
-    term: str = Option(
-        CURRENT_YEAR_AND_TERM,
+    terms: list[str] = Option(
+        [],
         "--term-name",
-        help="The display name of the term for the report",
+        help=(
+            "The display name of the term for the report (defaults to the current term)"
+        ),
+        show_default=False,
     ),
     force: bool = FORCE,
-    instance: str = get_instance_option(),
+    instances: list[str] = Option(
+        [Instance.PRODUCTION.value], "--instance", help="Canvas instance name"
+    ),
     verbose: bool = VERBOSE,
+    incremental: bool = Option(
+        False,
+        "--incremental",
+        help="Patch the latest cached courses report with changes since it was made",
+    ),
+    workers: int = Option(
+        REPORT_WORKERS, "--workers", min=1, help="The number of reports to run at once"
+    ),
 ):
     """Generate reports"""
-    report_main(report_type, term, force, instance, verbose)
+    load_command("report")(
+        report_types, terms, force, instances, verbose, incremental, workers
+    )
 
 
 @app.command()
@@ -423,7 +469,7 @@ def roles(
     verbose: bool = VERBOSE,
 ):
     """Get role permissions"""
-    roles_main(permission, instance, verbose)
+    load_command("roles")(permission, instance, verbose)
 
 
 @app.command()
@@ -435,9 +481,12 @@ def storage(
     force: bool = FORCE,
     force_report: bool = FORCE_REPORT,
     verbose: bool = VERBOSE,
+    workers: int = WORKERS,
 ):
     """Increase storage quota for courses above 79% capacity"""
-    storage_main(increment_value, instance, force, force_report, verbose)
+    load_command("storage")(
+        increment_value, instance, force, force_report, verbose, workers
+    )
 
 
 @app.command()
@@ -450,9 +499,12 @@ def tool(
         ),
     ),
     term: str = Option(
-        CURRENT_YEAR_AND_TERM,
+        "",
         "--term-name",
-        help="The display name of the term for the report",
+        help=(
+            "The display name of the term for the report (defaults to the current term)"
+        ),
+        show_default=False,
     ),
     enable: bool = Option(
         False,
@@ -482,9 +534,10 @@ def tool(
     account_id: str = Option(
         None, "--account-id", help="Operate on the specified sub-account only."
     ),
+    workers: int = WORKERS,
 ):
     """Enable tool or get tool usage for courses"""
-    tool_main(
+    load_command("tool")(
         tool,
         term,
         enable,
@@ -495,24 +548,29 @@ def tool(
         force_report,
         clear_processed,
         account_id,
+        workers,
     )
 
 
 @app.command()
 def update_term(
     account_id: Optional[int] = Option(None, help="Canvas account id"),
-    current_term_name: str = Option("", help="Term name"),
+    current_term_name: str = Option(
+        "", help="Term name (defaults to the current term)", show_default=False
+    ),
     new_term_name: str = Option("Penn Term", help="Term name"),
     instance_name=get_instance_option(),
 ):
     """Update enrollment term for courses"""
-    update_term_main(account_id, current_term_name, new_term_name, instance_name)
+    load_command("update_term")(
+        account_id, current_term_name, new_term_name, instance_name
+    )
 
 
 @app.command()
 def usage_count(tool: str = Option("turnitin", help="The tool to count usage for")):
     """Get tool usage for courses"""
-    usage_count_main(tool)
+    load_command("usage_count")(tool)
 
 
 def display_version(version: bool):
@@ -529,7 +587,12 @@ def version(
         "-V",
         callback=display_version,
         help="Display version number",
-    )
+    ),
+    cache: bool = CACHE,
+    refresh: bool = REFRESH,
 ):
     if version:
         return
+    from .cache import configure_cache
+
+    configure_cache(cache, refresh)
@@ -6,11 +6,13 @@ from natsort import natsorted
 from pandas import Categorical, DataFrame, concat, isna, read_csv, read_excel
 from typer import Abort, Exit, echo
 
-from .api import Instance, get_canvas, get_data_warehouse_cursor
+from .api import Instance, get_canvas
+from .data_warehouse import get_existing_penn_keys
 from .helpers import (
     TODAY_AS_Y_M_D,
     YEAR,
     color,
+    create_directories,
     get_command_paths,
     get_processed,
     get_start_index,
@@ -351,21 +353,11 @@ def create_memberships(user, canvas, verbose, force, processed_path, args):
                             ") Checking the Data Warehouse for pennkey:"
                             f" {penn_key_display}..."
                         )
-                    cursor = get_data_warehouse_cursor()
-                    cursor.execute(
-                        """
-                            SELECT
-                                pennkey
-                            FROM dwadmin.person_all_v
-                            WHERE pennkey= :penn_key
-                            """,
-                        penn_key=penn_key,
+                    status = (
+                        "user not found in canvas"
+                        if get_existing_penn_keys([penn_key])
+                        else "invalid pennkey"
                     )
-                    status = "invalid pennkey"
-                    for user in cursor:
-                        if len(user) > 0:
-                            status = "user not found in canvas"
-                            break
                 except Exception as error:
                     status = error
     data.at[index, "status"] = status
@@ -388,6 +380,7 @@ def create_memberships(user, canvas, verbose, force, processed_path, args):
 def new_student_orientation_main(
     test: bool, verbose: bool, force: bool, clear_processed: bool
 ):
+    create_directories(*PATHS.values())
     test_display = "_test" if test else ""
     base_display = "new_student_orientation"
     result_string = f"{YEAR}_{base_display}_result_{TODAY_AS_Y_M_D}{test_display}.csv"
@@ -16,18 +16,18 @@ from .api import (
     Instance,
     get_account,
     get_course,
-    get_data_warehouse_cursor,
     get_main_account_id,
     get_section,
-    get_user,
     validate_instance_name,
 )
 from .browser import browser_main
+from .data_warehouse import get_penn_ids
 from .helpers import (
     BASE_PATH,
+    ResultWriter,
     color,
     confirm_global_protect_enabled,
-    create_directory,
+    create_directories,
     find_input,
     get_start_index,
     make_csv_paths,
@@ -38,13 +38,14 @@ from .helpers import (
     switch_logger_file,
 )
 from .style import print_item
+from .users import get_user_resolver
 
 INPUT_FILE_NAME = "Open Canvas Bulk Action csv file"
-COMMAND_PATH = create_directory(BASE_PATH / "Open Canvas Bulk Action")
-INPUT = create_directory(COMMAND_PATH / "Input")
-RESULTS = create_directory(COMMAND_PATH / "RESULTS")
-COMPLETED = create_directory(COMMAND_PATH / "Completed")
-LOGS = create_directory(COMMAND_PATH / "Logs")
+COMMAND_PATH = BASE_PATH / "Open Canvas Bulk Action"
+INPUT = COMMAND_PATH / "Input"
+RESULTS = COMMAND_PATH / "RESULTS"
+COMPLETED = COMMAND_PATH / "Completed"
+LOGS = COMMAND_PATH / "Logs"
 HEADERS = ["Name", "Email", "Course ID", "Section ID", "Notify"]
 UNENROLL_TASKS = {"conclude", "delete", "deactivate", "inactivate"}
 ENROLLMENT_TYPES = {
@@ -91,23 +92,17 @@ def get_enrollment_id_and_type(course_id, section_id):
         return course_id, False
 
 
-def get_penn_id_from_penn_key(penn_key: str) -> Optional[str]:
-    cursor = get_data_warehouse_cursor()
-    cursor.execute(
-        "SELECT penn_id FROM person_all_v WHERE pennkey = :pennkey",
-        pennkey=penn_key.strip().lower(),
-    )
-    student = None
-    for penn_id in cursor:
-        student = penn_id[0]
-    if not student:
-        cursor.execute(
-            "SELECT penn_id FROM employee_general WHERE pennkey = :pennkey",
-            pennkey=penn_key.strip().lower(),
-        )
-        for penn_id in cursor:
-            student = penn_id[0]
-    return student
+def format_penn_key(penn_key: str) -> str:
+    return penn_key.strip().lower()
+
+
+def get_penn_id_from_penn_key(penn_key: str, penn_ids: dict[str, str]) -> Optional[str]:
+    return penn_ids.get(format_penn_key(penn_key))
+
+
+def get_penn_ids_from_penn_keys(users: DataFrame) -> dict[str, str]:
+    penn_keys = users["Pennkey"].dropna().astype(str)
+    return get_penn_ids(format_penn_key(penn_key) for penn_key in penn_keys)
 
 
 def email_in_use(user: User, email: str) -> bool:
@@ -180,9 +175,18 @@ def get_canvas_section_or_course(
     return canvas_section
 
 
+def load_course_users(canvas_section: Section | Course, instance: Instance):
+    course = (
+        canvas_section
+        if isinstance(canvas_section, Course)
+        else get_course(canvas_section.course_id, instance=instance)
+    )
+    get_user_resolver(instance).load_course(course)
+
+
 def get_enrollment_login(enrollment: Enrollment, instance: Instance) -> dict:
     try:
-        user = get_user(enrollment.user["id"], instance=instance)
+        user = get_user_resolver(instance).get(enrollment.user["id"])
     except Exception:
         user = None
     return {
@@ -196,6 +200,7 @@ def get_enrollment_login(enrollment: Enrollment, instance: Instance) -> dict:
 def get_enrollments(canvas_section: Section | Course, instance: Instance) -> list[dict]:
     try:
         enrollments = [enrollment for enrollment in canvas_section.get_enrollments()]
+        load_course_users(canvas_section, instance)
         enrollments = [
             get_enrollment_login(enrollment, instance) for enrollment in enrollments
         ]
@@ -556,7 +561,7 @@ def open_canvas_bulk_action_main(
             elif action == Action.UPDATE:
                 status = update_user_name(account, full_name, email)
             elif action == Action.PENN_ID:
-                status = get_penn_id_from_penn_key(penn_key) or "not found"
+                status = get_penn_id_from_penn_key(penn_key, PENN_IDS) or "not found"
             elif not action == Action.USER_AGENT:
                 status, canvas_user = create_user(account, full_name, email)
         except Exception as error_status:
@@ -568,7 +573,7 @@ def open_canvas_bulk_action_main(
             users.at[index, ["Status"]] = status
         if enroll_error:
             users.at[index, ["Error"]] = enroll_error
-        users.loc[index].to_frame().T.to_csv(RESULT_PATH, mode="a", header=False)
+        RESULT_WRITER.write_report_row(users, index)
         if verbose and error_message:
             action_display = "get Penn ID for" if action == Action.PENN_ID else action
             course_display = f" in course {course}" if course else ""
@@ -596,6 +601,7 @@ def open_canvas_bulk_action_main(
             print_item(index, TOTAL, message)
 
     user_agent_courses = 0
+    create_directories(INPUT, RESULTS, COMPLETED)
     input_files, missing_file_message = find_input(
         "Open Canvas Bulk Action csv file", INPUT, date=False, open_canvas=True
     )
@@ -671,6 +677,7 @@ def open_canvas_bulk_action_main(
                 open_canvas=True,
             )
             if action == Action.PENN_ID:
+                PENN_IDS = get_penn_ids_from_penn_keys(users)
                 users["Penn ID"] = ""
                 RESULT_HEADERS = action_headers + ["Penn ID"]
             elif action == Action.USER_AGENT:
@@ -709,15 +716,16 @@ def open_canvas_bulk_action_main(
             if verbose:
                 echo(f"==== FILE {index + 1}/{len(input_files)} ====")
                 echo(color(input_file.stem, "blue"))
-            if verbose:
-                for user in users.itertuples():
-                    perform_canvas_action(user, verbose, ARGS)
-            else:
-                with progressbar(
-                    users.itertuples(), length=len(users.index)
-                ) as progress:
-                    for user in progress:
+            with ResultWriter(RESULT_PATH) as RESULT_WRITER:
+                if verbose:
+                    for user in users.itertuples():
                         perform_canvas_action(user, verbose, ARGS)
+                else:
+                    with progressbar(
+                        users.itertuples(), length=len(users.index)
+                    ) as progress:
+                        for user in progress:
+                            perform_canvas_action(user, verbose, ARGS)
             new_path = get_timestamped_path(RESULT_PATH, open_test)
             RESULT_PATHS.append((new_path, TOTAL))
             dated_input_file.rename(COMPLETED / dated_input_file.name)
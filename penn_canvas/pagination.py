@@ -0,0 +1,88 @@
+from typing import Iterator, Optional
+from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
+
+from canvasapi.paginated_list import PaginatedList
+from requests import Response
+
+from .helpers import map_rows
+
+PER_PAGE = 100
+PAGE_WORKERS = 8
+
+
+def get_page_number(url: str) -> Optional[int]:
+    page = dict(parse_qsl(urlparse(url).query)).get("page", "")
+    return int(page) if page.isdigit() else None
+
+
+def get_page_url(url: str, page: int) -> str:
+    parsed_url = urlparse(url)
+    query = [
+        (key, str(page) if key == "page" else value)
+        for key, value in parse_qsl(parsed_url.query, keep_blank_values=True)
+    ]
+    return urlunparse(parsed_url._replace(query=urlencode(query)))
+
+
+def get_link_url(response: Response, relation: str) -> Optional[str]:
+    link = response.links.get(relation)
+    return link["url"] if link else None
+
+
+def request_page(paginated_list: PaginatedList, url: str) -> Response:
+    return paginated_list._requester.request(paginated_list._request_method, _url=url)
+
+
+def get_page_items(paginated_list: PaginatedList, response: Response) -> list:
+    content = response.json()
+    if paginated_list._root:
+        try:
+            content = content[paginated_list._root]
+        except KeyError:
+            raise ValueError(
+                f"The key <{paginated_list._root}> does not exist in the response."
+            )
+    items = list()
+    for element in content:
+        if element is not None:
+            element.update(paginated_list._extra_attribs)
+            items.append(
+                paginated_list._content_class(paginated_list._requester, element)
+            )
+    return items
+
+
+def iterate_pages(paginated_list: PaginatedList, workers=PAGE_WORKERS) -> Iterator:
+    if paginated_list._url_override:
+        yield from paginated_list
+        return
+    parameters = dict(paginated_list._first_params)
+    parameters["per_page"] = PER_PAGE
+    response = paginated_list._requester.request(
+        paginated_list._request_method, paginated_list._first_url, **parameters
+    )
+    if not response.links:
+        yield from paginated_list
+        return
+    yield from get_page_items(paginated_list, response)
+    next_url = get_link_url(response, "next")
+    last_url = get_link_url(response, "last")
+    next_page = get_page_number(next_url) if next_url else None
+    last_page = get_page_number(last_url) if last_url else None
+    if next_url and next_page and last_page and workers > 1:
+        page_urls = (
+            get_page_url(next_url, page) for page in range(next_page, last_page + 1)
+        )
+        for response in map_rows(
+            page_urls, lambda url: request_page(paginated_list, url), workers
+        ):
+            yield from get_page_items(paginated_list, response)
+        return
+    while next_url:
+        response = request_page(paginated_list, next_url)
+        yield from get_page_items(paginated_list, response)
+        next_url = get_link_url(response, "next")
+
+
+def get_all_pages(paginated_list: PaginatedList, workers=PAGE_WORKERS) -> list:
+    return list(iterate_pages(paginated_list, workers))
@@ -0,0 +1,117 @@
+from random import uniform
+from threading import Lock
+from time import monotonic, sleep
+from typing import Mapping, Optional
+
+from loguru import logger
+from requests import Response, Session
+
+RATE_LIMIT_REMAINING = "X-Rate-Limit-Remaining"
+REQUEST_COST = "X-Request-Cost"
+RATE_LIMIT_EXCEEDED = b"Rate Limit Exceeded"
+
+
+def get_header_value(headers: Mapping[str, str], header: str) -> Optional[float]:
+    try:
+        return float(headers[header])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def is_rate_limited(status_code: int, content: bytes) -> bool:
+    return status_code == 429 or (status_code == 403 and RATE_LIMIT_EXCEEDED in content)
+
+
+def is_response_rate_limited(response: Response) -> bool:
+    content = response.content if response.status_code == 403 else b""
+    return is_rate_limited(response.status_code, content)
+
+
+def add_jitter(seconds: float, jitter=0.25) -> float:
+    return seconds * uniform(1 - jitter, 1 + jitter)
+
+
+class RateGovernor:
+    def __init__(
+        self,
+        low_water=200.0,
+        high_water=500.0,
+        minimum_delay=0.05,
+        maximum_delay=5.0,
+        maximum_backoff=60.0,
+    ):
+        self.low_water = low_water
+        self.high_water = high_water
+        self.minimum_delay = minimum_delay
+        self.maximum_delay = maximum_delay
+        self.maximum_backoff = maximum_backoff
+        self.delay = 0.0
+        self.next_slot = 0.0
+        self.paused_until = 0.0
+        self.remaining: Optional[float] = None
+        self.cost: Optional[float] = None
+        self.throttled = 0
+        self.lock = Lock()
+
+    def reserve_slot(self) -> float:
+        with self.lock:
+            now = monotonic()
+            start = max(now, self.next_slot, self.paused_until)
+            self.next_slot = start + (add_jitter(self.delay) if self.delay else 0.0)
+        return start - now
+
+    def wait(self):
+        wait_time = self.reserve_slot()
+        if wait_time > 0:
+            sleep(wait_time)
+
+    def increase_delay(self):
+        self.delay = min(max(self.delay * 2, self.minimum_delay), self.maximum_delay)
+
+    def update(self, headers: Mapping[str, str]):
+        remaining = get_header_value(headers, RATE_LIMIT_REMAINING)
+        cost = get_header_value(headers, REQUEST_COST)
+        if remaining is None:
+            return
+        with self.lock:
+            self.remaining = remaining
+            if cost is not None:
+                self.cost = cost if self.cost is None else (self.cost + cost) / 2
+            if remaining < self.low_water:
+                self.increase_delay()
+            elif remaining > self.high_water:
+                self.delay = self.delay / 2 if self.delay > self.minimum_delay else 0.0
+
+    def back_off(self, attempt: int):
+        backoff = min(self.maximum_delay * 2**attempt, self.maximum_backoff)
+        with self.lock:
+            self.throttled += 1
+            self.increase_delay()
+            self.paused_until = max(
+                self.paused_until, monotonic() + add_jitter(backoff)
+            )
+        logger.warning(
+            f"Canvas rate limit exceeded (remaining: {self.remaining}, average cost:"
+            f" {self.cost}). Backing off for {backoff:.1f} seconds..."
+        )
+
+
+class GovernedSession(Session):
+    def __init__(self, governor: Optional[RateGovernor] = None, maximum_retries=6):
+        super().__init__()
+        self.governor = governor or RateGovernor()
+        self.maximum_retries = maximum_retries
+
+    def request(self, method, url, *args, **kwargs) -> Response:
+        maximum_retries = 0 if kwargs.get("files") else self.maximum_retries
+        attempt = 0
+        while True:
+            self.governor.wait()
+            response = super().request(method, url, *args, **kwargs)
+            self.governor.update(response.headers)
+            rate_limited = is_response_rate_limited(response)
+            if not rate_limited or attempt >= maximum_retries:
+                return response
+            response.close()
+            self.governor.back_off(attempt)
+            attempt += 1
@@ -1,46 +1,83 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
 from dataclasses import dataclass
-from enum import Enum
-from functools import cached_property
-from os import remove
+from datetime import datetime, timedelta, timezone
+from fcntl import LOCK_EX, flock
+from functools import cached_property, lru_cache
+from importlib.util import find_spec
+from itertools import product
+from json import dumps, loads
 from pathlib import Path
-from shutil import rmtree
-from time import sleep
-from typing import Any, Iterable, Literal, Optional
-from zipfile import ZipFile
+from queue import Queue
+from tempfile import NamedTemporaryFile
+from threading import Lock
+from time import monotonic, sleep
+from typing import (
+    IO,
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Iterable,
+    Iterator,
+    Literal,
+    Optional,
+)
+from zipfile import Path as ZipPath
+from zipfile import ZipFile, is_zipfile
 
 from canvasapi.account import Account, AccountReport
+from canvasapi.canvas_object import CanvasObject
+from canvasapi.paginated_list import PaginatedList
 from loguru import logger
-from pandas.io.parsers.readers import read_csv
 from typer import Exit, echo, style
 
 from .api import (
-    Instance,
     format_instance_name,
     get_account,
-    get_enrollment_term_id,
+    get_canvas,
     get_main_account_id,
+    get_requester,
     validate_instance_name,
 )
+from .constants import REPORT_WORKERS, Instance, ReportType
+from .downloads import download_file
 from .helpers import (
     CURRENT_YEAR_AND_TERM,
-    REPORTS,
-    create_directory,
-    download_file,
+    get_current_reports_directory,
     get_reports_directory,
     make_list,
+    map_rows,
     switch_logger_file,
 )
+from .pagination import iterate_pages
 from .style import color, pluralize
-
-LOGS = create_directory(get_reports_directory() / "Logs")
-
-
-class ReportType(Enum):
-    COURSES = "courses"
-    USERS = "users"
-    STORAGE = "storage"
-    PROVISIONING = "provisioning"
-    PUBLIC_COURSES = "public_courses"
+from .terms import get_current_year_and_term, get_enrollment_term_id, get_term_names
+
+if TYPE_CHECKING:
+    from pandas import DataFrame
+
+LOGS = get_reports_directory() / "Logs"
+REPORT_POLL_DELAY = 2.0
+REPORT_POLL_MAXIMUM_DELAY = 30.0
+REPORT_POLL_BACKOFF = 1.5
+REPORT_TIMEOUT = 900.0
+REPORT_CHUNK_SIZE = 100_000
+SIDECAR_SUFFIX = ".feather"
+SIDECAR_DTYPE_KINDS = "OUiuf"
+TEXT_DTYPE_KINDS = "OU"
+REPORT_MANIFEST = "manifest.json"
+IN_PROGRESS_STATUSES = {"created", "running"}
+INCREMENTAL_OVERLAP = timedelta(hours=1)
+COURSE_STATUSES = {
+    "available": "active",
+    "claimed": "unpublished",
+    "created": "unpublished",
+    "completed": "concluded",
+    "deleted": "deleted",
+}
+
+
+ReportPath = Path | ZipPath
 
 
 def get_report_type_string(report_type: ReportType | str) -> str:
@@ -86,14 +123,13 @@ def validate_report_type(report_name, verbose=False):
         report_type = report_name
     else:
         cli_report_types = get_available_cli_report_types()
-        canvas_report_types = get_available_canvas_report_types()
         if report_name not in cli_report_types:
             echo(f'ERROR: Invalid report type "{report_name}"')
             echo("\nReport types implemented in the CLI are:")
             for report_type in get_available_cli_report_type_names():
                 echo(f'\t"{report_type}"')
             echo("\nReport types available in Canvas are:")
-            for report_type in canvas_report_types:
+            for report_type in get_available_canvas_report_types():
                 echo(f'\t"{report_type}"')
             raise Exit()
         report_type = ReportType(report_name)
@@ -122,7 +158,8 @@ class Report:
     account_report_type: str = ""
     account_report: Optional[AccountReport] = None
     force: bool = False
-    report_paths: Optional[Path | list[Path]] = None
+    incremental: bool = False
+    report_paths: Optional[ReportPath | list[ReportPath]] = None
 
     def __post_init__(self):
         if self.account is None:
@@ -143,7 +180,9 @@ class Report:
         ):
             parameters_object["users"] = True
         if self.term:
-            parameters_object["enrollment_term_id"] = get_enrollment_term_id(self.term)
+            parameters_object["enrollment_term_id"] = get_enrollment_term_id(
+                self.term, self.instance
+            )
         return parameters_object
 
     @cached_property
@@ -155,6 +194,11 @@ class Report:
         else:
             return f"{term}{instance}"
 
+    @cached_property
+    def key(self) -> str:
+        term = self.term or "all"
+        return f"{self.report_type.value}:{term}:{self.instance.value}"
+
     def create_account_report(self):
         account = get_account(self.account, instance=self.instance)
         if self.parameters:
@@ -165,13 +209,72 @@ class Report:
             account_report = account.create_report(self.account_report_type)
         self.account_report = account_report
 
+    def get_account_report(self, report_id: int):
+        account = get_account(self.account, instance=self.instance)
+        self.account_report = account.get_report(self.account_report_type, report_id)
+
     def update_account_report(self):
         if not self.account_report:
             return
-        account = get_account(self.account, instance=self.instance)
-        self.account_report = account.get_report(
-            self.account_report.report, self.account_report.id
-        )
+        self.get_account_report(self.account_report.id)
+
+
+class ReportManifest:
+    def __init__(self, path: Path):
+        self.path = path
+        self.lock_path = path.with_name(f"{path.name}.lock")
+        self.lock = Lock()
+
+    def read(self) -> dict[str, dict]:
+        if not self.path.is_file():
+            return dict()
+        try:
+            return loads(self.path.read_text())
+        except ValueError as error:
+            logger.warning(f"Ignoring unreadable report manifest {self.path}: {error}")
+            return dict()
+
+    @contextmanager
+    def locked(self) -> Iterator[None]:
+        with self.lock, open(self.lock_path, "a") as lock_file:
+            flock(lock_file, LOCK_EX)
+            yield
+
+    def write(self, entries: dict[str, dict]):
+        with NamedTemporaryFile(
+            "w",
+            dir=self.path.parent,
+            prefix=f"{self.path.name}.",
+            suffix=".part",
+            delete=False,
+        ) as partial_file:
+            partial_path = Path(partial_file.name)
+            partial_file.write(dumps(entries, indent=2))
+        try:
+            partial_path.replace(self.path)
+        except OSError:
+            partial_path.unlink(missing_ok=True)
+            raise
+
+    def get(self, report: Report) -> dict:
+        with self.lock:
+            return self.read().get(report.key, dict())
+
+    def update(self, report: Report, status: str, **values):
+        try:
+            with self.locked():
+                entries = self.read()
+                entries[report.key] = entries.get(report.key, dict()) | {
+                    "report_type": report.report_type.value,
+                    "term": report.term,
+                    "instance": report.instance.value,
+                    "status": status,
+                    "updated_at": datetime.now(timezone.utc).isoformat(),
+                    **values,
+                }
+                self.write(entries)
+        except OSError as error:
+            logger.error(f"Failed to update report manifest {self.path}: {error}")
 
 
 def get_report_statuses(reports: list[Report]) -> list[str]:
@@ -185,46 +288,286 @@ def get_progress_status(reports: list[Report]) -> Optional[str]:
     )
 
 
+def get_zip_report_path(report: Report, base_path: Path) -> Path:
+    return base_path / f"{report.report_type.value}{report.file_name}.zip"
+
+
+def get_zip_report_members(zip_path: Path) -> list[ReportPath]:
+    with ZipFile(zip_path) as zip_file:
+        names = zip_file.namelist()
+    return [ZipPath(zip_path, name) for name in names if name.endswith(".csv")]
+
+
+def open_report(path: ReportPath) -> IO[bytes]:
+    if isinstance(path, ZipPath):
+        return path.open("rb")
+    if is_zipfile(path):
+        members = get_zip_report_members(path)
+        if len(members) != 1:
+            raise ValueError(f"Expected a single CSV in {path}, found {len(members)}")
+        return members[0].open("rb")
+    return open(path, "rb")
+
+
+@lru_cache
+def has_pyarrow() -> bool:
+    return find_spec("pyarrow") is not None
+
+
+def get_sidecar_path(path: ReportPath) -> Path:
+    if isinstance(path, ZipPath):
+        zip_path = Path(path.root.filename)
+        return zip_path.with_name(
+            f"{zip_path.stem}_{Path(path.at).stem}{SIDECAR_SUFFIX}"
+        )
+    return path.with_suffix(SIDECAR_SUFFIX)
+
+
+def write_report_sidecar(path: ReportPath) -> Optional[Path]:
+    if not has_pyarrow():
+        return None
+    from pandas import read_csv
+
+    sidecar_path = get_sidecar_path(path)
+    partial_path = sidecar_path.with_name(f"{sidecar_path.name}.part")
+    try:
+        with open_report(path) as report:
+            read_csv(report, dtype="string").to_feather(partial_path)
+        return partial_path.replace(sidecar_path)
+    except Exception as error:
+        logger.warning(f"Failed to write report sidecar for {path}: {error}")
+        if partial_path.exists():
+            partial_path.unlink()
+        return None
+
+
+def is_sidecar_dtype(dtype) -> bool:
+    from pandas import StringDtype
+    from pandas.api.types import is_extension_array_dtype, pandas_dtype
+
+    dtype = pandas_dtype(dtype)
+    if is_extension_array_dtype(dtype):
+        return isinstance(dtype, StringDtype)
+    return dtype.kind in SIDECAR_DTYPE_KINDS
+
+
+def get_report_sidecar(path: ReportPath, usecols=None, dtype=None) -> Optional[Path]:
+    if dtype is None or callable(usecols) or not has_pyarrow():
+        return None
+    if isinstance(dtype, dict):
+        if usecols is None or not set(usecols) <= set(dtype):
+            return None
+        dtypes = [dtype[column] for column in usecols]
+    else:
+        dtypes = [dtype]
+    if not all(is_sidecar_dtype(column_dtype) for column_dtype in dtypes):
+        return None
+    sidecar_path = get_sidecar_path(path)
+    return sidecar_path if sidecar_path.exists() else None
+
+
+def read_report_sidecar(sidecar_path: Path, usecols=None, dtype=None) -> "DataFrame":
+    from numpy import nan
+    from pandas import read_feather
+    from pandas.api.types import is_extension_array_dtype, pandas_dtype
+    from pyarrow.ipc import open_file
+
+    report = read_feather(sidecar_path, columns=usecols)
+    if usecols is not None:
+        names = open_file(sidecar_path).schema.names
+        report = report[sorted(report.columns, key=names.index)]
+    report = report.astype(object).where(report.notna(), nan)
+    for column in report.columns:
+        column_dtype = pandas_dtype(dtype[column] if isinstance(dtype, dict) else dtype)
+        if (
+            is_extension_array_dtype(column_dtype)
+            or column_dtype.kind not in TEXT_DTYPE_KINDS
+        ):
+            report[column] = report[column].astype(column_dtype)
+    return report
+
+
+def read_report_chunks(
+    path: ReportPath, usecols=None, dtype=None, chunksize=REPORT_CHUNK_SIZE
+) -> Iterator["DataFrame"]:
+    from pandas import read_csv
+
+    sidecar_path = get_report_sidecar(path, usecols, dtype)
+    if sidecar_path:
+        report = read_report_sidecar(sidecar_path, usecols, dtype)
+        for start in range(0, len(report.index), chunksize):
+            yield report.iloc[start : start + chunksize]
+        return
+    with open_report(path) as report, read_csv(
+        report, usecols=usecols, dtype=dtype, chunksize=chunksize
+    ) as chunks:
+        yield from chunks
+
+
+def read_report(
+    path: ReportPath, usecols=None, dtype=None, chunksize: Optional[int] = None
+) -> "DataFrame | Iterator[DataFrame]":
+    from pandas import read_csv
+
+    if chunksize:
+        return read_report_chunks(path, usecols, dtype, chunksize)
+    sidecar_path = get_report_sidecar(path, usecols, dtype)
+    if sidecar_path:
+        return read_report_sidecar(sidecar_path, usecols, dtype)
+    with open_report(path) as report:
+        return read_csv(report, usecols=usecols, dtype=dtype)
+
+
 def download_report(
     report: Report, base_path: Path, verbose: bool
-) -> Optional[Path | list[Path]]:
+) -> Optional[ReportPath | list[ReportPath]]:
     if not report.account_report:
         return None
-    file_name_replacement = report.file_name
     account_report = report.account_report
-    report_paths: Path | list[Path]
+    report_paths: ReportPath | list[ReportPath]
     try:
         filename: str = account_report.attachment["filename"]
         url = account_report.attachment["url"]
         report_path = base_path / filename
-        download_file(report_path, url)
+        if not download_file(report_path, url):
+            if verbose:
+                echo(f"ERROR: Failed to download {filename}")
+            return None
         if account_report.attachment["mime_class"] == "zip":
-            export_path = base_path / filename.replace(".zip", "")
-            with ZipFile(report_path) as unzipper:
-                unzipper.extractall(export_path)
-            paths = [
-                path.replace(
-                    base_path / f"{path.stem}{file_name_replacement}{path.suffix}"
-                )
-                for path in export_path.glob("*.csv")
-            ]
-            remove(report_path)
-            rmtree(export_path)
-            report_paths = paths
+            zip_path = report_path.replace(get_zip_report_path(report, base_path))
+            report_paths = get_zip_report_members(zip_path)
         else:
             report_paths = report_path.replace(
                 base_path / f"{report.file_name}{report_path.suffix}"
             )
+        for path in make_list(report_paths):
+            write_report_sidecar(path)
         return report_paths
     except Exception as error:
         logger.error(error)
         if verbose:
             echo(f"ERROR: {error}")
-        account_report.delete_report()
         return None
 
 
-def print_report_paths(report_paths: list[Path]):
+def get_latest_report_snapshot(report: Report) -> Optional[Path]:
+    snapshots = sorted(get_reports_directory().glob(f"*/{report.file_name}.csv"))
+    return snapshots[-1] if snapshots else None
+
+
+def get_snapshot_time(snapshot: Path) -> datetime:
+    modified = datetime.fromtimestamp(snapshot.stat().st_mtime, tz=timezone.utc)
+    return modified - INCREMENTAL_OVERLAP
+
+
+def get_changed_course_ids(report: Report, since: datetime) -> list[int]:
+    events = PaginatedList(
+        CanvasObject,
+        get_requester(report.instance),
+        "GET",
+        f"audit/course/accounts/{report.account}",
+        _root="events",
+        start_time=since.isoformat(),
+    )
+    return sorted({event.links["course"] for event in iterate_pages(events)})
+
+
+def get_changed_course(course_id: int, instance: Instance):
+    try:
+        return get_canvas(instance, verbose=False).get_course(course_id)
+    except Exception as error:
+        logger.warning(f"Failed to get changed course {course_id}: {error}")
+        return None
+
+
+def get_course_report_row(course) -> dict[str, Optional[str]]:
+    def get_value(attribute: str) -> Optional[str]:
+        value = getattr(course, attribute, None)
+        return None if value is None else str(value)
+
+    return {
+        "canvas_course_id": str(course.id),
+        "course_id": get_value("sis_course_id"),
+        "integration_id": get_value("integration_id"),
+        "short_name": get_value("course_code"),
+        "long_name": get_value("name"),
+        "canvas_account_id": get_value("account_id"),
+        "canvas_term_id": get_value("enrollment_term_id"),
+        "status": COURSE_STATUSES.get(course.workflow_state, course.workflow_state),
+        "start_date": get_value("start_at"),
+        "end_date": get_value("end_at"),
+    }
+
+
+def patch_course_report(
+    report: "DataFrame",
+    courses: Iterable,
+    canvas_term_id: Optional[str] = None,
+    term: Optional[str] = None,
+) -> "DataFrame":
+    from pandas import DataFrame, concat
+
+    rows = [get_course_report_row(course) for course in courses if course]
+    if not rows:
+        return report
+    columns = list(report.columns)
+    report = report.set_index("canvas_course_id")
+    changes = DataFrame(rows).set_index("canvas_course_id")
+    changes = changes[[column for column in changes.columns if column in columns]]
+    if canvas_term_id:
+        other_terms = changes["canvas_term_id"] != canvas_term_id
+        report = report.drop(changes.index[other_terms], errors="ignore")
+        changes = changes[~other_terms]
+    existing = changes.index.isin(report.index)
+    updates = changes[existing]
+    report.loc[updates.index, updates.columns] = updates
+    additions = changes[~existing].assign(term_id=term)
+    report = concat([report, additions])
+    return report.reset_index()[columns].astype("string")
+
+
+def refresh_report(
+    report: Report, base_path: Path, verbose: bool
+) -> Optional[ReportPath | list[ReportPath]]:
+    if report.report_type != ReportType.COURSES:
+        if verbose:
+            echo(f"Incremental refresh is not available for {report.report_type.value}")
+        return None
+    snapshot = get_latest_report_snapshot(report)
+    if not snapshot:
+        return None
+    try:
+        course_ids = get_changed_course_ids(report, get_snapshot_time(snapshot))
+        courses = map_rows(
+            course_ids,
+            lambda course_id: get_changed_course(course_id, report.instance),
+            REPORT_WORKERS,
+        )
+        canvas_term_id = report.parameters.get("enrollment_term_id")
+        patched_report = patch_course_report(
+            read_report(snapshot, dtype="string"),
+            courses,
+            str(canvas_term_id) if canvas_term_id else None,
+            report.term,
+        )
+        report_path = base_path / f"{report.file_name}.csv"
+        partial_path = report_path.with_name(f"{report_path.name}.part")
+        patched_report.to_csv(partial_path, index=False)
+        get_sidecar_path(report_path).unlink(missing_ok=True)
+        partial_path.replace(report_path)
+        write_report_sidecar(report_path)
+    except Exception as error:
+        logger.error(f"Failed to refresh {report.file_name}: {error}")
+        if verbose:
+            echo(f"ERROR: Failed to refresh {report.file_name} ({error})")
+        return None
+    if verbose:
+        pluralized_course = pluralize("course", len(course_ids))
+        echo(f"Refreshed {len(course_ids)} changed {pluralized_course} from {snapshot}")
+    return report_path
+
+
+def print_report_paths(report_paths: list[ReportPath]):
     for path in report_paths:
         echo(f'REPORT: {color(path, "blue")}')
 
@@ -252,101 +595,214 @@ def flatten(irregular_nested_list: list[list | Any]) -> list:
     return list(get_flatten_generator(irregular_nested_list))
 
 
-def flatten_paths(paths: list[Path | list[Path]]) -> list[Path]:
+def flatten_paths(paths: list[ReportPath | list[ReportPath]]) -> list[ReportPath]:
     return flatten(paths)
 
 
-def create_reports(
+def get_cached_report_paths(
+    report: Report, base_path: Path
+) -> Optional[ReportPath | list[ReportPath]]:
+    if report.force or report.incremental:
+        return None
+    if report.report_type == ReportType.PROVISIONING:
+        zip_path = get_zip_report_path(report, base_path)
+        return get_zip_report_members(zip_path) if zip_path.exists() else None
+    report_path = base_path / f"{report.file_name}.csv"
+    return report_path if report_path.exists() else None
+
+
+def print_report_progress(report: Report):
+    account_report = report.account_report
+    progress = account_report.status if account_report else ""
+    report_type = account_report.report if account_report else report.report_type.name
+    term_display = f" {report.term}" if report.term else ""
+    report_display = color(f"{report_type}{term_display}", "cyan")
+    echo(f"\t* {report_display} {progress}...")
+
+
+def handle_failed_report(report: Report, verbose: bool):
+    account_report = report.account_report
+    if verbose:
+        try:
+            last_run_text = (
+                account_report.last_run["paramters"]["extra_text"]
+                if account_report
+                else ""
+            )
+            echo(f"ERROR: {last_run_text}")
+        except Exception as error:
+            logger.error(error)
+            echo("ERROR: The report failed to generate a file. Please try again.")
+    if account_report:
+        account_report.delete_report()
+
+
+class ReportScheduler:
+    def __init__(
+        self,
+        base_path: Optional[Path] = None,
+        verbose=False,
+        workers=REPORT_WORKERS,
+        delay=REPORT_POLL_DELAY,
+        maximum_delay=REPORT_POLL_MAXIMUM_DELAY,
+        backoff=REPORT_POLL_BACKOFF,
+        timeout=REPORT_TIMEOUT,
+    ):
+        self.base_path = base_path or get_current_reports_directory()
+        self.verbose = verbose
+        self.delay = delay
+        self.maximum_delay = maximum_delay
+        self.backoff = backoff
+        self.timeout = timeout
+        self.executor = ThreadPoolExecutor(max_workers=workers)
+        self.manifest = ReportManifest(self.base_path / REPORT_MANIFEST)
+        self.futures: dict[str, Future] = dict()
+        self.futures_lock = Lock()
+
+    def __enter__(self) -> "ReportScheduler":
+        return self
+
+    def __exit__(self, *exception):
+        self.shutdown()
+
+    def submit(
+        self, report: Report, callback: Optional[Callable[[Report], None]] = None
+    ) -> Future:
+        with self.futures_lock:
+            future = self.futures.get(report.key) or self.schedule(report)
+            self.futures[report.key] = future
+        if callback:
+            future.add_done_callback(lambda _: callback(report))
+        return future
+
+    def schedule(self, report: Report) -> Future:
+        cached_paths = get_cached_report_paths(report, self.base_path)
+        if not cached_paths:
+            return self.executor.submit(self.run, report)
+        report.report_paths = cached_paths
+        self.update_manifest(report, "cached")
+        future: Future = Future()
+        future.set_result(cached_paths)
+        return future
+
+    def update_manifest(self, report: Report, status: str):
+        paths = make_list(report.report_paths) if report.report_paths else list()
+        account_report = report.account_report
+        self.manifest.update(
+            report,
+            status,
+            report_id=account_report.id if account_report else None,
+            paths=[str(path) for path in paths],
+        )
+
+    def start_report(self, report: Report):
+        entry = self.manifest.get(report)
+        report_id = entry.get("report_id")
+        if not report.force and report_id and entry["status"] in IN_PROGRESS_STATUSES:
+            logger.info(f"Attaching to report {report_id} for {report.key}")
+            report.get_account_report(report_id)
+        else:
+            report.create_account_report()
+        self.update_manifest(report, getattr(report.account_report, "status", "failed"))
+
+    def wait_for_report(self, report: Report):
+        delay = self.delay
+        started_at = monotonic()
+        while (
+            report.account_report
+            and report.account_report.status in {"created", "running"}
+            and monotonic() - started_at < self.timeout
+        ):
+            print_report_progress(report)
+            sleep(delay)
+            report.update_account_report()
+            delay = min(delay * self.backoff, self.maximum_delay)
+
+    def run(self, report: Report) -> Optional[ReportPath | list[ReportPath]]:
+        if report.incremental:
+            report.report_paths = refresh_report(report, self.base_path, self.verbose)
+            if report.report_paths:
+                return report.report_paths
+        self.start_report(report)
+        self.wait_for_report(report)
+        if report.account_report and report.account_report.status == "complete":
+            report.report_paths = download_report(report, self.base_path, self.verbose)
+            self.update_manifest(
+                report, "complete" if report.report_paths else "failed"
+            )
+        else:
+            self.update_manifest(report, "failed")
+            handle_failed_report(report, self.verbose)
+        return report.report_paths
+
+    def shutdown(self):
+        self.executor.shutdown(wait=True)
+
+
+def iterate_reports(
     reports: Report | list[Report],
-    base_path=REPORTS,
+    base_path: Optional[Path] = None,
     verbose=False,
-) -> list[Path]:
-    reports = make_list(reports)
+    workers=REPORT_WORKERS,
+) -> Iterator[tuple[Report, Optional[ReportPath | list[ReportPath]]]]:
+    base_path = base_path or get_current_reports_directory()
+    reports = list({report.key: report for report in make_list(reports)}.values())
+    reports_to_run = list()
+    completed_reports = list()
     for report in reports:
-        if report.report_type == ReportType.PROVISIONING:
-            report_paths = [
-                base_path / f"users{report.file_name}.csv",
-                base_path / f"courses{report.file_name}.csv",
-            ]
-            existing_paths = all(path.exists() for path in report_paths)
-        else:
-            report_path = base_path / f"{report.file_name}.csv"
-            existing_paths = report_path.exists()
-            report_paths = report_path
-        if report.force or not existing_paths:
-            report.create_account_report()
+        if get_cached_report_paths(report, base_path):
+            completed_reports.append(report)
         else:
-            report.report_paths = report_paths
-    report_paths = [report.report_paths for report in reports]
-    if all(report_paths):
-        completed_paths_list = [
-            report.report_paths for report in reports if report.report_paths
-        ]
-        completed_paths = flatten_paths(completed_paths_list)
-        if verbose:
-            print_report_paths(completed_paths)
-        return completed_paths
-    reports_to_run = [report for report in reports if not report.report_paths]
-    completed_reports = [report for report in reports if report.report_paths]
-    if completed_reports:
-        completed_report_displays = get_report_displays(completed_reports)
-        echo(
-            f"{color('Using cached report for', 'yellow')}: {completed_report_displays}"
-        )
-    report_displays = [get_report_display(report) for report in reports_to_run]
-    reports_to_run_display = get_report_displays(reports_to_run)
-    pluralized_report = pluralize("report", len(report_displays))
-    echo(f") Generating {reports_to_run_display} {pluralized_report}...")
-    attempts = 0
-    status = get_progress_status(reports_to_run)
-    while status and attempts <= 180:
-        for report in reports_to_run:
-            account_report = report.account_report
-            progress = account_report.status if account_report else ""
-            report_type = (
-                account_report.report if account_report else report.report_type.name
+            reports_to_run.append(report)
+    if reports_to_run:
+        if completed_reports:
+            completed_report_displays = get_report_displays(completed_reports)
+            echo(
+                f"{color('Using cached report for', 'yellow')}:"
+                f" {completed_report_displays}"
             )
-            term_display = f" {report.term}" if report.term else ""
-            report_display = color(f"{report_type}{term_display}", "cyan")
-            echo(f"\t* {report_display} {progress}...")
-        sleep(5)
-        for report in reports_to_run:
-            report.update_account_report()
-        status = get_progress_status(reports_to_run)
-        attempts += 1
-    failed_reports = [
-        report
-        for report in reports_to_run
-        if report.account_report and report.account_report.status != "complete"
-    ]
-    if failed_reports:
-        for report in failed_reports:
-            account_report = report.account_report
-            if verbose:
-                try:
-                    last_run_text = (
-                        account_report.last_run["paramters"]["extra_text"]
-                        if account_report
-                        else ""
-                    )
-                    echo(f"ERROR: {last_run_text}")
-                except Exception as error:
-                    logger.error(error)
-                    echo(
-                        "ERROR: The report failed to generate a file. Please try again."
-                    )
-            if account_report:
-                account_report.delete_report()
-    if verbose:
+        reports_to_run_display = get_report_displays(reports_to_run)
+        pluralized_report = pluralize("report", len(reports_to_run))
+        echo(f") Generating {reports_to_run_display} {pluralized_report}...")
+    finished: Queue[Report] = Queue()
+    with ReportScheduler(base_path, verbose, workers) as scheduler:
+        futures = {
+            report.key: scheduler.submit(report, finished.put) for report in reports
+        }
+        for _ in futures:
+            report = finished.get()
+            yield report, futures[report.key].result()
+    if reports_to_run and verbose:
         echo("COMPLETE")
-    for report in reports_to_run:
-        report.report_paths = download_report(report, base_path, verbose)
-    completed_paths_list = [
-        report.report_paths for report in reports_to_run if report.report_paths
-    ]
-    completed_paths = flatten_paths(completed_paths_list)
-    if verbose:
-        print_report_paths(completed_paths)
+
+
+def run_reports(
+    reports: Report | list[Report],
+    base_path: Optional[Path] = None,
+    verbose=False,
+    workers=REPORT_WORKERS,
+) -> list[Optional[ReportPath | list[ReportPath]]]:
+    reports = make_list(reports)
+    report_paths = {
+        report.key: paths
+        for report, paths in iterate_reports(reports, base_path, verbose, workers)
+    }
+    return [report_paths[report.key] for report in reports]
+
+
+def create_reports(
+    reports: Report | list[Report],
+    base_path: Optional[Path] = None,
+    verbose=False,
+) -> list[ReportPath]:
+    completed_paths = list()
+    for _, paths in iterate_reports(reports, base_path, verbose):
+        if not paths:
+            continue
+        paths = make_list(paths)
+        if verbose:
+            print_report_paths(paths)
+        completed_paths.extend(paths)
     return completed_paths
 
 
@@ -356,7 +812,8 @@ def get_report(
     force=False,
     instance_name: str | Instance = Instance.PRODUCTION,
     verbose=False,
-) -> list[Path]:
+    incremental=False,
+) -> list[ReportPath]:
     instance = validate_instance_name(instance_name, verbose=verbose)
     switch_logger_file(LOGS, "report", instance.name)
     if report == "weekly":
@@ -376,12 +833,80 @@ def get_report(
     else:
         report_type = validate_report_type(report)
         return create_reports(
-            Report(report_type, instance=instance, term=term, force=force),
+            Report(
+                report_type,
+                instance=instance,
+                term=term,
+                force=force,
+                incremental=incremental,
+            ),
             verbose=verbose,
         )
 
 
-def get_single_report(report_object: Report, verbose: bool) -> Path:
+def get_report_matrix(
+    report_types: Iterable[str | ReportType],
+    terms: Iterable[Optional[str]],
+    instances: Iterable[Instance],
+    force=False,
+    incremental=False,
+) -> list[Report]:
+    terms = list(terms)
+    expanded_report_types: list[ReportType] = list()
+    for report_type in report_types:
+        if report_type == "weekly":
+            expanded_report_types.extend([ReportType.STORAGE, ReportType.PROVISIONING])
+        else:
+            expanded_report_types.append(validate_report_type(report_type))
+    reports = {
+        report.key: report
+        for report in (
+            Report(
+                report_type,
+                instance=instance,
+                term=term,
+                force=force,
+                incremental=incremental,
+            )
+            for instance in instances
+            for report_type, term in product(
+                dict.fromkeys(expanded_report_types),
+                terms or [get_current_year_and_term(instance)],
+            )
+        )
+    }
+    return list(reports.values())
+
+
+def print_report_status(report: Report, manifest: ReportManifest):
+    status = manifest.get(report).get("status", "unknown")
+    status_color = "red" if status == "failed" else "green"
+    echo(f"\t* {color(report.key, 'cyan')}: {color(status, status_color)}")
+
+
+def create_report_matrix(
+    report_types: Iterable[str | ReportType],
+    terms: Iterable[Optional[str]],
+    instances: Iterable[Instance],
+    force=False,
+    incremental=False,
+    verbose=False,
+    workers=REPORT_WORKERS,
+) -> dict[str, list[ReportPath]]:
+    base_path = get_current_reports_directory()
+    manifest = ReportManifest(base_path / REPORT_MANIFEST)
+    reports = get_report_matrix(report_types, terms, instances, force, incremental)
+    report_paths: dict[str, list[ReportPath]] = dict()
+    echo(f"{color('REPORTS', 'yellow')}:")
+    for report, paths in iterate_reports(reports, base_path, verbose, workers):
+        report_paths[report.key] = make_list(paths) if paths else list()
+        print_report_status(report, manifest)
+        if verbose:
+            print_report_paths(report_paths[report.key])
+    return {report.key: report_paths[report.key] for report in reports}
+
+
+def get_single_report(report_object: Report, verbose: bool) -> ReportPath:
     reports = create_reports(report_object, verbose=verbose)
     try:
         return next(report for report in reports)
@@ -391,6 +916,7 @@ def get_single_report(report_object: Report, verbose: bool) -> Path:
 
 
 def get_course_ids_from_reports(terms, instance, force_report, verbose):
+    terms = get_term_names(terms, instance)
     if verbose:
         term_displays = ", ".join(style(term, bold=True) for term in terms)
         echo(f"{pluralize('TERM', len(terms))}: {term_displays}")
@@ -398,19 +924,50 @@ def get_course_ids_from_reports(terms, instance, force_report, verbose):
         Report(ReportType.COURSES, instance=instance, term=term, force=force_report)
         for term in terms
     ]
-    report_paths = create_reports(report_objects, verbose=verbose)
+    course_ids: dict[str, list[int]] = dict()
+    for report, paths in iterate_reports(report_objects, verbose=verbose):
+        paths = make_list(paths) if paths else list()
+        if verbose:
+            print_report_paths(paths)
+        course_ids[report.key] = [
+            course_id
+            for path in paths
+            for chunk in read_report(
+                path,
+                usecols=["canvas_course_id"],
+                dtype={"canvas_course_id": int},
+                chunksize=REPORT_CHUNK_SIZE,
+            )
+            for course_id in chunk["canvas_course_id"].tolist()
+        ]
     return [
-        course_id_list
-        for path in report_paths
-        for course_id_list in read_csv(path)["canvas_course_id"].tolist()
+        course_id
+        for report in report_objects
+        for course_id in course_ids.get(report.key, list())
     ]
 
 
 def report_main(
-    report_type: str | ReportType,
-    term_name: str,
+    report_types: str | ReportType | list[str | ReportType],
+    term_names: str | list[str],
     force: bool,
-    instance: str | Instance,
+    instance_names: str | Instance | list[str | Instance],
     verbose: bool,
+    incremental: bool = False,
+    workers: int = REPORT_WORKERS,
 ):
-    get_report(report_type, term_name, force, instance, verbose)
+    instances = [
+        validate_instance_name(instance_name, verbose=verbose)
+        for instance_name in make_list(instance_names)
+    ]
+    instance_name = instances[0].name if len(instances) == 1 else None
+    switch_logger_file(LOGS, "report", instance_name)
+    create_report_matrix(
+        make_list(report_types),
+        make_list(term_names),
+        instances,
+        force,
+        incremental,
+        verbose,
+        workers,
+    )
@@ -1,18 +1,19 @@
 from loguru import logger
 from pandas import DataFrame
 
-from penn_canvas.api import get_account, get_sub_account_ids, validate_instance_name
+from penn_canvas.accounts import get_sub_account_ids
+from penn_canvas.api import get_account, validate_instance_name
 from penn_canvas.helpers import (
     BASE_PATH,
     TODAY_AS_Y_M_D,
-    create_directory,
+    create_directories,
     switch_logger_file,
 )
 from penn_canvas.style import print_item
 
-COMMAND_PATH = create_directory(BASE_PATH / "Roles")
-RESULTS = create_directory(COMMAND_PATH / "Results")
-LOGS = create_directory(COMMAND_PATH / "Logs")
+COMMAND_PATH = BASE_PATH / "Roles"
+RESULTS = COMMAND_PATH / "Results"
+LOGS = COMMAND_PATH / "Logs"
 
 
 def get_role_data(account_id, permission, instance, verbose):
@@ -38,6 +39,7 @@ def get_role_data(account_id, permission, instance, verbose):
 def roles_main(permission: str, instance_name: str, verbose: bool):
     instance = validate_instance_name(instance_name)
     switch_logger_file(LOGS, "roles", instance.name)
+    create_directories(RESULTS)
     try:
         account_ids = [
             int(account) for account in get_sub_account_ids(instance=instance)
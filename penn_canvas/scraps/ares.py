@@ -2,8 +2,8 @@ from pathlib import Path
 
 from pandas.core.frame import DataFrame
 
-from penn_canvas.api import get_enrollment_term_id
 from penn_canvas.style import print_item
+from penn_canvas.terms import get_enrollment_term_id
 from sandbox import ACCOUNT
 
 
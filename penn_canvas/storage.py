@@ -1,10 +1,11 @@
+from functools import partial
 from pathlib import Path
 
 from click.termui import style
 from loguru import logger
 from pandas import isna, read_csv
 from pandas.core.frame import DataFrame
-from typer import echo, progressbar
+from typer import echo
 
 from .api import Instance, format_instance_name, get_course, validate_instance_name
 from .helpers import (
@@ -14,21 +15,24 @@ from .helpers import (
     MONTH,
     TODAY_AS_Y_M_D,
     YEAR,
+    ResultWriter,
     color,
+    create_directories,
     create_directory,
     get_start_index,
     make_csv_paths,
     make_index_headers,
     print_skip_message,
+    process_rows,
     switch_logger_file,
 )
 from .notifier import send_email
-from .report import Report, ReportType, get_single_report
+from .report import Report, ReportPath, ReportType, get_single_report, read_report
 from .style import print_item
 
-COMMAND_PATH = create_directory(BASE_PATH / "Storage")
-RESULTS = create_directory(COMMAND_PATH / "Results")
-LOGS = create_directory(COMMAND_PATH / "Logs")
+COMMAND_PATH = BASE_PATH / "Storage"
+RESULTS = COMMAND_PATH / "Results"
+LOGS = COMMAND_PATH / "Logs"
 HEADERS = [
     "id",
     "sis id",
@@ -38,6 +42,12 @@ HEADERS = [
     "new quota",
     "error",
 ]
+REPORT_DTYPES = {
+    "id": "string",
+    "sis id": "string",
+    "account id": "string",
+    "storage used in MB": float,
+}
 SUB_ACCOUNTS = [
     "132477",
     "99243",
@@ -58,12 +68,15 @@ SUB_ACCOUNTS = [
 ]
 
 
-def process_report(report_path: Path, start: int) -> tuple[DataFrame, int]:
-    report = read_csv(report_path)
+def process_report(report_path: ReportPath, start: int) -> tuple[DataFrame, int]:
+    report = read_report(
+        report_path,
+        usecols=HEADERS[:4],
+        dtype=REPORT_DTYPES,
+    )
     report = report.loc[:, HEADERS[:4]]
     report = report[report["storage used in MB"] > 0].copy()
     report = report.sort_values(by=["storage used in MB"])
-    report = report.astype("string", errors="ignore")
     report = report[report["account id"].isin(SUB_ACCOUNTS)]
     report = report.reset_index(drop=True)
     total = len(report.index)
@@ -160,14 +173,8 @@ def print_messages(total: int, increased: int, errors: int):
 
 
 def check_and_increase_storage(
-    report: DataFrame,
-    course: tuple,
-    total: int,
-    increment_value: int,
-    result_path: Path,
-    instance: Instance,
-    verbose: bool,
-):
+    course: tuple, increment_value: int, instance: Instance
+) -> tuple[int, str, list, str]:
     index, canvas_account_id, sis_id = course[:3]
     course_code, needs_increase, message = check_percent_storage(course, instance)
     new_quota = old_quota = None
@@ -182,10 +189,22 @@ def check_and_increase_storage(
         canvas_account_id = "ERROR"
         status = message
     row = [canvas_account_id, sis_id, old_quota, new_quota, status]
+    return index, course_code, row, status
+
+
+def write_storage_result(
+    report: DataFrame,
+    result: tuple[int, str, list, str],
+    total: int,
+    result_writer: ResultWriter,
+    verbose: bool,
+):
+    index, course_code, row, status = result
     columns = ["id", "sis id", "old quota", "new quota", "error"]
     report.loc[index, columns] = row
-    report.loc[index].to_frame().T.to_csv(result_path, mode="a", header=False)
+    result_writer.write_report_row(report, index)
     if verbose:
+        old_quota, new_quota = row[2:4]
         increased = old_quota and new_quota
         display_color = "red" if status == "course not found" else "yellow"
         increased_display = style("INCREASED", bold=True)
@@ -206,9 +225,11 @@ def storage_main(
     force: bool,
     force_report: bool,
     verbose: bool,
+    workers: int = 1,
 ):
     instance = validate_instance_name(instance_name, verbose=True)
     switch_logger_file(LOGS, "course_storage", instance.name)
+    create_directories(RESULTS)
     result_path = RESULTS / f"{TODAY_AS_Y_M_D}_storage_result_{instance.name}.csv"
     start = get_start_index(force, result_path)
     print_skip_message(start, "course")
@@ -217,23 +238,25 @@ def storage_main(
     report, total = process_report(report_path, start)
     make_csv_paths(result_path, make_index_headers(HEADERS))
     echo(") Processing courses...")
-    if verbose:
-        for course in report.itertuples():
-            check_and_increase_storage(
-                report, course, total, increment_value, result_path, instance, verbose
-            )
-    else:
-        with progressbar(report.itertuples(), length=total) as progress:
-            for course in progress:
-                check_and_increase_storage(
-                    report,
-                    course,
-                    total,
-                    increment_value,
-                    result_path,
-                    instance,
-                    verbose,
-                )
+    with ResultWriter(result_path) as result_writer:
+        process_rows(
+            report.itertuples(),
+            partial(
+                check_and_increase_storage,
+                increment_value=increment_value,
+                instance=instance,
+            ),
+            partial(
+                write_storage_result,
+                report,
+                total=total,
+                result_writer=result_writer,
+                verbose=verbose,
+            ),
+            verbose,
+            workers,
+            length=len(report.index),
+        )
     increased_count, error_count = process_result(result_path, instance)
     print_messages(total, increased_count, error_count)
 
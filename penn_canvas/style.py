@@ -1,8 +1,8 @@
 from enum import Enum
+from functools import lru_cache
 from pprint import PrettyPrinter
 from typing import Any
 
-from inflect import engine
 from typer import colors, echo, style
 
 COLORS = {
@@ -56,5 +56,12 @@ def pprint(item: object):
         PrettyPrinter().pprint(vars(item))
 
 
+@lru_cache
+def get_inflect_engine():
+    from inflect import engine
+
+    return engine()
+
+
 def pluralize(string: str, condition=None) -> str:
-    return engine().plural(string, condition)
+    return get_inflect_engine().plural(string, condition)
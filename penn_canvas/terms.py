@@ -0,0 +1,213 @@
+from bisect import bisect_left
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from json import dumps, loads
+from pathlib import Path
+from threading import Lock
+from time import time
+from typing import Optional
+
+from loguru import logger
+from pytz import utc
+from typer import Exit, echo
+
+from .api import Instance, format_instance_name, get_account, get_main_account_id
+from .cache import DAY
+from .config import CONFIG_DIRECTORY
+from .helpers import (
+    CURRENT_YEAR_AND_TERM,
+    NEXT_YEAR_AND_TERM,
+    PREVIOUS_YEAR_AND_TERM,
+    create_directory,
+    make_list,
+)
+from .pagination import iterate_pages
+
+TERM_CATALOG_TTL = DAY
+TERM_CATALOG_MISS_TTL = 5 * 60
+TERM_CATALOGS: dict[Instance, "TermCatalog"] = dict()
+TERM_CATALOGS_LOCK = Lock()
+
+
+@dataclass
+class EnrollmentTerm:
+    id: int
+    name: str
+    sis_term_id: Optional[str] = None
+    start_at: Optional[str] = None
+    end_at: Optional[str] = None
+
+
+def parse_term_date(date: Optional[str]) -> Optional[datetime]:
+    return datetime.fromisoformat(date.replace("Z", "+00:00")) if date else None
+
+
+@dataclass
+class TermCatalog:
+    terms: list[EnrollmentTerm]
+    fetched_at: float = field(default_factory=time)
+    by_name: dict[str, EnrollmentTerm] = field(init=False, repr=False)
+    by_sis_term_id: dict[str, EnrollmentTerm] = field(init=False, repr=False)
+    names: list[str] = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self.terms = [
+            term if isinstance(term, EnrollmentTerm) else EnrollmentTerm(**term)
+            for term in self.terms
+        ]
+        self.by_name = {term.name: term for term in reversed(self.terms)}
+        self.by_sis_term_id = {
+            term.sis_term_id: term for term in reversed(self.terms) if term.sis_term_id
+        }
+        self.names = sorted(self.by_name)
+
+    def is_expired(self, ttl=TERM_CATALOG_TTL) -> bool:
+        return time() - self.fetched_at > ttl
+
+    def find(self, term_name: str) -> Optional[EnrollmentTerm]:
+        term = self.by_name.get(term_name) or self.by_sis_term_id.get(term_name)
+        if term:
+            return term
+        position = bisect_left(self.names, term_name)
+        if position < len(self.names) and self.names[position].startswith(term_name):
+            return self.by_name[self.names[position]]
+        return next((term for term in self.terms if term_name in term.name), None)
+
+    def get_dated_terms(self) -> list[tuple[datetime, datetime, EnrollmentTerm]]:
+        dated_terms = list()
+        for term in self.terms:
+            start, end = parse_term_date(term.start_at), parse_term_date(term.end_at)
+            if start and end:
+                dated_terms.append((start, end, term))
+        return sorted(dated_terms, key=lambda dated_term: dated_term[0])
+
+    def get_current_term(
+        self, now: Optional[datetime] = None
+    ) -> Optional[EnrollmentTerm]:
+        now = now or datetime.now(utc)
+        current_terms = [
+            term for start, end, term in self.get_dated_terms() if start <= now < end
+        ]
+        return current_terms[-1] if current_terms else None
+
+    def get_next_term(self, now: Optional[datetime] = None) -> Optional[EnrollmentTerm]:
+        now = now or datetime.now(utc)
+        return next(
+            (term for start, _, term in self.get_dated_terms() if start > now), None
+        )
+
+    def get_previous_term(
+        self, now: Optional[datetime] = None
+    ) -> Optional[EnrollmentTerm]:
+        now = now or datetime.now(utc)
+        previous_terms = [
+            (end, term) for _, end, term in self.get_dated_terms() if end <= now
+        ]
+        if not previous_terms:
+            return None
+        return max(previous_terms, key=lambda previous_term: previous_term[0])[1]
+
+    def to_dict(self) -> dict:
+        return {
+            "terms": [asdict(term) for term in self.terms],
+            "fetched_at": self.fetched_at,
+        }
+
+
+def get_term_catalog_path(instance: Instance) -> Path:
+    return CONFIG_DIRECTORY / f"terms{format_instance_name(instance)}.json"
+
+
+def load_term_catalog(path: Path) -> Optional[TermCatalog]:
+    if not path.is_file():
+        return None
+    try:
+        return TermCatalog(**loads(path.read_text()))
+    except (TypeError, ValueError) as error:
+        logger.warning(f"Ignoring unreadable term catalog {path}: {error}")
+        return None
+
+
+def save_term_catalog(term_catalog: TermCatalog, path: Path):
+    create_directory(path.parent)
+    partial_path = path.with_name(f"{path.name}.part")
+    partial_path.write_text(dumps(term_catalog.to_dict()))
+    partial_path.replace(path)
+
+
+def fetch_term_catalog(instance: Instance) -> TermCatalog:
+    account = get_account(get_main_account_id(instance), instance=instance)
+    terms = [
+        EnrollmentTerm(
+            term.id,
+            term.name,
+            getattr(term, "sis_term_id", None),
+            getattr(term, "start_at", None),
+            getattr(term, "end_at", None),
+        )
+        for term in iterate_pages(account.get_enrollment_terms())
+    ]
+    return TermCatalog(terms)
+
+
+def get_term_catalog(instance=Instance.PRODUCTION, refresh=False) -> TermCatalog:
+    with TERM_CATALOGS_LOCK:
+        term_catalog = None if refresh else TERM_CATALOGS.get(instance)
+        path = get_term_catalog_path(instance)
+        if not term_catalog or term_catalog.is_expired():
+            term_catalog = None if refresh else load_term_catalog(path)
+        if not term_catalog or term_catalog.is_expired():
+            term_catalog = fetch_term_catalog(instance)
+            save_term_catalog(term_catalog, path)
+        TERM_CATALOGS[instance] = term_catalog
+        return term_catalog
+
+
+def find_enrollment_term(
+    term_name: str, instance=Instance.PRODUCTION
+) -> Optional[EnrollmentTerm]:
+    term_catalog = get_term_catalog(instance)
+    term = term_catalog.find(term_name)
+    if not term and term_catalog.is_expired(ttl=TERM_CATALOG_MISS_TTL):
+        term = get_term_catalog(instance, refresh=True).find(term_name)
+    return term
+
+
+def get_enrollment_term_id(term_name: str, instance=Instance.PRODUCTION) -> int:
+    term = find_enrollment_term(term_name, instance)
+    if not term:
+        echo(f"- ERROR: Enrollment term not found: {term_name}")
+        echo("- Available enrollment terms are:")
+        for enrollment_term in get_term_catalog(instance).terms:
+            echo(f"\t{enrollment_term.name}")
+        raise Exit()
+    return term.id
+
+
+def get_year_and_term(term: Optional[EnrollmentTerm], default: str) -> str:
+    if not term:
+        return default
+    return term.sis_term_id or term.name.split(" ")[0]
+
+
+def get_current_year_and_term(instance=Instance.PRODUCTION) -> str:
+    term = get_term_catalog(instance).get_current_term()
+    return get_year_and_term(term, CURRENT_YEAR_AND_TERM)
+
+
+def get_next_year_and_term(instance=Instance.PRODUCTION) -> str:
+    term = get_term_catalog(instance).get_next_term()
+    return get_year_and_term(term, NEXT_YEAR_AND_TERM)
+
+
+def get_previous_year_and_term(instance=Instance.PRODUCTION) -> str:
+    term = get_term_catalog(instance).get_previous_term()
+    return get_year_and_term(term, PREVIOUS_YEAR_AND_TERM)
+
+
+def get_term_names(
+    term_names: Optional[str | list[str]], instance=Instance.PRODUCTION
+) -> list[str]:
+    return (
+        make_list(term_names) if term_names else [get_current_year_and_term(instance)]
+    )
@@ -1,4 +1,5 @@
 from csv import writer
+from functools import partial
 from os import remove
 from pathlib import Path
 from typing import Optional
@@ -7,9 +8,15 @@ from canvasapi.paginated_list import PaginatedList
 from canvasapi.tab import Tab
 from loguru import logger
 from pandas import DataFrame, concat, isna, read_csv
-from typer import Exit, confirm, echo, progressbar
+from typer import Exit, confirm, echo
 
-from penn_canvas.report import Report, ReportType, get_report, get_single_report
+from penn_canvas.report import (
+    Report,
+    ReportType,
+    get_report,
+    get_single_report,
+    read_report,
+)
 from penn_canvas.style import print_item
 
 from .api import (
@@ -22,23 +29,26 @@ from .api import (
 from .helpers import (
     BASE_PATH,
     YEAR,
+    ResultWriter,
     add_headers_to_empty_files,
     color,
+    create_directories,
     create_directory,
     drop_duplicate_errors,
     dynamic_to_csv,
-    get_processed,
     get_start_index,
-    handle_clear_processed,
     make_csv_paths,
     make_index_headers,
     print_skip_message,
+    process_rows,
     switch_logger_file,
 )
+from .ledger import ProcessedLedger, clear_processed_ledgers
+from .terms import get_current_year_and_term
 
-COMMAND_PATH = create_directory(BASE_PATH / "Tool")
+COMMAND_PATH = BASE_PATH / "Tool"
 PROCESSED = COMMAND_PATH / ".processed"
-LOGS = create_directory(COMMAND_PATH / "Logs")
+LOGS = COMMAND_PATH / "Logs"
 INPUT_FILE_NAME = "Canvas Provisioning (Courses) report"
 HEADERS = [
     "canvas course id",
@@ -50,6 +60,7 @@ HEADERS = [
     "status",
     "tool status",
 ]
+REPORT_COLUMNS = [header.replace(" ", "_") for header in HEADERS[:7]]
 RESERVE_ACCOUNTS = [
     "99243",
     "128877",
@@ -129,34 +140,23 @@ def process_report(
     report_path: Path,
     start: int,
     enable: int,
-    processed_courses: list[str],
-    processed_errors: list[str],
+    processed_courses: ProcessedLedger,
+    processed_errors: ProcessedLedger,
     new: bool,
     account_id: str,
 ) -> tuple[DataFrame, int]:
-    report = read_csv(report_path)
-    report = report[
-        [
-            "canvas_course_id",
-            "course_id",
-            "short_name",
-            "long_name",
-            "canvas_account_id",
-            "term_id",
-            "status",
-        ]
-    ]
+    report = read_report(report_path, usecols=REPORT_COLUMNS, dtype="string")
+    report = report[REPORT_COLUMNS]
     report.drop_duplicates(inplace=True)
     report.sort_values("course_id", inplace=True, ignore_index=True)
-    report = report.astype("string", copy=False, errors="ignore")
     if account_id:
         report = report[report["canvas_account_id"] == account_id]
     if enable:
-        report = report[~report["canvas_course_id"].isin(processed_courses)]
+        report = report[~report["canvas_course_id"].isin(list(processed_courses))]
         report.reset_index(drop=True, inplace=True)
         already_processed_count = len(processed_courses)
         if new:
-            report = report[~report["canvas_course_id"].isin(processed_errors)]
+            report = report[~report["canvas_course_id"].isin(list(processed_errors))]
             already_processed_count = already_processed_count + len(processed_errors)
         if already_processed_count:
             print_skip_message(already_processed_count, "course", current_report=True)
@@ -312,18 +312,44 @@ def get_tool_tab(tabs: PaginatedList, tool: str) -> Optional[Tab]:
 
 
 def check_tool_usage(
+    course: tuple, tool: str, enable: bool, instance: Instance
+) -> tuple[tuple, str, Optional[Exception]]:
+    canvas_course_id, canvas_account_id = course[1], course[5]
+    if (
+        enable
+        and tool == "Course Materials @ Penn Libraries"
+        and canvas_account_id not in RESERVE_ACCOUNTS
+    ):
+        return course, "unsupported", None
+    try:
+        canvas_course = get_course(canvas_course_id, instance=instance)
+        tabs = canvas_course.get_tabs()
+        tool_tab = get_tool_tab(tabs, tool)
+        if tool_tab and tool_tab.visibility == "public":
+            tool_status = "already enabled" if enable else "enabled"
+        elif tool_tab and enable:
+            tool_tab.update(hidden=False, position=3)
+            tool_status = "enabled"
+        else:
+            tool_status = "disabled"
+        return course, tool_status, None
+    except Exception as error_message:
+        logger.error(error_message)
+        return course, f"{str(error_message)}", error_message
+
+
+def write_tool_result(
     report: DataFrame,
     total: int,
-    course: tuple,
+    result: tuple[tuple, str, Optional[Exception]],
     tool: str,
     enable: bool,
-    result_path: Path,
-    processed_path: Path,
-    processed_errors: list[str],
-    processed_errors_path: Path,
-    instance: Instance,
+    result_writer: ResultWriter,
+    processed_courses: ProcessedLedger,
+    processed_errors: ProcessedLedger,
     verbose: bool,
 ):
+    course, tool_status, error_message = result
     tool_display = color(tool, "blue")
     (
         index,
@@ -333,36 +359,12 @@ def check_tool_usage(
         long_name,
         canvas_account_id,
     ) = course[:6]
-    tool_status = "not found"
-    error = False
-    if (
-        enable
-        and tool == "Course Materials @ Penn Libraries"
-        and canvas_account_id not in RESERVE_ACCOUNTS
-    ):
-        tool_status = "unsupported"
-    else:
-        try:
-            canvas_course = get_course(canvas_course_id, instance=instance)
-            tabs = canvas_course.get_tabs()
-            tool_tab = get_tool_tab(tabs, tool)
-            if tool_tab and tool_tab.visibility == "public":
-                tool_status = "already enabled" if enable else "enabled"
-            elif tool_tab and enable:
-                tool_tab.update(hidden=False, position=3)
-                tool_status = "enabled"
-            else:
-                tool_status = "disabled"
-        except Exception as error_message:
-            logger.error(error_message)
-            tool_status = f"{str(error_message)}"
-            error = True
-            if verbose:
-                message = color(
-                    f"ERROR: Failed to process {course_id} ({error_message})", "red"
-                )
-                print_item(index, total, message)
-    if verbose and not error:
+    if verbose and error_message:
+        message = color(
+            f"ERROR: Failed to process {course_id} ({error_message})", "red"
+        )
+        print_item(index, total, message)
+    elif verbose:
         if isna(course_id):
             course_display = f"{long_name} ({canvas_course_id})"
         else:
@@ -374,19 +376,12 @@ def check_tool_usage(
     if isna(course_id):
         report.at[index, "course_id"] = f"{short_name} ({canvas_account_id})"
     report.at[index, "tool status"] = tool_status
-    report.loc[index].to_frame().T.to_csv(result_path, mode="a", header=False)
+    result_writer.write_report_row(report, index)
     if enable and tool_status in {"already enabled", "enabled", "unsupported"}:
-        with open(processed_path, "a+", newline="") as processed_file:
-            writer(processed_file).writerow([canvas_course_id])
+        processed_errors.remove(canvas_course_id)
+        processed_courses.add([canvas_course_id])
     elif enable and canvas_course_id not in processed_errors:
-        if canvas_course_id in processed_errors:
-            processed_errors_csv = read_csv(processed_errors_path)
-            processed_errors_csv = processed_errors_csv[
-                processed_errors_csv["canvas user id"] != canvas_course_id
-            ]
-            processed_errors_csv.to_csv(processed_errors_path, index=False)
-        with open(processed_errors_path, "a+", newline="") as processed_file:
-            writer(processed_file).writerow([canvas_course_id])
+        processed_errors.add([canvas_course_id])
 
 
 def tool_main(
@@ -400,10 +395,13 @@ def tool_main(
     force_report: bool,
     clear_processed: bool,
     account_id: str,
+    workers: int = 1,
 ):
 
     instance = validate_instance_name(instance_name, verbose=not verbose)
+    term = term or get_current_year_and_term(instance)
     switch_logger_file(LOGS, "tool", instance.name)
+    create_directories(COMMAND_PATH)
     tool = get_tool(tool)
     report_object = Report(
         ReportType.COURSES, instance=instance, term=term, force=force_report
@@ -422,11 +420,11 @@ def tool_main(
         f"{tool_display}_tool_enable_processed_errors{instance_display}.csv"
     )
     processed_errors_path = PROCESSED / processed_errors_stem
-    handle_clear_processed(
-        clear_processed, [processed_path, processed_errors_path], "courses"
+    processed_courses = ProcessedLedger(processed_path, "canvas course id")
+    processed_errors = ProcessedLedger(processed_errors_path, "canvas course id")
+    clear_processed_ledgers(
+        clear_processed, [processed_courses, processed_errors], "courses"
     )
-    processed_courses = get_processed(processed_path, "canvas course id")
-    processed_errors = get_processed(processed_errors_path, "canvas course id")
     report, total = process_report(
         report_path, start, enable, processed_courses, processed_errors, new, account_id
     )
@@ -486,37 +484,29 @@ def tool_main(
             echo(f') Enabling "{tool_display}" for {STYLED_TERMS} courses...')
     else:
         echo(f') Checking {STYLED_TERMS} courses for "{tool_display}"...')
-    if verbose:
-        for course in report.itertuples():
-            check_tool_usage(
+    with ResultWriter(
+        result_path, ledgers=[processed_courses, processed_errors]
+    ) as result_writer:
+        process_rows(
+            report.itertuples(),
+            partial(check_tool_usage, tool=tool, enable=enable, instance=instance),
+            partial(
+                write_tool_result,
                 report,
                 total,
-                course,
-                tool,
-                enable,
-                result_path,
-                processed_path,
-                processed_errors,
-                processed_errors_path,
-                instance,
-                verbose,
-            )
-    else:
-        with progressbar(report.itertuples(), length=total) as progress:
-            for course in progress:
-                check_tool_usage(
-                    report,
-                    total,
-                    course,
-                    tool,
-                    enable,
-                    result_path,
-                    processed_path,
-                    processed_errors,
-                    processed_errors_path,
-                    instance,
-                    verbose,
-                )
+                tool=tool,
+                enable=enable,
+                result_writer=result_writer,
+                processed_courses=processed_courses,
+                processed_errors=processed_errors,
+                verbose=verbose,
+            ),
+            verbose,
+            workers,
+            length=len(report.index),
+        )
+    processed_courses.close()
+    processed_errors.close()
     (
         enabled,
         already_enabled,
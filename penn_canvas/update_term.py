@@ -6,11 +6,18 @@ from .api import (
     Instance,
     format_instance_name,
     get_account,
-    get_enrollment_term_id,
     get_main_account_id,
     validate_instance_name,
 )
-from .helpers import color, get_command_paths, make_csv_paths, write_file
+from .helpers import (
+    color,
+    create_directories,
+    get_command_paths,
+    make_csv_paths,
+    write_file,
+)
+from .pagination import get_all_pages
+from .terms import get_current_year_and_term, get_enrollment_term_id
 
 COMMAND_NAME = "Update Terms"
 RESULTS = get_command_paths(COMMAND_NAME)["results"]
@@ -31,19 +38,19 @@ def update_term_main(
     instance_name: str | Instance,
 ):
     instance = validate_instance_name(instance_name)
+    create_directories(RESULTS)
     if not account_id:
         account_id = get_main_account_id(instance)
     account = get_account(account_id, instance=instance)
-    current_term_id = get_enrollment_term_id(current_term_name, account)
-    new_term_id = get_enrollment_term_id(new_term_name, account)
+    current_term_name = current_term_name or get_current_year_and_term(instance)
+    current_term_id = get_enrollment_term_id(current_term_name, instance)
+    new_term_id = get_enrollment_term_id(new_term_name, instance)
     instance_name = format_instance_name(instance)
     results_path = (
         RESULTS
         / f"{account}_update_{current_term_name}_to_{new_term_name}{instance_name}.csv"
     )
-    courses = [
-        course for course in account.get_courses(enrollment_term_id=current_term_id)
-    ]
+    courses = get_all_pages(account.get_courses(enrollment_term_id=current_term_id))
     make_csv_paths(results_path, HEADERS)
     total = len(courses)
     for index, course in enumerate(courses):
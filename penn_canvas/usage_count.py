@@ -3,8 +3,10 @@ from canvasapi.assignment import Assignment
 from canvasapi.course import Course
 from typer import echo
 
-from .api import PENN_CANVAS_MAIN_ACCOUNT_ID, get_canvas
-from .helpers import color, get_command_paths
+from .api import get_canvas
+from .helpers import color, create_directories, get_command_paths
+from .pagination import get_all_pages
+from .terms import find_enrollment_term
 
 COMMAND_NAME = "Count Tool Usage"
 RESULTS = get_command_paths(COMMAND_NAME)["results"]
@@ -38,19 +40,15 @@ def is_voicethread_assignment(assignment: Assignment) -> bool:
         return False
 
 
-def get_courses(term: str, main_account: Account, account: Account) -> list[Course]:
-    enrollment_term_ids = (
-        enrollment_term.id
-        for enrollment_term in main_account.get_enrollment_terms()
-        if term in enrollment_term.name
-    )
-    enrollment_term_id = next(enrollment_term_ids, None)
-    return list(account.get_courses(enrollment_term_id=enrollment_term_id))
+def get_courses(term: str, account: Account) -> list[Course]:
+    enrollment_term = find_enrollment_term(term)
+    enrollment_term_id = enrollment_term.id if enrollment_term else None
+    return get_all_pages(account.get_courses(enrollment_term_id=enrollment_term_id))
 
 
 def usage_count_main(tool: str):
+    create_directories(RESULTS)
     canvas = get_canvas()
-    main_account = canvas.get_account(PENN_CANVAS_MAIN_ACCOUNT_ID)
     account = canvas.get_account(account_id)
     for term in year_and_terms:
         results_path = RESULTS / f"{term}_{tool}_usage.csv"
@@ -62,7 +60,7 @@ def usage_count_main(tool: str):
         if not results_path.exists():
             with open(results_path, "w") as results_file:
                 results_file.write(",".join(headers))
-        courses = get_courses(term, main_account, account)
+        courses = get_courses(term, account)
         courses_count = len(courses)
         for index, course in enumerate(courses):
             assignments = [assignment for assignment in course.get_assignments()]
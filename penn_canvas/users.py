@@ -0,0 +1,96 @@
+from threading import Lock
+from typing import Iterable, Optional
+
+from canvasapi.course import Course
+from canvasapi.user import User
+from loguru import logger
+
+from .api import Instance, get_requester, get_user, validate_instance_name
+from .pagination import iterate_pages
+
+ENROLLMENT_STATES = ["active", "invited", "rejected", "completed", "inactive"]
+
+
+def get_login_key(login_id: str) -> str:
+    return login_id.strip().lower()
+
+
+class UserResolver:
+    def __init__(self, instance: Instance = Instance.PRODUCTION):
+        self.instance = instance
+        self.users: dict[int, User] = dict()
+        self.login_ids: dict[str, User] = dict()
+        self.sis_ids: dict[str, User] = dict()
+        self.loaded_courses: set[int] = set()
+        self.hits = 0
+        self.misses = 0
+        self.lock = Lock()
+
+    def add(self, user: User | dict) -> User:
+        if isinstance(user, dict):
+            user = User(get_requester(self.instance), user)
+        with self.lock:
+            self.users[int(user.id)] = user
+            login_id = getattr(user, "login_id", None)
+            if login_id:
+                self.login_ids[get_login_key(login_id)] = user
+            sis_user_id = getattr(user, "sis_user_id", None)
+            if sis_user_id:
+                self.sis_ids[str(sis_user_id)] = user
+        return user
+
+    def add_users(self, users: Iterable[User | dict]):
+        for user in users:
+            self.add(user)
+
+    def load_course(self, course: Course, enrollment_state=ENROLLMENT_STATES):
+        if course.id in self.loaded_courses:
+            return
+        try:
+            self.add_users(
+                iterate_pages(
+                    course.get_users(
+                        include=["email"], enrollment_state=enrollment_state
+                    )
+                )
+            )
+        except Exception as error:
+            logger.error(f"Failed to load users for course {course.id}: {error}")
+            return
+        with self.lock:
+            self.loaded_courses.add(course.id)
+
+    def find(self, user_id: str | int, id_type: Optional[str] = None) -> Optional[User]:
+        with self.lock:
+            if id_type == "sis_login_id":
+                return self.login_ids.get(get_login_key(str(user_id)))
+            if id_type == "sis_user_id":
+                return self.sis_ids.get(str(user_id))
+            if id_type:
+                return None
+            try:
+                return self.users.get(int(user_id))
+            except (TypeError, ValueError):
+                return None
+
+    def get(self, user_id: str | int, id_type: Optional[str] = None) -> User:
+        user = self.find(user_id, id_type)
+        if user:
+            self.hits += 1
+            return user
+        self.misses += 1
+        return self.add(get_user(user_id, id_type=id_type, instance=self.instance))
+
+
+USER_RESOLVERS: dict[Instance, UserResolver] = dict()
+USER_RESOLVERS_LOCK = Lock()
+
+
+def get_user_resolver(instance: str | Instance = Instance.PRODUCTION) -> UserResolver:
+    instance = validate_instance_name(instance)
+    with USER_RESOLVERS_LOCK:
+        resolver = USER_RESOLVERS.get(instance)
+        if not resolver:
+            resolver = UserResolver(instance)
+            USER_RESOLVERS[instance] = resolver
+    return resolver
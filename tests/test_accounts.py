@@ -0,0 +1,26 @@
+from types import SimpleNamespace
+
+from penn_canvas.accounts import AccountTree, load_account_tree, save_account_tree
+
+ACCOUNTS = [
+    SimpleNamespace(id=2, parent_account_id=1, name="School"),
+    SimpleNamespace(id=3, parent_account_id=2, name="Department"),
+    SimpleNamespace(id=4, parent_account_id=3, name="Program"),
+    SimpleNamespace(id=5, parent_account_id=1, name="Other School"),
+]
+
+
+def test_account_tree(tmp_path):
+    root = SimpleNamespace(id=1, parent_account_id=None, name="University")
+    account_tree = AccountTree.from_accounts(root, ACCOUNTS)
+    assert account_tree.get_descendants() == {"1", "2", "3", "4", "5"}
+    assert account_tree.get_descendants(2) == {"2", "3", "4"}
+    assert account_tree.get_descendants(99) == {"99"}
+    assert account_tree.is_descendant(4, 2)
+    assert not account_tree.is_descendant(5, 2)
+    assert account_tree.get_ancestors(4) == ["3", "2", "1"]
+    path = tmp_path / "accounts.json"
+    save_account_tree(account_tree, path)
+    loaded_tree = load_account_tree(path)
+    assert loaded_tree and loaded_tree.descendants == account_tree.descendants
+    assert loaded_tree.names["3"] == "Department"
@@ -0,0 +1,63 @@
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from json import dumps
+from threading import Thread
+
+from penn_canvas import api
+from penn_canvas.api import (
+    CANVAS_CLIENTS,
+    CanvasClientStats,
+    clear_canvas_clients,
+    get_canvas,
+)
+from penn_canvas.constants import Instance
+
+AUTHORIZATIONS: list[str] = list()
+
+
+class CanvasStandIn(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        AUTHORIZATIONS.append(self.headers.get("Authorization", ""))
+        content = dumps({"id": 1, "name": "User"}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, *args):
+        pass
+
+
+def test_get_canvas_reuses_clients(monkeypatch):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), CanvasStandIn)
+    Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}"
+    monkeypatch.setattr(api, "get_canvas_url_and_key", lambda instance: (url, "key"))
+    stats = CanvasClientStats()
+    monkeypatch.setattr(api, "CANVAS_CLIENT_STATS", stats)
+    clear_canvas_clients()
+    try:
+        with ThreadPoolExecutor(4) as executor:
+            clients = list(
+                executor.map(
+                    lambda _: get_canvas(Instance.TEST, verbose=False), range(8)
+                )
+            )
+        override_client = get_canvas(Instance.TEST, verbose=False, override_key="other")
+        assert all(client is clients[0] for client in clients)
+        assert get_canvas(Instance.TEST, verbose=False) is clients[0]
+        assert override_client is not clients[0]
+        assert (
+            get_canvas(Instance.TEST, verbose=False, override_key="other")
+            is override_client
+        )
+        assert set(CANVAS_CLIENTS) == {(Instance.TEST, "key"), (Instance.TEST, "other")}
+        assert AUTHORIZATIONS == ["Bearer key", "Bearer other"]
+        assert (stats.clients_created, stats.validations) == (2, 2)
+        assert stats.validations_skipped == 9
+    finally:
+        clear_canvas_clients()
+        server.shutdown()
@@ -0,0 +1,55 @@
+from pytest import importorskip, mark, raises
+from typer import BadParameter
+
+from penn_canvas.archive.codec import (
+    GZIP,
+    NONE,
+    ZSTD,
+    Codec,
+    detect_codec,
+    extract_archive,
+    find_archive,
+    get_archive_stem,
+    parse_codec,
+    read_file,
+    unpack_tar,
+)
+from penn_canvas.archive.sink import ArchiveSink
+
+
+def test_parse_codec():
+    assert parse_codec("gzip:1") == Codec("gzip", 1)
+    assert str(parse_codec("none")) == "none"
+    for value in ["gzip:10", "bzip2", "none:1"]:
+        with raises(BadParameter):
+            parse_codec(value)
+
+
+@mark.parametrize("codec_name", ["gzip:1", "zstd:1", "none"])
+def test_archive_codec(tmp_path, codec_name):
+    if codec_name.startswith("zstd"):
+        importorskip("zstandard")
+    codec = parse_codec(codec_name)
+    archive_path = tmp_path / codec.get_archive_name("modules")
+    with ArchiveSink(archive_path, codec) as sink:
+        sink.add_text("Module 1/Reading.txt", "Read chapter 1")
+        with sink.open_archive(codec.get_archive_name("files")) as files_sink:
+            files_sink.add_bytes("essay.txt", b"essay")
+    assert detect_codec(archive_path) == codec.name
+    assert read_file("./Module 1/Reading.txt", archive_path) == b"Read chapter 1"
+    files_path = extract_archive("./files", archive_path, tmp_path)
+    unpack_tar(files_path, tmp_path / "files")
+    assert (tmp_path / "files" / "essay.txt").read_text() == "essay"
+
+
+def test_archive_names(tmp_path):
+    names = [Codec(name).get_archive_name("modules") for name in [GZIP, ZSTD, NONE]]
+    assert names == ["modules.tar.gz", "modules.tar.zst", "modules.tar"]
+    assert get_archive_stem("Common Cartridge.tar.zst") == "Common Cartridge"
+    assert get_archive_stem("grades.csv.gz") is None
+    (tmp_path / "modules.tar.gz").write_bytes(b"")
+    assert find_archive(tmp_path, "modules") == tmp_path / "modules.tar.gz"
+    with ArchiveSink(tmp_path / "modules.tar", Codec(NONE, None)) as sink:
+        sink.add_text("Module 1/Reading.txt", "Read chapter 1")
+    assert find_archive(tmp_path, "modules") == tmp_path / "modules.tar"
+    assert [path.name for path in tmp_path.iterdir()] == ["modules.tar"]
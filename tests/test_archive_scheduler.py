@@ -0,0 +1,50 @@
+from types import SimpleNamespace
+
+from penn_canvas.api import Instance
+from penn_canvas.archive import scheduler
+from penn_canvas.archive.scheduler import (
+    ARCHIVE_MANIFEST,
+    COMPONENTS,
+    CourseManifest,
+    archive_courses,
+)
+
+CALLS: list[tuple] = list()
+FAILING = {"groups"}
+
+
+def get_component(component, action):
+    def fetch(course, *args):
+        CALLS.append(
+            (course.id, component, args[-3] if component == "grades" else None)
+        )
+        if component in FAILING:
+            raise RuntimeError(f"{component} failed")
+        return [f"assignment {course.id}"] if component == "assignments" else None
+
+    return fetch
+
+
+def get_course(course_id, include=None, instance=None):
+    return SimpleNamespace(id=course_id, name=f"Course {course_id}")
+
+
+def test_archive_courses(tmp_path, monkeypatch):
+    monkeypatch.setattr(scheduler, "get_component", get_component)
+    monkeypatch.setattr(scheduler, "get_course", get_course)
+    arguments = (tmp_path / "Compressed", tmp_path / "Courses", Instance.PRODUCTION)
+    incomplete = archive_courses(
+        [1, 2], COMPONENTS, *arguments, False, False, False, 2, 3
+    )
+    assert incomplete == 2
+    assert len(CALLS) == 2 * len(COMPONENTS)
+    assert (1, "grades", ["assignment 1"]) in CALLS
+    manifest = CourseManifest(
+        tmp_path / "Compressed" / "Course 1 (1)" / ARCHIVE_MANIFEST
+    )
+    assert manifest.components["groups"]["error"] == "groups failed"
+    CALLS.clear()
+    FAILING.clear()
+    incomplete = archive_courses([1, 2], COMPONENTS, *arguments, False, False, False)
+    assert incomplete == 0
+    assert sorted(CALLS) == [(1, "groups", None), (2, "groups", None)]
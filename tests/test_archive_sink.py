@@ -0,0 +1,46 @@
+from shutil import unpack_archive
+from tarfile import open as open_tarfile
+from zipfile import ZipFile
+
+from pandas import DataFrame, read_csv
+from pytest import raises
+
+from penn_canvas.archive.sink import ArchiveSink
+
+
+def test_archive_sink(tmp_path):
+    zip_path = tmp_path / "export.zip"
+    with ZipFile(zip_path, "w") as zip_file:
+        zip_file.writestr("web_resources/syllabus.html", "<p>Syllabus</p>")
+    archive_path = tmp_path / "course.tar.gz"
+    with ArchiveSink(archive_path) as sink:
+        sink.add_text("Module 1/Reading.txt", "Read chapter 1")
+        sink.add_csv("grades.csv.gz", DataFrame({"Score": [1, 2]}))
+        sink.add_zip(zip_path, "Zip")
+        with sink.open_archive("files.tar.gz") as files_sink:
+            files_sink.add_bytes("Assignment/Submissions/essay.txt", b"essay")
+    with open_tarfile(archive_path) as archive:
+        names = archive.getnames()
+    assert names[0] == "."
+    assert all(name == "." or name.startswith("./") for name in names)
+    assert "./Zip/web_resources/syllabus.html" in names
+    assert sorted(path.name for path in tmp_path.iterdir()) == [
+        "course.tar.gz",
+        "export.zip",
+    ]
+    unpack_path = tmp_path / "unpacked"
+    unpack_archive(archive_path, unpack_path)
+    unpack_archive(unpack_path / "files.tar.gz", unpack_path / "files")
+    assert (unpack_path / "Module 1" / "Reading.txt").read_text() == "Read chapter 1"
+    assert read_csv(unpack_path / "grades.csv.gz")["Score"].tolist() == [1, 2]
+    essay_path = unpack_path / "files" / "Assignment" / "Submissions" / "essay.txt"
+    assert essay_path.read_text() == "essay"
+
+
+def test_archive_sink_abort(tmp_path):
+    archive_path = tmp_path / "course.tar.gz"
+    with raises(RuntimeError):
+        with ArchiveSink(archive_path) as sink:
+            sink.add_text("page.txt", "text")
+            raise RuntimeError
+    assert not list(tmp_path.iterdir())
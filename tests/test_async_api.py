@@ -0,0 +1,76 @@
+from asyncio import run
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from json import dumps
+from threading import Thread
+from urllib.parse import parse_qs, urlparse
+
+from penn_canvas.async_api import AsyncCanvas, collect, map_concurrently
+
+ENROLLMENTS = [{"id": enrollment_id} for enrollment_id in range(5)]
+
+
+class CanvasStandIn(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        links = ""
+        if url.path == "/api/v1/courses/1":
+            body = {"id": 1, "name": "Course"}
+        elif url.path == "/api/v1/courses/1/tabs":
+            body = [{"id": "home", "label": "Home"}]
+        elif url.path == "/api/v1/courses/1/enrollments":
+            per_page = int(query["per_page"][0])
+            page = int(query.get("page", ["1"])[0])
+            start = (page - 1) * per_page
+            body = ENROLLMENTS[start : start + per_page]
+            if start + per_page < len(ENROLLMENTS):
+                next_url = (
+                    f"http://{self.headers['Host']}{url.path}"
+                    f"?page={page + 1}&per_page={per_page}"
+                )
+                links = f'<{next_url}>; rel="next"'
+        else:
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        content = dumps(body).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        self.send_header("X-Rate-Limit-Remaining", "700")
+        if links:
+            self.send_header("Link", links)
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, *args):
+        pass
+
+
+def start_server() -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), CanvasStandIn)
+    Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def test_async_canvas():
+    server = start_server()
+    base_url = f"http://127.0.0.1:{server.server_port}"
+
+    async def fetch():
+        async with AsyncCanvas(base_url, "token", limit_per_host=2) as canvas:
+            course = await canvas.get_course(1)
+            tabs = await collect(canvas.get_tabs(1))
+            enrollments = await collect(canvas.get_enrollments(1, per_page=2))
+            courses = await map_concurrently([1, 1, 1], canvas.get_course, limit=2)
+            return course, tabs, enrollments, courses
+
+    course, tabs, enrollments, courses = run(fetch())
+    server.shutdown()
+    assert course["name"] == "Course"
+    assert tabs == [{"id": "home", "label": "Home"}]
+    assert enrollments == ENROLLMENTS
+    assert courses == [course, course, course]
@@ -0,0 +1,47 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from json import dumps
+from threading import Thread
+
+from penn_canvas.cache import CachedSession, ResponseCache
+
+REQUESTS: list[str] = list()
+
+
+class CanvasStandIn(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        REQUESTS.append(self.headers.get("If-None-Match", ""))
+        if self.headers.get("If-None-Match") == '"1"':
+            self.send_response(304)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        content = dumps({"id": 1, "name": "User"}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        self.send_header("ETag", '"1"')
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, *args):
+        pass
+
+
+def test_cached_session(tmp_path):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), CanvasStandIn)
+    Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}/api/v1/users/1"
+    cache = ResponseCache(tmp_path / "cache.sqlite3")
+    session = CachedSession(cache)
+    headers = {"Authorization": "Bearer token"}
+    first = session.get(url, headers=headers)
+    second = CachedSession(cache).get(url, headers=headers)
+    with cache.lock:
+        cache.connection.execute("UPDATE responses SET expires_at = 0")
+    third = session.get(url, headers=headers)
+    server.shutdown()
+    assert first.json() == second.json() == third.json() == {"id": 1, "name": "User"}
+    assert REQUESTS == ["", '"1"']
+    assert (cache.stats.hits, cache.stats.revalidations) == (1, 1)
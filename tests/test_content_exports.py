@@ -0,0 +1,82 @@
+from types import SimpleNamespace
+
+from penn_canvas.archive import content
+from penn_canvas.archive.content import ContentExportError, ContentExportPipeline
+
+POLLS: dict[tuple, int] = dict()
+DOWNLOADED: list[tuple] = list()
+FAILING = {2}
+FAILED_EXPORTS = {4}
+
+
+class ExportStandIn:
+    def __init__(self, course, export_type, instance):
+        self.course = course
+        self.export_type = export_type
+        self.workflow_state = ""
+
+    def create_content_export(self):
+        if self.course.id in FAILING:
+            FAILING.remove(self.course.id)
+            raise RuntimeError("export failed")
+        self.workflow_state = "queued"
+
+    def update_workflow_state(self):
+        key = (self.course.id, self.export_type)
+        POLLS[key] = POLLS.get(key, 0) + 1
+        if self.course.id in FAILED_EXPORTS and self.export_type == "zip":
+            self.workflow_state = "failed"
+        elif POLLS[key] >= self.course.id:
+            self.workflow_state = "completed"
+
+
+def download_completed_exports(course, exports, content_path, *args):
+    DOWNLOADED.append((course.id, [export.workflow_state for export in exports]))
+
+
+def test_content_export_pipeline(tmp_path, monkeypatch):
+    monkeypatch.setattr(content, "Export", ExportStandIn)
+    monkeypatch.setattr(
+        content, "download_completed_exports", download_completed_exports
+    )
+    courses = [SimpleNamespace(id=course_id) for course_id in [3, 1]]
+    with ContentExportPipeline(delay=0.01, maximum_delay=0.02) as pipeline:
+        futures = [
+            pipeline.submit(course, tmp_path / str(course.id), tmp_path, False)
+            for course in courses
+        ]
+        assert pipeline.submit(courses[0], tmp_path, tmp_path, False) is futures[0]
+        paths = [future.result(timeout=5) for future in futures]
+    assert paths == [tmp_path / "3", tmp_path / "1"]
+    assert DOWNLOADED == [(1, ["completed"] * 2), (3, ["completed"] * 2)]
+    assert POLLS[(3, "zip")] == 3
+
+
+def test_content_export_pipeline_retries_failed_submit(tmp_path, monkeypatch):
+    monkeypatch.setattr(content, "Export", ExportStandIn)
+    monkeypatch.setattr(
+        content, "download_completed_exports", download_completed_exports
+    )
+    course = SimpleNamespace(id=2)
+    with ContentExportPipeline(delay=0.01, maximum_delay=0.02) as pipeline:
+        failed = pipeline.submit(course, tmp_path, tmp_path, False)
+        assert isinstance(failed.exception(timeout=5), RuntimeError)
+        retried = pipeline.submit(course, tmp_path, tmp_path, False)
+        assert retried is not failed
+        assert retried.result(timeout=5) == tmp_path
+
+
+def test_content_export_pipeline_fails_incomplete_exports(tmp_path, monkeypatch):
+    monkeypatch.setattr(content, "Export", ExportStandIn)
+    failed, timed_out = SimpleNamespace(id=4), SimpleNamespace(id=100)
+    with ContentExportPipeline(delay=0.01, maximum_delay=0.02, timeout=0.1) as pipeline:
+        futures = [
+            pipeline.submit(course, tmp_path, tmp_path, False)
+            for course in [failed, timed_out]
+        ]
+        errors = [future.exception(timeout=5) for future in futures]
+        assert all(isinstance(error, ContentExportError) for error in errors)
+        assert "zip" in str(errors[0])
+        assert "timed out" in str(errors[1])
+        assert pipeline.submit(failed, tmp_path, tmp_path, False) is not futures[0]
+    assert not list(tmp_path.iterdir())
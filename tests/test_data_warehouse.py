@@ -0,0 +1,99 @@
+from contextlib import contextmanager
+from sqlite3 import connect
+from subprocess import run
+from sys import executable
+
+from pandas import DataFrame
+
+from penn_canvas import email
+from penn_canvas.data_warehouse import (
+    get_emails_by_penn_key,
+    get_existing_penn_keys,
+    get_penn_ids,
+    get_people_by_email,
+    query_in_batches,
+)
+
+
+def create_data_warehouse():
+    connection = connect(":memory:")
+    connection.execute("ATTACH DATABASE ':memory:' AS dwadmin")
+    connection.execute(
+        "CREATE TABLE dwadmin.person_all_v"
+        " (penn_id TEXT, pennkey TEXT, first_name TEXT, last_name TEXT,"
+        " email_address TEXT)"
+    )
+    connection.execute(
+        "CREATE TABLE dwadmin.degree_pursual_all_v (penn_id TEXT, last_degree_term"
+        " TEXT)"
+    )
+    connection.execute(
+        "CREATE TABLE employee_general (penn_id TEXT, pennkey TEXT, email_address TEXT)"
+    )
+    connection.executemany(
+        "INSERT INTO dwadmin.person_all_v VALUES (?, ?, ?, ?, ?)",
+        [
+            (f"{index}", f"key{index}", "First", "Last", f"key{index}@upenn.edu")
+            for index in range(5)
+        ],
+    )
+    connection.executemany(
+        "INSERT INTO dwadmin.degree_pursual_all_v VALUES (?, ?)",
+        [(f"{index}", "2020A") for index in range(5)],
+    )
+    connection.execute(
+        "INSERT INTO employee_general VALUES ('9', 'staff', 'staff@upenn.edu')"
+    )
+    return connection
+
+
+def test_query_in_batches():
+    connection = create_data_warehouse()
+    rows = query_in_batches(
+        "SELECT pennkey FROM person_all_v WHERE {condition}",
+        "pennkey",
+        ["key0", "key1", "key1", "key2", "missing"],
+        connection,
+        batch_size=2,
+    )
+    assert sorted(rows) == [("key0",), ("key1",), ("key2",)]
+
+
+def test_bulk_lookups():
+    connection = create_data_warehouse()
+    penn_ids = get_penn_ids(["key0", "key4", "staff", "missing"], connection)
+    assert penn_ids == {"key0": "0", "key4": "4", "staff": "9"}
+    emails = get_emails_by_penn_key(["staff"], "employee_general", connection)
+    assert emails == {"staff": ["staff@upenn.edu"]}
+    assert get_existing_penn_keys(["key3", "missing"], connection) == {"key3"}
+    people = get_people_by_email(["key1@upenn.edu", "missing@upenn.edu"], connection)
+    assert people == {
+        "key1@upenn.edu": [("First", "Last", "key1@upenn.edu", "2020A", "key1")]
+    }
+
+
+def test_data_warehouse_imports_without_oracle_client():
+    process = run(
+        [
+            executable,
+            "-c",
+            "import sys, penn_canvas.data_warehouse;"
+            " assert 'cx_Oracle' not in sys.modules",
+        ]
+    )
+    assert process.returncode == 0
+
+
+def test_get_data_warehouse_emails(monkeypatch):
+    data_warehouse = create_data_warehouse()
+
+    @contextmanager
+    def get_connection():
+        yield data_warehouse
+
+    monkeypatch.setattr(email, "get_data_warehouse_connection", get_connection)
+    report = DataFrame({"login_id": ["key0", "staff", None, "missing"]})
+    assert email.get_data_warehouse_emails(report) == {
+        "employee_general": {"staff": ["staff@upenn.edu"]},
+        "person_all_v": {"key0": ["key0@upenn.edu"]},
+    }
@@ -0,0 +1,115 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Thread
+
+from penn_canvas import downloads
+from penn_canvas.downloads import (
+    Download,
+    download_file,
+    download_files,
+    fetch_file,
+    fetch_files,
+    get_partial_path,
+    get_validator_path,
+)
+
+CONTENT = bytes(range(256)) * 64
+ETAG = '"report"'
+RANGES: list[str] = list()
+
+
+class DownloadStandIn(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path == "/missing":
+            self.send_error(404)
+            return
+        requested_range = self.headers.get("Range")
+        RANGES.append(requested_range)
+        if self.headers.get("If-Range", ETAG) != ETAG:
+            requested_range = None
+        if requested_range:
+            offset = int(requested_range.removeprefix("bytes=").rstrip("-"))
+            self.send_response(206)
+            self.send_header(
+                "Content-Range", f"bytes {offset}-{len(CONTENT) - 1}/{len(CONTENT)}"
+            )
+            content = CONTENT[offset:]
+        else:
+            self.send_response(200)
+            content = CONTENT
+        self.send_header("Content-Length", str(len(content)))
+        self.send_header("ETag", ETAG)
+        self.end_headers()
+        if not requested_range and self.path == "/report":
+            content = content[:1024]
+        self.wfile.write(content)
+
+    def log_message(self, *args):
+        pass
+
+
+def test_download_file(tmp_path, monkeypatch):
+    monkeypatch.setattr(downloads, "DOWNLOAD_RETRY_DELAY", 0)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), DownloadStandIn)
+    Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}"
+    path = tmp_path / "Reports" / "report.csv"
+    assert download_file(path, f"{url}/report", chunk_size=256) == path
+    assert path.read_bytes() == CONTENT
+    assert RANGES == [None, "bytes=1024-"]
+    assert download_file(path.with_name("missing.csv"), f"{url}/missing") is None
+    server.shutdown()
+    assert not get_partial_path(path).exists()
+    assert not path.with_name("missing.csv").exists()
+
+
+def test_download_files(tmp_path, monkeypatch):
+    monkeypatch.setattr(downloads, "DOWNLOAD_RETRY_DELAY", 0)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), DownloadStandIn)
+    Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}"
+    names = ["first", "missing", "second"]
+    requests = [(tmp_path / name, f"{url}/{name}") for name in names]
+    paths = list(download_files(requests, workers=3))
+    server.shutdown()
+    assert paths == [tmp_path / "first", None, tmp_path / "second"]
+    assert (tmp_path / "second").read_bytes() == CONTENT
+
+
+def test_download_file_resumes_previous_run(tmp_path, monkeypatch):
+    monkeypatch.setattr(downloads, "DOWNLOAD_RETRY_DELAY", 0)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), DownloadStandIn)
+    Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}"
+    path = tmp_path / "report.csv"
+    partial_path = get_partial_path(path)
+    RANGES.clear()
+    for content, validator in [(CONTENT[:1024], ETAG), (b"stale", '"old"')]:
+        partial_path.write_bytes(content)
+        get_validator_path(partial_path).write_text(validator)
+        assert download_file(path, f"{url}/full") == path
+        assert path.read_bytes() == CONTENT
+    partial_path.write_bytes(b"unvalidated")
+    assert download_file(path, f"{url}/full") == path
+    server.shutdown()
+    assert RANGES == ["bytes=1024-", "bytes=5-", None]
+    assert path.read_bytes() == CONTENT
+    assert not partial_path.exists()
+    assert not get_validator_path(partial_path).exists()
+
+
+def test_fetch_file_returns_head(tmp_path, monkeypatch):
+    monkeypatch.setattr(downloads, "DOWNLOAD_RETRY_DELAY", 0)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), DownloadStandIn)
+    Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}"
+    path = tmp_path / "report.csv"
+    download = fetch_file(path, f"{url}/report", chunk_size=100, head_size=300)
+    assert download == Download(path, CONTENT[:300])
+    partial_path = get_partial_path(path)
+    partial_path.write_bytes(CONTENT[:10])
+    get_validator_path(partial_path).write_text(ETAG)
+    assert fetch_file(path, f"{url}/full", head_size=20).head == CONTENT[:20]
+    requests = [(tmp_path / name, f"{url}/{name}") for name in ["missing", "first"]]
+    downloaded = list(fetch_files(requests, head_size=4))
+    server.shutdown()
+    assert downloaded == [None, Download(tmp_path / "first", CONTENT[:4])]
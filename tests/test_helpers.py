@@ -0,0 +1,85 @@
+from threading import current_thread, get_ident
+from time import sleep
+
+from pytest import raises
+
+from penn_canvas.helpers import (
+    CREATED_DIRECTORIES,
+    create_directory,
+    map_rows,
+    process_rows,
+    remove_directory,
+    remove_old_reports_directories,
+)
+
+
+def test_create_directory(tmp_path):
+    directory = tmp_path / "Results" / "2022"
+    assert create_directory(directory).is_dir()
+    assert directory in CREATED_DIRECTORIES
+    (directory / "result.csv").touch()
+    create_directory(tmp_path / "Results", clear=True)
+    assert directory not in CREATED_DIRECTORIES
+    assert not directory.exists()
+
+
+def test_remove_directory(tmp_path):
+    directory = create_directory(tmp_path / "Course" / "Content")
+    remove_directory(tmp_path / "Course")
+    assert directory not in CREATED_DIRECTORIES
+    assert create_directory(directory).is_dir()
+    remove_directory(tmp_path / "Missing", ignore_errors=True)
+
+
+def test_remove_old_reports_directories(tmp_path):
+    for name in ["2000-01-01", "Logs", "unknown"]:
+        (tmp_path / name).mkdir()
+    removed_paths = remove_old_reports_directories(tmp_path, days=30)
+    assert sorted(path.name for path in removed_paths) == ["2000-01-01", "unknown"]
+    assert [path.name for path in tmp_path.iterdir()] == ["Logs"]
+
+
+def square_slowly(number: int) -> int:
+    sleep((5 - number) * 0.01)
+    return number * number
+
+
+def fail_on_three(number: int) -> int:
+    if number == 3:
+        raise ValueError(number)
+    return number
+
+
+def test_map_rows_keeps_row_order():
+    assert list(map_rows(range(5), square_slowly, workers=4)) == [0, 1, 4, 9, 16]
+
+
+def test_map_rows_runs_one_worker_in_the_calling_thread():
+    seen = list()
+
+    def record(number: int) -> tuple[int, int]:
+        seen.append(number)
+        return number, get_ident()
+
+    results = map_rows(range(3), record)
+    assert next(results) == (0, current_thread().ident)
+    assert seen == [0]
+    assert list(results) == [(1, get_ident()), (2, get_ident())]
+
+
+def test_map_rows_propagates_exceptions():
+    for workers in [1, 4]:
+        results = map_rows(range(5), fail_on_three, workers)
+        with raises(ValueError):
+            list(results)
+
+
+def test_process_rows_writes_results_in_order():
+    for verbose in [True, False]:
+        written = list()
+        process_rows(range(5), square_slowly, written.append, verbose, workers=3)
+        assert written == [0, 1, 4, 9, 16]
+    written = list()
+    with raises(ValueError):
+        process_rows(range(5), fail_on_three, written.append, True, workers=2)
+    assert written == [0, 1, 2]
@@ -0,0 +1,90 @@
+from csv import reader
+
+from penn_canvas.helpers import ResultWriter
+from penn_canvas.ledger import LedgerBackend, ProcessedLedger
+
+COLUMNS = ["canvas course id", "status"]
+
+
+def read_rows(path):
+    with open(path, newline="") as csv_file:
+        return list(reader(csv_file))
+
+
+def test_csv_ledger(tmp_path):
+    path = tmp_path / "processed.csv"
+    ledger = ProcessedLedger(path, COLUMNS, compact_threshold=10)
+    ledger.add([1, "enabled"])
+    ledger.add([2, "enabled"])
+    ledger.remove(1)
+    assert 1 not in ledger and "2" in ledger
+    assert ProcessedLedger(path, COLUMNS).get_rows() == [["2", "enabled"]]
+    ledger.add([1, "disabled"])
+    ledger.close()
+    assert not ledger.removed_path.exists()
+    assert read_rows(path) == [COLUMNS, ["2", "enabled"], ["1", "disabled"]]
+
+
+def test_sqlite_ledger(tmp_path):
+    path = tmp_path / "processed.csv"
+    with ProcessedLedger(path, COLUMNS) as ledger:
+        ledger.add([1, "enabled"])
+    with ProcessedLedger(path, COLUMNS, LedgerBackend.SQLITE) as ledger:
+        ledger.add([2, "enabled"])
+        ledger.remove(1)
+    ledger = ProcessedLedger(path, COLUMNS, LedgerBackend.SQLITE)
+    assert list(ledger) == ["2"]
+    ledger.clear()
+    assert len(ledger) == 0
+    ledger.close()
+    assert read_rows(path) == [COLUMNS]
+
+
+def test_alternating_ledger_backends(tmp_path):
+    path = tmp_path / "processed.csv"
+    with ProcessedLedger(path, COLUMNS, LedgerBackend.SQLITE) as ledger:
+        ledger.add([1, "enabled"])
+    with ProcessedLedger(path, COLUMNS) as ledger:
+        ledger.add([2, "enabled"])
+        ledger.remove(1)
+        ledger.add([3, "enabled"])
+    with ProcessedLedger(path, COLUMNS, LedgerBackend.SQLITE) as ledger:
+        assert list(ledger) == ["2", "3"]
+        ledger.add([4, "enabled"])
+    assert [row[0] for row in read_rows(path)[1:]] == ["2", "3", "4"]
+
+
+def test_sqlite_ledger_reopens_without_import(tmp_path, monkeypatch):
+    path = tmp_path / "processed.csv"
+    with ProcessedLedger(path, COLUMNS, LedgerBackend.SQLITE, flush_rows=2) as ledger:
+        for course_id in [3, 1, 2]:
+            ledger.add([course_id, "enabled"])
+    imports = list()
+    monkeypatch.setattr(
+        ProcessedLedger, "import_csv", lambda ledger: imports.append(ledger)
+    )
+    with ProcessedLedger(path, COLUMNS, LedgerBackend.SQLITE) as ledger:
+        ledger.add([3, "disabled"])
+        assert list(ledger) == ["1", "2", "3"]
+    assert not imports
+    assert [row[0] for row in read_rows(path)[1:]] == ["1", "2", "3"]
+
+
+def test_result_writer_flushes_before_ledger(tmp_path):
+    result_path = tmp_path / "results.csv"
+    ledger = ProcessedLedger(tmp_path / "processed.csv", COLUMNS)
+    with ResultWriter(result_path, flush_rows=2, ledgers=[ledger]) as result_writer:
+        result_writer.write([0, 1, "enabled"])
+        ledger.add([1, "enabled"])
+        assert read_rows(result_path) == []
+        assert read_rows(ledger.path) == [COLUMNS]
+        result_writer.write([1, 2, "enabled"])
+        assert read_rows(result_path) == [["0", "1", "enabled"], ["1", "2", "enabled"]]
+        assert read_rows(ledger.path) == [COLUMNS, ["1", "enabled"]]
+        result_writer.write([2, 3, "enabled"])
+        ledger.add([3, "enabled"])
+        ledger.add([4, "enabled"])
+        assert read_rows(result_path)[-1] == ["2", "3", "enabled"]
+        assert read_rows(ledger.path)[-1] == ["4", "enabled"]
+    assert ledger.before_flush is None and ledger.flush_rows == 1
+    ledger.close()
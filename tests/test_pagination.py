@@ -0,0 +1,74 @@
+from types import SimpleNamespace
+from urllib.parse import parse_qsl, urlencode, urlparse
+
+from canvasapi.paginated_list import PaginatedList
+
+from penn_canvas.pagination import iterate_pages
+
+BASE_URL = "https://canvas.test/api/v1/"
+ENDPOINT = "accounts/1/courses"
+PAGES = [[1, 2], [3, 4], [5, 6], [7]]
+
+
+class Item:
+    def __init__(self, requester, attributes):
+        self.id = attributes["id"]
+
+
+class PagesStandIn:
+    base_url = BASE_URL
+    new_quizzes_url = "https://canvas.test/api/quiz/v1/"
+
+    def __init__(self, bookmarks=False, meta=False):
+        self.bookmarks = bookmarks
+        self.meta = meta
+        self.requested: list[str] = list()
+
+    def get_page_url(self, page: int) -> str:
+        page_name = f"bookmark:{page}" if self.bookmarks else str(page)
+        return f"{BASE_URL}{ENDPOINT}?{urlencode({'page': page_name, 'per_page': 2})}"
+
+    def request(self, method, endpoint=None, _url=None, **kwargs):
+        url = endpoint if _url in {None, "new_quizzes", "graphql"} else _url
+        query = kwargs | dict(parse_qsl(urlparse(url).query))
+        page = int(str(query.get("page", "1")).removeprefix("bookmark:"))
+        self.requested.append(str(page))
+        items = [{"id": item} for item in PAGES[page - 1]]
+        links = {"current": {"url": self.get_page_url(page)}}
+        next_url = self.get_page_url(page + 1) if page < len(PAGES) else None
+        if self.meta:
+            pagination = {"next": next_url} if next_url else dict()
+            return SimpleNamespace(
+                links=dict(),
+                json=lambda: {"items": items, "meta": {"pagination": pagination}},
+            )
+        if next_url:
+            links["next"] = {"url": next_url}
+        if not self.bookmarks:
+            links["last"] = {"url": self.get_page_url(len(PAGES))}
+        return SimpleNamespace(links=links, json=lambda: items)
+
+
+def get_ids(requester: PagesStandIn, workers=4, **kwargs) -> list[int]:
+    paginated_list = PaginatedList(Item, requester, "GET", ENDPOINT, **kwargs)
+    return [item.id for item in iterate_pages(paginated_list, workers)]
+
+
+def test_iterate_pages_requests_numbered_pages_in_parallel():
+    requester = PagesStandIn()
+    assert get_ids(requester) == [1, 2, 3, 4, 5, 6, 7]
+    assert sorted(requester.requested) == ["1", "2", "3", "4"]
+
+
+def test_iterate_pages_follows_bookmarks():
+    requester = PagesStandIn(bookmarks=True)
+    assert get_ids(requester) == [1, 2, 3, 4, 5, 6, 7]
+    assert requester.requested == ["1", "2", "3", "4"]
+
+
+def test_iterate_pages_falls_back_to_paginated_list():
+    requester = PagesStandIn(meta=True)
+    assert get_ids(requester, _root="items") == [1, 2, 3, 4, 5, 6, 7]
+    requester = PagesStandIn()
+    assert get_ids(requester, _url_override="new_quizzes") == [1, 2, 3, 4, 5, 6, 7]
+    assert requester.requested == ["1", "2", "3", "4"]
@@ -0,0 +1,103 @@
+from io import BytesIO
+
+from requests import Response
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+
+from penn_canvas.rate_limit import (
+    RATE_LIMIT_REMAINING,
+    REQUEST_COST,
+    GovernedSession,
+    RateGovernor,
+)
+
+URL = "https://canvas.test/api/v1/courses"
+
+
+class StubAdapter(BaseAdapter):
+    def __init__(self, responses):
+        super().__init__()
+        self.responses = list(responses)
+        self.sent = 0
+
+    def send(self, request, **kwargs):
+        status_code, body, headers = self.responses[self.sent]
+        self.sent += 1
+        response = Response()
+        response.status_code = status_code
+        response.headers = CaseInsensitiveDict(headers)
+        response.raw = BytesIO(body)
+        response.request = request
+        response.url = request.url
+        return response
+
+    def close(self):
+        pass
+
+
+def make_session(responses, maximum_retries=6):
+    governor = RateGovernor(minimum_delay=0.001, maximum_delay=0.001)
+    session = GovernedSession(governor, maximum_retries)
+    adapter = StubAdapter(responses)
+    session.mount("https://", adapter)
+    return session, adapter
+
+
+def test_rate_governor_update():
+    governor = RateGovernor()
+    governor.update({RATE_LIMIT_REMAINING: "100", REQUEST_COST: "2"})
+    assert governor.remaining == 100 and governor.cost == 2
+    assert governor.delay == governor.minimum_delay
+    governor.update({RATE_LIMIT_REMAINING: "50", REQUEST_COST: "4"})
+    assert governor.cost == 3 and governor.delay == governor.minimum_delay * 2
+    governor.update({REQUEST_COST: "10"})
+    assert governor.remaining == 50 and governor.cost == 3
+    governor.update({RATE_LIMIT_REMAINING: "600"})
+    assert governor.delay == governor.minimum_delay
+    governor.update({RATE_LIMIT_REMAINING: "600"})
+    assert governor.delay == 0
+
+
+def test_rate_governor_reserve_slot_and_back_off():
+    governor = RateGovernor(maximum_delay=1.0)
+    assert governor.reserve_slot() == 0
+    assert governor.reserve_slot() == 0
+    governor.back_off(0)
+    assert governor.throttled == 1
+    assert governor.delay == governor.minimum_delay
+    paused = governor.reserve_slot()
+    assert 0.7 < paused <= 1.25
+    assert governor.reserve_slot() > paused
+
+
+def test_governed_session_retries_rate_limited_requests():
+    session, adapter = make_session(
+        [
+            (429, b"", {RATE_LIMIT_REMAINING: "0"}),
+            (403, b"403 Forbidden (Rate Limit Exceeded)", {}),
+            (200, b"[]", {RATE_LIMIT_REMAINING: "700"}),
+        ]
+    )
+    response = session.get(URL)
+    assert response.status_code == 200 and response.json() == []
+    assert adapter.sent == 3
+    assert session.governor.throttled == 2
+    assert session.governor.remaining == 700
+
+
+def test_governed_session_stops_retrying():
+    session, adapter = make_session([(429, b"", {})] * 3, maximum_retries=2)
+    assert session.get(URL).status_code == 429
+    assert adapter.sent == 3
+
+
+def test_governed_session_leaves_streamed_bodies_unread():
+    session, adapter = make_session(
+        [(200, b"file", {}), (403, b"Forbidden", {}), (404, b"", {})]
+    )
+    response = session.get(URL, stream=True)
+    assert not response._content_consumed
+    assert response.raw.read() == b"file"
+    assert session.get(URL, stream=True).status_code == 403
+    assert session.get(URL, stream=True).status_code == 404
+    assert adapter.sent == 3
@@ -0,0 +1,238 @@
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from multiprocessing import get_context
+from threading import Thread
+from time import sleep
+from types import SimpleNamespace
+from zipfile import ZipFile
+
+from pandas import DataFrame
+from pandas.testing import assert_frame_equal
+from pytest import importorskip
+
+from penn_canvas import report as report_module
+from penn_canvas.api import Instance
+from penn_canvas.report import (
+    REPORT_MANIFEST,
+    Report,
+    ReportManifest,
+    ReportScheduler,
+    ReportType,
+    get_report_matrix,
+    get_sidecar_path,
+    get_zip_report_members,
+    iterate_reports,
+    patch_course_report,
+    read_report,
+    write_report_sidecar,
+)
+
+DOWNLOADED: list[str] = list()
+
+
+class ReportStandIn(BaseHTTPRequestHandler):
+    def do_GET(self):
+        content = b"canvas_course_id\n1\n"
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, *args):
+        pass
+
+
+@dataclass
+class AccountReportStandIn:
+    report: str
+    statuses: list[str]
+    url: str
+    id: int = 1
+    status: str = "created"
+    attachment: dict = field(default_factory=dict)
+
+    def update(self):
+        self.status = self.statuses.pop(0)
+        if self.status == "complete":
+            self.attachment = {
+                "filename": f"{self.report}.csv",
+                "url": self.url,
+                "mime_class": "csv",
+            }
+
+
+class ReportForTest(Report):
+    def __init__(self, report_type: ReportType, statuses: list[str], url: str):
+        super().__init__(report_type, term=None)
+        self.statuses = statuses
+        self.url = url
+
+    def create_account_report(self):
+        self.account_report = AccountReportStandIn(
+            self.report_type.value, self.statuses, self.url
+        )
+
+    def update_account_report(self):
+        self.account_report.update()
+
+
+def test_report_scheduler(tmp_path):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), ReportStandIn)
+    Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}/report.csv"
+    slow = ReportForTest(ReportType.STORAGE, ["running"] * 4 + ["complete"], url)
+    fast = ReportForTest(ReportType.COURSES, ["complete"], url)
+    with ReportScheduler(tmp_path, delay=0.01, maximum_delay=0.05) as scheduler:
+        futures = [
+            scheduler.submit(
+                report, lambda report: DOWNLOADED.append(report.report_type.value)
+            )
+            for report in [slow, fast]
+        ]
+        assert scheduler.submit(fast) is futures[1]
+        paths = [future.result() for future in futures]
+    server.shutdown()
+    assert DOWNLOADED == ["courses", "storage"]
+    assert paths == [
+        tmp_path / f"{slow.file_name}.csv",
+        tmp_path / f"{fast.file_name}.csv",
+    ]
+    assert paths[0].read_text() == "canvas_course_id\n1\n"
+    assert scheduler.submit(fast).result() == paths[1]
+    manifest = ReportManifest(tmp_path / REPORT_MANIFEST).read()
+    assert manifest[slow.key]["status"] == "complete"
+    assert manifest[fast.key]["paths"] == [str(paths[1])]
+
+
+def test_iterate_reports_yields_reports_as_they_finish(tmp_path, monkeypatch):
+    monkeypatch.setattr(report_module, "sleep", lambda _: sleep(0.01))
+    server = ThreadingHTTPServer(("127.0.0.1", 0), ReportStandIn)
+    Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}/report.csv"
+    slow = ReportForTest(ReportType.STORAGE, ["running"] * 20 + ["complete"], url)
+    fast = ReportForTest(ReportType.COURSES, ["complete"], url)
+    finished = [
+        (report.report_type, paths)
+        for report, paths in iterate_reports([slow, fast, slow], tmp_path)
+    ]
+    server.shutdown()
+    assert finished == [
+        (ReportType.COURSES, tmp_path / f"{fast.file_name}.csv"),
+        (ReportType.STORAGE, tmp_path / f"{slow.file_name}.csv"),
+    ]
+
+
+def update_manifest(path, process: int):
+    manifest = ReportManifest(path)
+    for index in range(10):
+        report = Report(ReportType.COURSES, account=1, term=f"{process}-{index}")
+        manifest.update(report, "complete")
+
+
+def test_report_manifest_across_processes(tmp_path):
+    path = tmp_path / REPORT_MANIFEST
+    context = get_context("fork")
+    processes = [
+        context.Process(target=update_manifest, args=(path, process))
+        for process in range(4)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+    assert len(ReportManifest(path).read()) == 40
+    assert not list(tmp_path.glob("*.part"))
+
+
+def test_get_report_matrix():
+    reports = get_report_matrix(
+        ["weekly", "storage"], ["2022A", "2022B"], [Instance.PRODUCTION, Instance.OPEN]
+    )
+    assert len(reports) == 8
+    assert reports[0].key == "storage:2022A:prod"
+    assert reports[-1].key == "provisioning:2022B:open"
+
+
+def test_read_report(tmp_path):
+    zip_path = tmp_path / "provisioning.zip"
+    with ZipFile(zip_path, "w") as zip_file:
+        zip_file.writestr("courses.csv", "canvas_course_id,short_name\n1,A\n2,B\n3,C\n")
+        zip_file.writestr("users.csv", "canvas_user_id\n1\n")
+    courses, users = get_zip_report_members(zip_path)
+    chunks = list(read_report(courses, usecols=["canvas_course_id"], chunksize=2))
+    assert [chunk["canvas_course_id"].tolist() for chunk in chunks] == [[1, 2], [3]]
+    assert list(chunks[0].columns) == ["canvas_course_id"]
+    assert read_report(users, dtype=str)["canvas_user_id"].tolist() == ["1"]
+    assert [path.name for path in tmp_path.iterdir()] == ["provisioning.zip"]
+
+
+def test_read_report_sidecar(tmp_path):
+    importorskip("pyarrow")
+    path = tmp_path / "storage.csv"
+    path.write_text("id,sis id,storage used in MB\n1,,2.5\n2,BAN_A,0\n")
+    sidecar_path = write_report_sidecar(path)
+    path.unlink()
+    report = read_report(path, usecols=["id", "sis id"], dtype="string")
+    assert sidecar_path == get_sidecar_path(path)
+    assert report["id"].tolist() == ["1", "2"]
+    assert report["sis id"].isna().tolist() == [True, False]
+
+
+def test_read_report_sidecar_matches_csv(tmp_path):
+    importorskip("pyarrow")
+    path = tmp_path / "storage.csv"
+    path.write_text(
+        "id,sis id,account id,storage used in MB\n1,,10,2.5\n2,BAN_A,,0\n3,BAN_B,12,\n"
+    )
+    reads = [
+        {"dtype": "string"},
+        {"dtype": str, "usecols": ["sis id", "id"]},
+        {
+            "usecols": ["storage used in MB", "id", "sis id"],
+            "dtype": {"id": int, "sis id": "string", "storage used in MB": float},
+        },
+        {"usecols": ["id", "account id"], "dtype": {"id": "string"}},
+    ]
+    expected = [
+        (read_report(path, **read), list(read_report(path, chunksize=2, **read)))
+        for read in reads
+    ]
+    write_report_sidecar(path)
+    for read, (report, chunks) in zip(reads, expected):
+        assert_frame_equal(read_report(path, **read), report)
+        for chunk, expected_chunk in zip(
+            read_report(path, chunksize=2, **read), chunks
+        ):
+            assert_frame_equal(chunk, expected_chunk)
+
+
+def test_patch_course_report():
+    report = DataFrame(
+        {
+            "canvas_course_id": ["1", "2", "3"],
+            "short_name": ["A", "B", "C"],
+            "canvas_term_id": ["10", "10", "10"],
+            "term_id": ["2022A", "2022A", "2022A"],
+            "status": ["active", "active", "active"],
+        },
+        dtype="string",
+    )
+    courses = [
+        SimpleNamespace(
+            id=2, course_code="B2", enrollment_term_id=10, workflow_state="deleted"
+        ),
+        SimpleNamespace(
+            id=3, course_code="C", enrollment_term_id=11, workflow_state="available"
+        ),
+        SimpleNamespace(
+            id=4, course_code="D", enrollment_term_id=10, workflow_state="claimed"
+        ),
+        None,
+    ]
+    patched = patch_course_report(report, courses, "10", "2022A")
+    assert list(patched.columns) == list(report.columns)
+    assert patched.values.tolist() == [
+        ["1", "A", "10", "2022A", "active"],
+        ["2", "B2", "10", "2022A", "deleted"],
+        ["4", "D", "10", "2022A", "unpublished"],
+    ]
@@ -0,0 +1,66 @@
+from datetime import datetime
+
+from pytz import utc
+
+from penn_canvas import terms
+from penn_canvas.terms import (
+    EnrollmentTerm,
+    TermCatalog,
+    get_term_names,
+    load_term_catalog,
+    save_term_catalog,
+)
+
+TERMS = [
+    EnrollmentTerm(1, "Default Term"),
+    EnrollmentTerm(
+        2,
+        "2022A (Banner Spring 2022)",
+        "2022A",
+        "2022-01-01T05:00:00Z",
+        "2022-05-15T04:00:00Z",
+    ),
+    EnrollmentTerm(
+        3,
+        "202230 (Banner Fall 2022)",
+        "202230",
+        "2022-08-25T04:00:00Z",
+        "2022-12-31T05:00:00Z",
+    ),
+    EnrollmentTerm(4, "202310 (Banner Spring 2023)", "202310"),
+]
+
+
+def test_term_catalog(tmp_path):
+    term_catalog = TermCatalog(TERMS)
+    assert term_catalog.find("2022A (Banner Spring 2022)") == TERMS[1]
+    assert term_catalog.find("202230") == TERMS[2]
+    assert term_catalog.find("202310 (Banner") == TERMS[3]
+    assert term_catalog.find("Spring 2023") == TERMS[3]
+    assert term_catalog.find("2024A") is None
+    now = datetime(2022, 6, 1, tzinfo=utc)
+    assert term_catalog.get_current_term(now) is None
+    assert term_catalog.get_next_term(now) == TERMS[2]
+    assert term_catalog.get_previous_term(now) == TERMS[1]
+    assert term_catalog.get_current_term(datetime(2022, 9, 1, tzinfo=utc)) == TERMS[2]
+    path = tmp_path / "terms.json"
+    save_term_catalog(term_catalog, path)
+    loaded_catalog = load_term_catalog(path)
+    assert loaded_catalog and loaded_catalog.terms == TERMS
+    assert not loaded_catalog.is_expired()
+    assert loaded_catalog.is_expired(ttl=-1)
+
+
+def test_get_term_names(monkeypatch):
+    current_term = EnrollmentTerm(
+        5,
+        "209910 (Banner Spring 2099)",
+        "209910",
+        "2000-01-01T05:00:00Z",
+        "2999-12-31T05:00:00Z",
+    )
+    term_catalog = TermCatalog(TERMS + [current_term])
+    monkeypatch.setattr(terms, "get_term_catalog", lambda instance: term_catalog)
+    assert get_term_names([]) == ["209910"]
+    assert get_term_names("2022A") == ["2022A"]
+    assert get_term_names(["2022A", "202230"]) == ["2022A", "202230"]
@@ -0,0 +1,86 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from json import dumps
+from threading import Thread
+from urllib.parse import urlparse
+
+from canvasapi.course import Course
+
+from penn_canvas import api
+from penn_canvas.api import CanvasClientStats, clear_canvas_clients, get_requester
+from penn_canvas.constants import Instance
+from penn_canvas.users import USER_RESOLVERS, get_user_resolver
+
+PATHS: list[str] = list()
+COURSE_USERS = [
+    [
+        {"id": 1, "name": "One", "login_id": "One", "sis_user_id": "10000001"},
+        {"id": 2, "name": "Two", "login_id": "two", "sis_user_id": "10000002"},
+    ],
+    [{"id": 3, "name": "Three", "login_id": "three"}],
+]
+
+
+class CanvasStandIn(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        PATHS.append(url.path)
+        links = ""
+        if url.path == "/api/v1/users/self":
+            content = {"id": 0, "name": "Self"}
+        elif url.path == "/api/v1/courses/1/search_users":
+            page = 2 if "page=2" in url.query else 1
+            content = COURSE_USERS[page - 1]
+            if page == 1:
+                next_url = f"http://{self.headers['Host']}{url.path}?page=2"
+                links = f'<{next_url}>; rel="next"'
+        else:
+            user_id = url.path.rsplit("/", 1)[-1]
+            content = {"id": 4, "name": "Four", "login_id": user_id.split(":")[-1]}
+        body = dumps(content).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        if links:
+            self.send_header("Link", links)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def test_user_resolver(monkeypatch):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), CanvasStandIn)
+    Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}"
+    monkeypatch.setattr(api, "get_canvas_url_and_key", lambda instance: (url, "key"))
+    monkeypatch.setattr(api, "CANVAS_CLIENT_STATS", CanvasClientStats())
+    clear_canvas_clients()
+    USER_RESOLVERS.clear()
+    try:
+        resolver = get_user_resolver("test")
+        assert get_user_resolver(Instance.TEST) is resolver
+        course = Course(get_requester(Instance.TEST), {"id": 1})
+        resolver.load_course(course)
+        resolver.load_course(course)
+        assert PATHS == [
+            "/api/v1/users/self",
+            "/api/v1/courses/1/search_users",
+            "/api/v1/courses/1/search_users",
+        ]
+        assert resolver.get(2).name == "Two"
+        assert resolver.get("3").name == "Three"
+        assert resolver.get(" ONE ", "sis_login_id").id == 1
+        assert resolver.get("10000002", "sis_user_id").id == 2
+        assert (resolver.hits, resolver.misses) == (4, 0)
+        assert resolver.get("four", "sis_login_id").id == 4
+        assert resolver.get(4).name == "Four"
+        assert resolver.get("four", "sis_login_id").id == 4
+        assert PATHS[3:] == ["/api/v1/users/sis_login_id:four"]
+        assert (resolver.hits, resolver.misses) == (6, 1)
+    finally:
+        USER_RESOLVERS.clear()
+        clear_canvas_clients()
+        server.shutdown()